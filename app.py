@@ -1,13 +1,15 @@
+import time
+_import_started = time.perf_counter()
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-from datetime import timedelta, datetime
 import plotly.express as px
 import plotly.graph_objects as go
 
-import tensorflow as tf
-from tensorflow.keras import layers, models
-from sklearn.preprocessing import MinMaxScaler
+from config import MODEL_RUNTIME, FORECAST_SERVICE_URL
+from forecast_service import ForecastService, ForecastClient, LocalForecastClient
+from lazy_resources import ForecastResources
+
+_import_seconds = time.perf_counter() - _import_started
 
 # =========================
 # Page Config - MUST BE FIRST
@@ -452,104 +454,23 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # =========================
-# 1. Model architecture 🧠
+# 1. Forecast backend 🧠
 # =========================
 
-FEATURE_COLS = ["temperature_2m", "relative_humidity_2m", "pressure_msl", "wind_speed_10m"]
-TARGET_COL = "temperature_2m"
-LOOKBACK_HOURS = 30 * 24   # 720
-HORIZON_HOURS = 7 * 24     # 168
-
-def build_lstm_model(timesteps, num_features, horizon):
-    model = models.Sequential([
-        layers.Input(shape=(timesteps, num_features)),
-        layers.LSTM(64, return_sequences=True),
-        layers.Dropout(0.2),
-        layers.LSTM(64),
-        layers.Dropout(0.2),
-        layers.Dense(128, activation="relu"),
-        layers.Dense(horizon)  # 168 outputs
-    ])
-    return model
-
 @st.cache_resource
-def load_lstm_model():
-    timesteps = LOOKBACK_HOURS
-    num_features = len(FEATURE_COLS)
-    horizon = HORIZON_HOURS
-
-    model = build_lstm_model(timesteps, num_features, horizon)
-    model.load_weights("weather_lstm_7day.weights.h5")
-    model.compile(optimizer="adam", loss="mse")
-    return model
-
-model = load_lstm_model()
-
-# =========================
-# 2. Data loading & scalers 📊
-# =========================
-
-@st.cache_data
-def load_history():
-    df = pd.read_csv("weather_hourly_history_openmeteo.csv", parse_dates=["time"])
-    df = df.sort_values(["city", "time"]).reset_index(drop=True)
-    return df
-
-history_df = load_history()
-
-@st.cache_resource
-def build_city_scalers(df):
-    scalers = {}
-    for c in df["city"].unique():
-        city_df = df[df["city"] == c]
-        scaler = MinMaxScaler()
-        scaler.fit(city_df[FEATURE_COLS])
-        scalers[c] = scaler
-    return scalers
-
-scalers = build_city_scalers(history_df)
-
-def inverse_temp(scaled_temp_1d, scaler):
-    dummy = np.zeros((len(scaled_temp_1d), len(FEATURE_COLS)))
-    dummy[:, FEATURE_COLS.index("temperature_2m")] = scaled_temp_1d
-    inv = scaler.inverse_transform(dummy)
-    return inv[:, FEATURE_COLS.index("temperature_2m")]
-
-# =========================
-# 3. Window + forecast utils 🔁
-# =========================
-
-def build_last_window_for_city(df, city, lookback_hours):
-    city_df = df[df["city"] == city].sort_values("time")
-    if len(city_df) < lookback_hours:
-        raise ValueError(f"Not enough history for {city}. Need {lookback_hours} hours.")
-
-    city_df_hist = city_df.tail(lookback_hours)
-    scaler = scalers[city]
-    feats_scaled = scaler.transform(city_df_hist[FEATURE_COLS])
-    X = feats_scaled[np.newaxis, :, :]
-    last_time = city_df_hist["time"].iloc[-1]
-    return X, scaler, last_time
-
-def forecast_7_days(model, X_sample, scaler, last_time):
-    y_pred = model.predict(X_sample, verbose=0)[0]
-    y_pred_c = inverse_temp(y_pred, scaler)
-
-    hours = np.arange(HORIZON_HOURS)
-    times_future = [last_time + timedelta(hours=int(h+1)) for h in hours]
-
-    df_full = pd.DataFrame({
-        "time": times_future,
-        "hour_ahead": hours,
-        "pred_temp_c": y_pred_c
-    })
-
-    mask_display = (df_full["hour_ahead"] < 24) | (
-        (df_full["hour_ahead"] >= 24) &
-        (((df_full["hour_ahead"] - 24) % 4) == 0)
-    )
-    df_display = df_full[mask_display].reset_index(drop=True)
-    return df_full, df_display
+def get_forecaster():
+    # Thin client of forecast_service.py when WEATHERLENS_SERVICE_URL is set.
+    # Otherwise one in-process service shared by every session: it loads on a
+    # background thread so the page renders without waiting for TensorFlow or
+    # the weights, and its cache lets repeat requests skip the LSTM pass
+    if FORECAST_SERVICE_URL:
+        return ForecastClient(FORECAST_SERVICE_URL)
+    resources = ForecastResources(MODEL_RUNTIME)
+    resources.report.record("app_imports", _import_seconds)
+    resources.warm_up_async()
+    return LocalForecastClient(ForecastService(resources))
+
+forecaster = get_forecaster()
 
 # =========================
 # City Icons Mapping
@@ -581,7 +502,7 @@ def get_temp_emoji(temp):
         return "🌡️"
 
 # =========================
-# 4. Streamlit UI 🎛️
+# 3. Streamlit UI 🎛️
 # =========================
 
 # Hero Header
@@ -645,7 +566,8 @@ st.markdown('<div class="section-header">🎯 Select Your City</div>', unsafe_al
 
 col_select, col_btn = st.columns([3, 1])
 
-city_options = sorted(history_df["city"].unique())
+# Cities come from the small scalers JSON, so listing them stays fast
+city_options = forecaster.cities()
 
 with col_select:
     city = st.selectbox(
@@ -662,10 +584,7 @@ with col_btn:
 if generate_btn:
     try:
         with st.spinner("🌤️ Analyzing weather patterns with AI..."):
-            X_sample, scaler, last_time = build_last_window_for_city(
-                history_df, city, LOOKBACK_HOURS
-            )
-            df_full, df_display = forecast_7_days(model, X_sample, scaler, last_time)
+            df_full, df_display, last_time = forecaster.forecast_city(city)
 
         # City Header with Current Stats
         city_icon = get_city_icon(city)
@@ -861,6 +780,48 @@ if generate_btn:
                 height=350
             )
 
+        # Full outlook from the multi-output model (one extra forward pass, all variables)
+        if forecaster.has_outlook():
+            st.markdown('<div class="section-header">🌈 Full Weather Outlook</div>', unsafe_allow_html=True)
+            df_outlook = forecaster.outlook(city)
+
+            outlook_charts = [
+                ("pred_humidity_pct", "💧 Humidity", "%", "#00f2fe"),
+                ("pred_pressure_hpa", "🧭 Pressure", " hPa", "#f093fb"),
+                ("pred_wind_kmh", "💨 Wind Speed", " km/h", "#fee140"),
+            ]
+            for col_outlook, (col_name, label, suffix, color) in zip(st.columns(3), outlook_charts):
+                with col_outlook:
+                    fig_var = go.Figure()
+                    fig_var.add_trace(go.Scatter(
+                        x=df_outlook["time"],
+                        y=df_outlook[col_name],
+                        mode='lines',
+                        line=dict(color=color, width=2, shape='spline'),
+                        name=label,
+                        hovertemplate=f'<b>%{{x}}</b><br>{label}: %{{y:.1f}}{suffix}<extra></extra>'
+                    ))
+                    fig_var.update_layout(
+                        title=dict(text=label, font=dict(size=14)),
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        font=dict(color='white', family='Inter'),
+                        margin=dict(l=20, r=20, t=40, b=20),
+                        height=280,
+                        xaxis=dict(
+                            gridcolor='rgba(255,255,255,0.05)',
+                            showgrid=False,
+                            tickformat='%b %d'
+                        ),
+                        yaxis=dict(
+                            gridcolor='rgba(255,255,255,0.1)',
+                            showgrid=True,
+                            ticksuffix=suffix
+                        ),
+                        showlegend=False
+                    )
+                    st.plotly_chart(fig_var, use_container_width=True)
+
         # Caption
         st.markdown(f"""
         <div style="text-align: center; padding: 1rem; color: rgba(255,255,255,0.5); font-size: 0.85rem;">
@@ -886,6 +847,74 @@ else:
     </div>
     """, unsafe_allow_html=True)
 
+# =========================
+# All-Cities Outlook (one batched forward pass)
+# =========================
+st.markdown("<br>", unsafe_allow_html=True)
+st.markdown('<div class="section-header">🌍 All-Cities Outlook</div>', unsafe_allow_html=True)
+
+if st.button("🌍 Forecast All Cities", use_container_width=True):
+    try:
+        with st.spinner("🌤️ Forecasting every city in one batch..."):
+            df_all = forecaster.forecast_cities(city_options)
+
+        fig_all = go.Figure()
+        for c, df_c in df_all.groupby("city"):
+            fig_all.add_trace(go.Scatter(
+                x=df_c["time"],
+                y=df_c["pred_temp_c"],
+                mode='lines',
+                line=dict(width=2, shape='spline'),
+                name=f"{get_city_icon(c)} {c.replace('_', ' ').title()}",
+                hovertemplate='<b>%{x}</b><br>Temperature: %{y:.1f}°C<extra></extra>'
+            ))
+
+        fig_all.update_layout(
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white', family='Inter'),
+            margin=dict(l=20, r=20, t=40, b=20),
+            height=450,
+            xaxis=dict(
+                gridcolor='rgba(255,255,255,0.1)',
+                showgrid=True,
+                title=None,
+                tickformat='%b %d\n%H:%M'
+            ),
+            yaxis=dict(
+                gridcolor='rgba(255,255,255,0.1)',
+                showgrid=True,
+                title=dict(text='Temperature (°C)', font=dict(size=14)),
+                ticksuffix='°C'
+            ),
+            legend=dict(
+                orientation='h',
+                yanchor='bottom',
+                y=1.02,
+                xanchor='right',
+                x=1,
+                bgcolor='rgba(0,0,0,0)'
+            ),
+            hovermode='x unified'
+        )
+
+        st.plotly_chart(fig_all, use_container_width=True)
+
+    except Exception as e:
+        st.error(f"❌ Error generating forecasts: {e}")
+
+# =========================
+# Startup-time report
+# =========================
+with st.expander("⏱️ Startup report"):
+    ready, startup_df, startup_errors = forecaster.startup_report()
+    for err in startup_errors:
+        st.error(f"❌ Background warm-up failed ({err['phase']}): {err['error']}")
+    st.caption("✅ Model, history and scalers loaded" if ready
+               else "⏳ Loading on first use" if startup_errors
+               else "⏳ Still warming up in the background")
+    st.dataframe(startup_df, use_container_width=True, hide_index=True)
+
 # =========================
 # Footer with Social Links
 # =========================
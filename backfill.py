@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import threading
+from datetime import date, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import FEATURE_COLS, HISTORY_STORE_DIR
+from fetch_engine import FetchEngine, default_engine
+from history_store import city_partition_path, compact_city_fragments, merge_into_partition, normalize_city_frame
+from weather_api import ARCHIVE_URL, CITIES, fetch_hourly_history
+
+ARCHIVE_LAG_DAYS = 5   # the archive trails today by a few days; later hours come back null
+
+# ============================
+# 1. Date-range chunking 📆
+# ============================
+
+def date_chunks(start, end, freq="month"):
+    """
+    Split [start, end] (inclusive dates) into calendar months or quarters.
+    Returns a list of (chunk_start, chunk_end) date pairs.
+    """
+    step = {"month": 1, "quarter": 3}[freq]
+    chunks = []
+    chunk_start = start
+    while chunk_start <= end:
+        month0 = chunk_start.month - 1
+        # First day of the next period boundary
+        boundary_month = (month0 // step + 1) * step
+        next_start = date(chunk_start.year + boundary_month // 12, boundary_month % 12 + 1, 1)
+        chunk_end = min(next_start - timedelta(days=1), end)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + timedelta(days=1)
+    return chunks
+
+def chunk_id(city, chunk_start, chunk_end):
+    return f"{city}|{chunk_start.isoformat()}|{chunk_end.isoformat()}"
+
+def chunk_is_final(chunk_start, chunk_end, rows, available_until):
+    """
+    A chunk can be checkpointed only when the archive will not add to it:
+    it ends before the archive's availability horizon and has every hour.
+    """
+    return chunk_end < available_until and rows >= ((chunk_end - chunk_start).days + 1) * 24
+
+# ============================
+# 2. Resumable checkpoint 📍
+# ============================
+
+class BackfillCheckpoint:
+    """
+    Set of completed chunk ids, persisted as JSON after every chunk so an
+    interrupted backfill resumes where it stopped. It only lives until the
+    run's chunks are compacted (see clear), so it never hides a later
+    rewrite of the store.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.done = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.done = set(json.load(f).get("done", []))
+
+    def is_done(self, cid):
+        with self._lock:
+            return cid in self.done
+
+    def mark_done(self, cid):
+        with self._lock:
+            self.done.add(cid)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"done": sorted(self.done)}, f, indent=1)
+            os.replace(tmp_path, self.path)
+
+    def clear(self):
+        with self._lock:
+            self.done = set()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+# ============================
+# 3. Chunk staging + compaction 🧱
+# ============================
+
+def staging_dir(store_dir, city):
+    return os.path.join(store_dir, "_staging", city)
+
+def write_chunk(df_chunk, store_dir, city, chunk_start, chunk_end):
+    """
+    Persist one fetched chunk as its own Parquet file, so it never has to be
+    held in memory alongside other chunks.
+    """
+    out_dir = staging_dir(store_dir, city)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{chunk_start.isoformat()}_{chunk_end.isoformat()}.parquet")
+    table = pa.Table.from_pandas(normalize_city_frame(df_chunk), preserve_index=False)
+    pq.write_table(table, f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+    return path
+
+def compact_city_chunks(store_dir, city):
+    """
+    Merge a city's staged chunks into its partition (dedup on time, chunk rows
+    win) and drop them; pending append fragments are folded in first. Chunks
+    are disjoint and named by start date, so they are streamed in order next to
+    the existing partition: one chunk and one row group are in memory at a
+    time, however many years were backfilled.
+    Returns the number of rows in the partition afterwards.
+    """
+    chunk_dir = staging_dir(store_dir, city)
+    partition = city_partition_path(store_dir, city)
+    compact_city_fragments(store_dir, city)
+
+    chunk_files = []
+    if os.path.isdir(chunk_dir):
+        chunk_files = sorted(
+            os.path.join(chunk_dir, name) for name in os.listdir(chunk_dir) if name.endswith(".parquet")
+        )
+    if not chunk_files:
+        return pq.ParquetFile(partition).metadata.num_rows if os.path.exists(partition) else 0
+
+    rows = merge_into_partition(store_dir, city, (pq.read_table(p).to_pandas() for p in chunk_files))
+    for p in chunk_files:
+        os.remove(p)
+    return rows
+
+# ============================
+# 4. Parallel backfill 🚚
+# ============================
+
+def backfill_history(cities, start, end, store_dir=HISTORY_STORE_DIR, freq="month",
+                     url=ARCHIVE_URL, engine=None, checkpoint_path=None, available_until=None):
+    """
+    Multi-year backfill: fetch every (city, month/quarter) chunk in parallel,
+    stage each chunk to disk as soon as it arrives, then compact per city.
+    Peak memory is about one chunk per worker while fetching, and one chunk
+    plus one partition row group while compacting.
+
+    Chunks that are final (complete, and ending before available_until,
+    default today - ARCHIVE_LAG_DAYS) are recorded in the checkpoint and
+    skipped if an interrupted run is resumed; partial ones are fetched again.
+    The checkpoint is deleted once every city is compacted.
+    Returns {city: rows_in_partition}.
+    """
+    engine = engine or default_engine()
+    available_until = available_until or date.today() - timedelta(days=ARCHIVE_LAG_DAYS)
+    os.makedirs(store_dir, exist_ok=True)
+    checkpoint = BackfillCheckpoint(checkpoint_path or os.path.join(store_dir, "_backfill_checkpoint.json"))
+
+    chunks = date_chunks(start, end, freq)
+    todo = [
+        (name, loc, cs, ce)
+        for name, loc in cities.items()
+        for cs, ce in chunks
+        if not checkpoint.is_done(chunk_id(name, cs, ce))
+    ]
+    print(f"Backfill: {len(cities) * len(chunks)} chunks, {len(todo)} left to fetch")
+
+    def fetch_chunk(item):
+        name, loc, cs, ce = item
+        df_chunk = fetch_hourly_history(
+            lat=loc["lat"],
+            lon=loc["lon"],
+            start_date=cs.isoformat(),
+            end_date=ce.isoformat(),
+            url=url,
+            engine=engine,
+        )
+        df_chunk = df_chunk.dropna(subset=FEATURE_COLS).reset_index()
+        write_chunk(df_chunk, store_dir, name, cs, ce)
+        if chunk_is_final(cs, ce, len(df_chunk), available_until):
+            checkpoint.mark_done(chunk_id(name, cs, ce))
+        return len(df_chunk)
+
+    engine.map(fetch_chunk, todo)
+    rows = {name: compact_city_chunks(store_dir, name) for name in cities}
+    checkpoint.clear()
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resumable, chunked multi-year history backfill.")
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--end", default=date.today().isoformat(), help="YYYY-MM-DD")
+    parser.add_argument("--freq", choices=["month", "quarter"], default="month")
+    parser.add_argument("--store", default=HISTORY_STORE_DIR)
+    parser.add_argument("--archive-url", default=ARCHIVE_URL)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=None)
+    args = parser.parse_args()
+
+    engine = FetchEngine(max_workers=args.workers, requests_per_second=args.rps)
+    rows = backfill_history(
+        CITIES,
+        date.fromisoformat(args.start),
+        date.fromisoformat(args.end),
+        store_dir=args.store,
+        freq=args.freq,
+        url=args.archive_url,
+        engine=engine,
+    )
+    for name, n in rows.items():
+        print(f"✅ {name}: {n} hours in store")
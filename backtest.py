@@ -0,0 +1,217 @@
+import argparse
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import FEATURE_COLS, TARGET_COL, LOOKBACK_HOURS, HORIZON_HOURS, MODEL_RUNTIME
+from history_index import as_history_index
+from scaling import train_split_end
+
+SEASONS = ("DJF", "MAM", "JJA", "SON")   # meteorological, northern-hemisphere naming
+
+# ============================
+# 1. Forecast origins 📍
+# ============================
+
+def backtest_origins(index, split="test", stride=6, lookback=LOOKBACK_HOURS, horizon=HORIZON_HOURS,
+                     train_frac=0.7, val_frac=0.15):
+    """
+    Every stride-th forecast origin per city whose whole horizon falls inside
+    the city's chronological split ("test", "val" or "all"); the lookback may
+    reach back before it, as it would in production.
+    Returns (city_ids, rows): rows are global row offsets of each window's
+    first hour in index.values.
+    """
+    city_ids, rows = [], []
+    for i, c in enumerate(index.cities):
+        start, end = index.spans[c]
+        n = end - start
+        train_end, val_end = train_split_end(n, train_frac), int(n * (train_frac + val_frac))
+        seg_start, seg_end = {"test": (val_end, n), "val": (train_end, val_end), "all": (lookback, n)}[split]
+        first = max(seg_start - lookback, 0)
+        last = seg_end - lookback - horizon
+        if last < first:
+            continue
+        starts = np.arange(first, last + 1, stride, dtype=np.int64)
+        city_ids.append(np.full(len(starts), i, dtype=np.int64))
+        rows.append(start + starts)
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(city_ids), np.concatenate(rows)
+
+# ============================
+# 2. Batched replay ⚡
+# ============================
+
+def _prefetch(pool, fn, items, depth):
+    """
+    pool.map with at most depth results in flight, so batches are assembled
+    ahead of the consumer without ever holding all of them in memory.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def backtest(model, history, scalers, split="test", stride=6, batch_size=256, workers=2,
+             lookback=LOOKBACK_HOURS, horizon=HORIZON_HOURS, train_frac=0.7, val_frac=0.15):
+    """
+    Replay forecast origins over the stored history and score them.
+
+    history: HistoryIndex (or a load_history() frame). Windows are strided
+    views of its one contiguous scaled array. Each batch is a single np.take
+    into the model input, assembled by `workers` threads ahead of the forward
+    pass, which stays on the calling thread. Errors are accumulated per
+    (city, season of the origin, horizon hour) with vectorized NumPy, in °C.
+
+    Returns (per_hour, summary):
+      per_hour  tidy city, hour_ahead, mae_c, rmse_c, origins frame
+      summary   dict with overall / per-city / per-season / per-city-season scores
+    """
+    t_start = time.perf_counter()
+    index = as_history_index(history, scalers)
+    cities = index.cities
+    target = FEATURE_COLS.index(TARGET_COL)
+
+    city_ids, rows = backtest_origins(index, split, stride, lookback, horizon, train_frac, val_frac)
+    months = index.times[rows + lookback - 1].month.to_numpy()
+    season_ids = (months % 12) // 3
+
+    # (M, lookback, F) and (M, horizon) views over every possible window of the array
+    X_all = np.moveaxis(sliding_window_view(index.values, lookback, axis=0), -1, 1)
+    y_all = sliding_window_view(index.values[:, target], horizon)
+    # Scaled error / target scale = error in °C
+    target_scale = np.array([scalers[c].scale_[target] for c in cities])
+
+    def assemble(batch_start):
+        sel = slice(batch_start, batch_start + batch_size)
+        X = np.take(X_all, rows[sel], axis=0)
+        y = np.take(y_all, rows[sel] + lookback, axis=0)
+        return sel, X, y
+
+    shape = (len(cities), len(SEASONS), horizon)
+    abs_sum, sq_sum = np.zeros(shape), np.zeros(shape)
+    counts = np.zeros(shape[:2], dtype=np.int64)
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        for sel, X, y in _prefetch(pool, assemble, range(0, len(rows), batch_size), 2 * max(workers, 1)):
+            y_pred = np.asarray(model.predict_on_batch(X), dtype=np.float64).reshape(len(y), horizon)
+            err = (y_pred - y) / target_scale[city_ids[sel], None]
+            slots = (city_ids[sel], season_ids[sel])
+            np.add.at(abs_sum, slots, np.abs(err))
+            np.add.at(sq_sum, slots, err * err)
+            np.add.at(counts, slots, 1)
+
+    elapsed = time.perf_counter() - t_start
+    return _score(cities, abs_sum, sq_sum, counts, horizon), _summary(
+        cities, abs_sum, sq_sum, counts, split, stride, elapsed
+    )
+
+# ============================
+# 3. Scores & report 📋
+# ============================
+
+def _score(cities, abs_sum, sq_sum, counts, horizon):
+    n = counts.sum(axis=1)[:, None]                    # origins per city
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mae = abs_sum.sum(axis=1) / n
+        rmse = np.sqrt(sq_sum.sum(axis=1) / n)
+    return pd.DataFrame({
+        "city": np.repeat(np.asarray(cities, dtype=object), horizon),
+        "hour_ahead": np.tile(np.arange(1, horizon + 1), len(cities)),
+        "mae_c": mae.reshape(-1),
+        "rmse_c": rmse.reshape(-1),
+        "origins": np.repeat(n[:, 0], horizon),
+    })
+
+def _summary(cities, abs_sum, sq_sum, counts, split, stride, elapsed):
+    def scores(a, s, n):
+        # a, s: summed over everything but the horizon; n: origins
+        if n == 0:
+            return {"mae_c": None, "rmse_c": None, "origins": 0}
+        mae = a / n
+        return {
+            "mae_c": float(mae.mean()),
+            "rmse_c": float(np.sqrt((s / n).mean())),
+            "mae_h1_c": float(mae[0]),
+            "mae_h24_c": float(mae[23]) if len(mae) > 23 else None,
+            "mae_last_c": float(mae[-1]),
+            "origins": int(n),
+        }
+
+    total = int(counts.sum())
+    return {
+        "split": split,
+        "stride_hours": stride,
+        "origins": total,
+        "seconds": elapsed,
+        "windows_per_s": total / elapsed if elapsed else None,
+        "overall": scores(abs_sum.sum(axis=(0, 1)), sq_sum.sum(axis=(0, 1)), total),
+        "per_city": {
+            c: scores(abs_sum[i].sum(axis=0), sq_sum[i].sum(axis=0), counts[i].sum())
+            for i, c in enumerate(cities)
+        },
+        "per_season": {
+            s: scores(abs_sum[:, j].sum(axis=0), sq_sum[:, j].sum(axis=0), counts[:, j].sum())
+            for j, s in enumerate(SEASONS)
+        },
+        "per_city_season_mae_c": {
+            c: {s: (float((abs_sum[i, j] / counts[i, j]).mean()) if counts[i, j] else None)
+                for j, s in enumerate(SEASONS)}
+            for i, c in enumerate(cities)
+        },
+    }
+
+def write_report(per_hour, summary, out=None, per_hour_csv=None):
+    if out:
+        with open(out, "w") as f:
+            json.dump(summary, f, indent=1)
+        print(f"✅ Saved: {out}")
+    if per_hour_csv:
+        per_hour.to_csv(per_hour_csv, index=False, float_format="%.4f")
+        print(f"✅ Saved: {per_hour_csv}")
+
+def print_summary(summary):
+    o = summary["overall"]
+    print(f"📊 {summary['origins']:,} origins ({summary['split']}, every {summary['stride_hours']} h) "
+          f"in {summary['seconds']:.2f} s — MAE {o['mae_c']:.3f} °C, RMSE {o['rmse_c']:.3f} °C "
+          f"(h1 {o['mae_h1_c']:.3f}, h24 {o['mae_h24_c']:.3f}, last {o['mae_last_c']:.3f})")
+    rows = [{"group": k, **v} for k, v in {**summary["per_city"], **summary["per_season"]}.items()]
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+
+if __name__ == "__main__":
+    from config import HISTORY_CSV, HISTORY_STORE_DIR, WEIGHTS_PATH, SCALERS_PATH
+    from forecast import load_forecast_model, load_history, load_scalers
+
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest: MAE / RMSE per city x horizon hour.")
+    parser.add_argument("--csv", default=HISTORY_CSV)
+    parser.add_argument("--store", default=HISTORY_STORE_DIR)
+    parser.add_argument("--weights", default=WEIGHTS_PATH)
+    parser.add_argument("--scalers", default=SCALERS_PATH)
+    parser.add_argument("--runtime", choices=["keras", "tflite", "numpy"], default=MODEL_RUNTIME)
+    parser.add_argument("--split", choices=["test", "val", "all"], default="test")
+    parser.add_argument("--stride", type=int, default=6, help="Hours between forecast origins")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=2, help="Threads assembling batches ahead of the model")
+    parser.add_argument("--out", default=None, help="Write the summary JSON here")
+    parser.add_argument("--per-hour-csv", default=None, help="Write the city x horizon-hour table here")
+    args = parser.parse_args()
+
+    city_scalers = load_scalers(args.scalers)
+    history_index = as_history_index(load_history(args.csv, args.store), city_scalers)
+    forecast_model = load_forecast_model(args.runtime, weights_path=args.weights)
+
+    per_hour_df, summary_dict = backtest(
+        forecast_model, history_index, city_scalers, args.split, args.stride, args.batch_size, args.workers,
+    )
+    print_summary(summary_dict)
+    write_report(per_hour_df, summary_dict, args.out, args.per_hour_csv)
@@ -0,0 +1,96 @@
+"""
+Fetch-engine benchmark against the local Open-Meteo stub (no network needed).
+
+    python -m benchmarks.bench_fetch --cities 100 --latency 0.1 --workers 16
+
+Compares the old path (bare requests.get, one city after another) with
+FetchEngine (pooled session, concurrent workers, retries) on the same stub.
+"""
+import argparse
+import json
+import time
+from datetime import date, timedelta
+
+import requests
+
+from fetch_engine import FetchEngine
+from openmeteo_stub import start_stub_server
+from weather_api import fetch_all_cities_history
+
+
+def synthetic_cities(n):
+    return {f"city_{i:03d}": {"lat": -60 + (i * 7.3) % 120, "lon": -180 + (i * 13.1) % 360} for i in range(n)}
+
+
+def run_sequential_baseline(cities, url, days):
+    end = date.today()
+    start = end - timedelta(days=days)
+    for loc in cities.values():
+        params = {
+            "latitude": loc["lat"],
+            "longitude": loc["lon"],
+            "hourly": ["temperature_2m", "relative_humidity_2m", "pressure_msl", "wind_speed_10m"],
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "timezone": "auto",
+        }
+        r = requests.get(url, params=params)
+        r.raise_for_status()
+        r.json()
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cities", type=int, default=100)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.1, help="Stub response delay (s)")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--rps", type=float, default=None)
+    parser.add_argument("--fail-every", type=int, default=10, help="Stub 503 rate for the retry run")
+    parser.add_argument("--out", default=None, help="Write results as JSON here")
+    args = parser.parse_args()
+
+    cities = synthetic_cities(args.cities)
+    results = {"cities": args.cities, "days": args.days, "latency_s": args.latency, "workers": args.workers}
+
+    server, base_url = start_stub_server(latency=args.latency)
+    url = f"{base_url}/v1/archive"
+    try:
+        results["sequential_s"] = timed(lambda: run_sequential_baseline(cities, url, args.days))
+
+        engine = FetchEngine(max_workers=args.workers, requests_per_second=args.rps)
+        results["engine_s"] = timed(
+            lambda: fetch_all_cities_history(cities, days=args.days, url=url, engine=engine)
+        )
+        engine.close()
+    finally:
+        server.shutdown()
+
+    # Same run against a flaky stub: every n-th request fails and must be retried
+    server, base_url = start_stub_server(latency=args.latency, fail_every=args.fail_every)
+    try:
+        engine = FetchEngine(max_workers=args.workers, requests_per_second=args.rps, backoff=0.05)
+        results["engine_flaky_s"] = timed(
+            lambda: fetch_all_cities_history(cities, days=args.days, url=f"{base_url}/v1/archive", engine=engine)
+        )
+        results["engine_flaky_requests"] = server.request_count
+        engine.close()
+    finally:
+        server.shutdown()
+
+    results["speedup"] = results["sequential_s"] / results["engine_s"]
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Inference benchmark suite, offline against the bundled CSV / store and weights.
+
+    python -m benchmarks.bench_inference --runtime numpy --out bench.json
+    python -m benchmarks.bench_inference --runtime numpy --compare old.json
+
+Measures:
+  cold start   fresh interpreter: imports, history, scalers, model, first forecast
+  warm         single-city latency per stage (window, predict, post-processing)
+               and end to end, as p50 / p95 / p99
+  batch        forward-pass throughput at several batch sizes
+  memory       peak RSS of the warm run and of the cold-start child
+Results are JSON (with the git commit) so runs can be compared between commits.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from config import FEATURE_COLS, LOOKBACK_HOURS
+from mem_usage import peak_rss_mb
+
+
+def _percentiles(times_s):
+    ms = 1000.0 * np.asarray(times_s)
+    return {
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# ============================
+# 1. Cold start (child process) 🧊
+# ============================
+
+def cold_start_child(runtime, city):
+    """
+    Runs in a fresh interpreter: every import and load is paid for here.
+    """
+    t_start = time.perf_counter()
+    from lazy_resources import ForecastResources
+    from forecast import forecast_city_cached
+    from forecast_cache import ForecastCache
+
+    resources = ForecastResources(runtime)
+    resources.report.record("imports", time.perf_counter() - t_start, t_start)
+    resources.warm_up()
+    with resources.report.phase("first_forecast"):
+        forecast_city_cached(resources.model, resources.history_index, resources.scalers, city, ForecastCache(), "bench")
+
+    phases = {row["phase"]: row["seconds"] for row in resources.report.as_frame().to_dict(orient="records")}
+    return {
+        "phases_s": phases,
+        "total_s": time.perf_counter() - t_start,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_cold_start(runtime, city, repeats):
+    runs = []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_inference", "--cold-child",
+             "--runtime", runtime, "--city", city],
+            capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    best = min(runs, key=lambda r: r["total_s"])
+    return {"runs": repeats, "median_total_s": float(np.median([r["total_s"] for r in runs])), "best": best}
+
+# ============================
+# 2. Warm single-city latency 🔥
+# ============================
+
+def run_warm(model, history, scalers, city, iterations):
+    from forecast import build_last_window_for_city, postprocess_7_days
+
+    stages = {"window": [], "predict": [], "postprocess": [], "end_to_end": []}
+    for _ in range(iterations + 3):
+        t0 = time.perf_counter()
+        X, scaler, last_time = build_last_window_for_city(history, city, LOOKBACK_HOURS, scalers)
+        t1 = time.perf_counter()
+        y_pred = np.asarray(model.predict_on_batch(X))[0]
+        t2 = time.perf_counter()
+        postprocess_7_days(y_pred, scaler, last_time)
+        t3 = time.perf_counter()
+        for name, dt in (("window", t1 - t0), ("predict", t2 - t1), ("postprocess", t3 - t2), ("end_to_end", t3 - t0)):
+            stages[name].append(dt)
+
+    # drop the first calls (buffer allocation, lazy init)
+    return {name: _percentiles(times[3:]) for name, times in stages.items()}
+
+# ============================
+# 3. Batch throughput 📦
+# ============================
+
+def run_batches(model, batch_sizes, repeats):
+    rng = np.random.default_rng(0)
+    results = {}
+    for size in batch_sizes:
+        X = rng.random((size, LOOKBACK_HOURS, len(FEATURE_COLS)), dtype=np.float32)
+        model.predict_on_batch(X)   # warm up
+        times = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            model.predict_on_batch(X)
+            times.append(time.perf_counter() - t0)
+        median = float(np.median(times))
+        results[str(size)] = {"median_ms": 1000.0 * median, "windows_per_s": size / median}
+    return results
+
+# ============================
+# 4. Comparing runs 🔍
+# ============================
+
+def _flatten(d, prefix=""):
+    out = {}
+    for k, v in d.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            out.update(_flatten(v, key + "."))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            out[key] = v
+    return out
+
+def compare(old, new):
+    """
+    Rows of (metric, old, new, new/old) for every numeric metric both runs have.
+    """
+    a, b = _flatten(old), _flatten(new)
+    return [(k, a[k], b[k], b[k] / a[k] if a[k] else float("nan")) for k in sorted(a.keys() & b.keys())]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runtime", choices=["keras", "tflite", "numpy"], default="numpy")
+    parser.add_argument("--city", default="delhi")
+    parser.add_argument("--iterations", type=int, default=100, help="Warm single-city calls")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per batch size")
+    parser.add_argument("--cold-repeats", type=int, default=3, help="Fresh interpreters for the cold start")
+    parser.add_argument("--skip-cold", action="store_true")
+    parser.add_argument("--out", default=None, help="Write results as JSON here")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to compare against")
+    parser.add_argument("--cold-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_child:
+        print(json.dumps(cold_start_child(args.runtime, args.city)))
+        return
+
+    results = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runtime": args.runtime,
+        "city": args.city,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+    }
+    if not args.skip_cold:
+        results["cold_start"] = run_cold_start(args.runtime, args.city, args.cold_repeats)
+
+    from forecast import load_forecast_model, load_history, load_scalers
+    from history_index import HistoryIndex
+
+    t0 = time.perf_counter()
+    df = load_history()
+    results["load_history_s"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    scalers = load_scalers()
+    results["load_scalers_s"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    history = HistoryIndex.from_frame(df, scalers)
+    results["build_history_index_s"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    model = load_forecast_model(args.runtime)
+    results["load_model_s"] = time.perf_counter() - t0
+
+    results["warm"] = run_warm(model, history, scalers, args.city, args.iterations)
+    results["batch"] = run_batches(model, args.batch_sizes, args.repeats)
+    results["peak_rss_mb"] = peak_rss_mb()
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print(f"\n{'metric':55s} {'old':>12s} {'new':>12s} {'new/old':>8s}")
+        for key, a, b, ratio in compare(old, results):
+            print(f"{key:55s} {a:12.4g} {b:12.4g} {ratio:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Micro-batching benchmark: many concurrent single-window forecasts.
+
+    python -m benchmarks.bench_microbatch --runtime numpy --clients 32 --requests 256
+
+Compares one forward pass per request (model behind a lock, like the service
+without batching) with MicroBatcher at several max batch sizes.
+"""
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from config import FEATURE_COLS, LOOKBACK_HOURS
+from forecast import load_forecast_model
+from micro_batch import MicroBatcher
+
+
+class LockedModel:
+    def __init__(self, model):
+        self.model = model
+        self._lock = threading.Lock()
+
+    def predict_on_batch(self, X):
+        with self._lock:
+            return self.model.predict_on_batch(X)
+
+
+def run_load(model, windows, clients):
+    with ThreadPoolExecutor(clients) as ex:
+        t0 = time.perf_counter()
+        list(ex.map(lambda x: model.predict_on_batch(x[None]), windows))
+        return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runtime", choices=["keras", "tflite", "numpy"], default="numpy")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent callers")
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--max-latency-ms", type=float, default=5.0)
+    parser.add_argument("--out", default=None, help="Write results as JSON here")
+    args = parser.parse_args()
+
+    model = load_forecast_model(args.runtime)
+    rng = np.random.default_rng(0)
+    windows = rng.random((args.requests, LOOKBACK_HOURS, len(FEATURE_COLS)), dtype=np.float32)
+    model.predict_on_batch(windows[:1])   # warm up
+
+    results = {"runtime": args.runtime, "clients": args.clients, "requests": args.requests}
+    elapsed = run_load(LockedModel(model), windows, args.clients)
+    results["unbatched"] = {"seconds": elapsed, "requests_per_s": args.requests / elapsed}
+
+    for size in args.batch_sizes:
+        batcher = MicroBatcher(model, max_batch_size=size, max_latency_ms=args.max_latency_ms)
+        elapsed = run_load(batcher, windows, args.clients)
+        metrics = batcher.metrics()
+        batcher.close()
+        results[f"batch_{size}"] = {
+            "seconds": elapsed,
+            "requests_per_s": args.requests / elapsed,
+            "mean_batch_fill": metrics["mean_batch_fill"],
+            "max_queue_depth": metrics["max_queue_depth"],
+            "mean_queue_wait_ms": metrics["mean_queue_wait_ms"],
+        }
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Extended-horizon benchmark: latency of the autoregressive rollout per extra week.
+
+    python -m benchmarks.bench_rolling --runtime numpy --days 7 14 21 30 --cities 4
+
+Times rollout() on random scaled windows for every horizon, batched across cities.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from config import FEATURE_COLS, LOOKBACK_HOURS
+from forecast import load_forecast_model
+from rolling_forecast import rollout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runtime", choices=["keras", "tflite", "numpy"], default="numpy")
+    parser.add_argument("--cities", type=int, default=4, help="Windows advanced together")
+    parser.add_argument("--days", type=int, nargs="+", default=[7, 14, 21, 30])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--out", default=None, help="Write results as JSON here")
+    args = parser.parse_args()
+
+    model = load_forecast_model(args.runtime)
+    X = np.random.default_rng(0).random((args.cities, LOOKBACK_HOURS, len(FEATURE_COLS)), dtype=np.float32)
+    rollout(model, X, 7 * 24)   # warm up
+
+    results = {"runtime": args.runtime, "cities": args.cities, "horizons": {}}
+    for days in args.days:
+        times = []
+        for _ in range(args.repeats):
+            t0 = time.perf_counter()
+            rollout(model, X, days * 24)
+            times.append(time.perf_counter() - t0)
+        results["horizons"][str(days)] = {"median_s": float(np.median(times)), "best_s": min(times)}
+
+    base_days = min(args.days)
+    base = results["horizons"][str(base_days)]["median_s"]
+    for days in args.days:
+        extra_weeks = (days - base_days) / 7
+        if extra_weeks > 0:
+            extra = results["horizons"][str(days)]["median_s"] - base
+            results["horizons"][str(days)]["per_extra_week_s"] = extra / extra_weeks
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import os
+
+# ============================
+# Shared model & data settings ⚙️
+# ============================
+
+FEATURE_COLS = ["temperature_2m", "relative_humidity_2m", "pressure_msl", "wind_speed_10m"]
+TARGET_COL = "temperature_2m"
+LOOKBACK_HOURS = 30 * 24   # 720
+HORIZON_HOURS = 7 * 24     # 168
+
+HISTORY_CSV = "weather_hourly_history_openmeteo.csv"
+HISTORY_STORE_DIR = "weather_history_store"   # per-city Parquet partitions (history_store.py)
+WEIGHTS_PATH = "weather_lstm_7day.weights.h5"
+# Slim inference artifacts (export_tflite.py --quantize ...); eval_quantized.py compares them
+TFLITE_PATHS = {
+    "float32": "weather_lstm_7day.tflite",
+    "float16": "weather_lstm_7day.fp16.tflite",
+    "dynamic_int8": "weather_lstm_7day.dynamic_int8.tflite",
+}
+# Artifact served by the "tflite" runtime, e.g. WEATHERLENS_TFLITE=dynamic_int8
+# (validated by lite_forecast.tflite_path() when that runtime is used)
+TFLITE_VARIANT = os.environ.get("WEATHERLENS_TFLITE", "float32")
+SCALERS_PATH = "weather_lstm_7day.scalers.json"   # per-city train-split min/scale (scaling.py)
+CHECKPOINT_PATH = "best_lstm_weather.h5"
+
+# Multi-output variant: all FEATURE_COLS over HORIZON_HOURS in one pass (train.py --multi-output)
+MULTI_TARGET_COLS = FEATURE_COLS
+MULTI_WEIGHTS_PATH = "weather_lstm_7day_multi.weights.h5"
+MULTI_CHECKPOINT_PATH = "best_lstm_weather_multi.h5"
+
+# "keras" (full TensorFlow), "tflite" (exported artifact) or "numpy" (numpy_lstm.py, no TensorFlow)
+MODEL_RUNTIME = os.environ.get("WEATHERLENS_RUNTIME", "keras")
+
+# Base URL of a running forecast_service.py; unset = the app forecasts in-process
+FORECAST_SERVICE_URL = os.environ.get("WEATHERLENS_SERVICE_URL")
+
+# Micro-batching of concurrent forward passes (micro_batch.py). Not applied to
+# the tflite runtime: its artifact has a fixed batch of 1 (one invoke per row),
+# so coalescing requests would only add the wait, never a faster pass.
+MICRO_BATCH_MAX_SIZE = int(os.environ.get("WEATHERLENS_MAX_BATCH", 32))
+MICRO_BATCH_MAX_LATENCY_MS = float(os.environ.get("WEATHERLENS_MAX_LATENCY_MS", 5.0))
+
+# Prepared training arrays keyed by source hash + settings (dataset_cache.py)
+DATASET_CACHE_DIR = ".dataset_cache"
+
+FORECAST_CACHE_DIR = ".forecast_cache"
+FORECAST_CACHE_TTL_SECONDS = 6 * 3600
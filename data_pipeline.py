@@ -0,0 +1,160 @@
+import numpy as np
+import tensorflow as tf
+
+from config import FEATURE_COLS, TARGET_COL
+from scaling import CityScaler, train_split_end
+from windowing import build_window_index
+
+SPLITS = ("train", "val", "test")
+
+# ============================
+# 1. Per-city split + scaling 📊
+# ============================
+
+def split_scale_city_arrays(city_df, feature_cols, train_frac=0.7, val_frac=0.15,
+                            dtype=np.float32):
+    """
+    Chronological train/val/test split of one city's DataFrame, min-max scaled
+    with parameters fit on the train part only (same as split_scale_city in main.ipynb).
+    Returns ({"train": arr, "val": arr, "test": arr}, scaler); arrays are (T_split, num_features).
+    """
+    city_df = city_df.sort_values("time")
+    values = city_df[feature_cols].to_numpy()
+
+    n = len(values)
+    train_end = train_split_end(n, train_frac)
+    val_end = int(n * (train_frac + val_frac))
+
+    scaler = CityScaler.fit(values[:train_end])
+
+    scaled = scaler.transform(values).astype(dtype, copy=False)
+    parts = {
+        "train": scaled[:train_end],
+        "val": scaled[train_end:val_end],
+        "test": scaled[val_end:],
+    }
+    return parts, scaler
+
+
+def prepare_city_splits(df, feature_cols=FEATURE_COLS, train_frac=0.7, val_frac=0.15,
+                        dtype=np.float32, workers=None):
+    """
+    Split and scale every city in df.
+    Returns (splits, cities, scalers) where splits[name] is a list of per-city
+    arrays in the same order as cities.
+    workers: fan cities out over that many processes (parallel_prep.py; arrays
+    come back as memmap views instead of in-memory copies). None = serial.
+    """
+    if workers is not None:
+        from parallel_prep import prepare_city_splits_parallel
+        return prepare_city_splits_parallel(df, feature_cols, train_frac, val_frac, dtype, max_workers=workers)
+
+    cities = list(df["city"].unique())
+    splits = {name: [] for name in SPLITS}
+    scalers = {}
+
+    for c in cities:
+        parts, scaler = split_scale_city_arrays(
+            df[df["city"] == c], feature_cols, train_frac, val_frac, dtype
+        )
+        for name in SPLITS:
+            splits[name].append(parts[name])
+        scalers[c] = scaler
+
+    return splits, cities, scalers
+
+# ============================
+# 2. Streaming window dataset 🌊
+# ============================
+
+def make_window_dataset(city_arrays, lookback, horizon, target_index=0,
+                        batch_size=64, shuffle=False, seed=None, dtype="float32", index=None):
+    """
+    tf.data pipeline that cuts (lookback, horizon) windows on the fly.
+
+    city_arrays: list of per-city scaled (T, num_features) arrays.
+    target_index: one feature index, or a list of them for multi-output targets.
+    The series are held once in memory (in dtype, e.g. "float16" to halve it);
+    only the (start) index is shuffled, and each batch is gathered when needed.
+    Yields X: (B, lookback, num_features) in dtype, y: (B, horizon) float32,
+    or (B, horizon, num_targets) when target_index is a list.
+    index: precomputed build_window_index table (e.g. from dataset_cache.py).
+    Memmapped arrays (dataset_cache.py) are read into that one tensor too:
+    the cache spares the preparation, not the resident copy of the split.
+    """
+    lengths = [len(a) for a in city_arrays]
+    if index is None:
+        index = build_window_index(lengths, lookback, horizon)
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    starts = offsets[index[:, 0]] + index[:, 1]
+
+    num_features = city_arrays[0].shape[1] if city_arrays else 0
+    if len(starts):
+        series_np = np.concatenate(city_arrays, axis=0)
+    else:
+        series_np = np.zeros((0, num_features))
+    series = tf.constant(series_np.astype(dtype, copy=False))
+    if isinstance(target_index, (list, tuple)):
+        target = tf.cast(tf.gather(series, list(target_index), axis=1), tf.float32)
+    else:
+        target = tf.cast(series[:, target_index], tf.float32)
+
+    hist_steps = tf.range(lookback, dtype=tf.int64)
+    future_steps = tf.range(lookback, lookback + horizon, dtype=tf.int64)
+
+    def gather_windows(batch_starts):
+        X = tf.gather(series, batch_starts[:, None] + hist_steps)
+        y = tf.gather(target, batch_starts[:, None] + future_steps)
+        return X, y
+
+    ds = tf.data.Dataset.from_tensor_slices(starts)
+    if shuffle and len(starts):
+        ds = ds.shuffle(len(starts), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size)
+    ds = ds.map(gather_windows, num_parallel_calls=tf.data.AUTOTUNE)
+    ds = ds.prefetch(tf.data.AUTOTUNE)
+    return ds
+
+
+def make_split_datasets(df, lookback, horizon, feature_cols=FEATURE_COLS,
+                        target_col=TARGET_COL, batch_size=64, dtype="float32",
+                        train_frac=0.7, val_frac=0.15, seed=None, workers=None):
+    """
+    Build train/val/test window datasets for every city in df.
+    target_col may be a list of columns (e.g. FEATURE_COLS) for multi-output windows.
+    Only the train split is shuffled.
+    Returns ({"train": ds, "val": ds, "test": ds}, scalers).
+    """
+    splits, cities, scalers = prepare_city_splits(
+        df, feature_cols, train_frac, val_frac, dtype=np.dtype(dtype), workers=workers
+    )
+    datasets = make_datasets_from_splits(
+        splits, lookback, horizon, feature_cols, target_col, batch_size, dtype, seed
+    )
+    return datasets, scalers
+
+
+def make_datasets_from_splits(splits, lookback, horizon, feature_cols=FEATURE_COLS,
+                              target_col=TARGET_COL, batch_size=64, dtype="float32",
+                              seed=None, index_tables=None):
+    """
+    Window datasets over already split + scaled per-city arrays
+    (prepare_city_splits or dataset_cache.cached_city_splits).
+    """
+    if isinstance(target_col, str):
+        target_index = feature_cols.index(target_col)
+    else:
+        target_index = [feature_cols.index(c) for c in target_col]
+
+    datasets = {}
+    for name in SPLITS:
+        datasets[name] = make_window_dataset(
+            splits[name], lookback, horizon,
+            target_index=target_index,
+            batch_size=batch_size,
+            shuffle=(name == "train"),
+            seed=seed,
+            dtype=dtype,
+            index=None if index_tables is None else index_tables[name],
+        )
+    return datasets
@@ -0,0 +1,198 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import FEATURE_COLS, LOOKBACK_HOURS, HORIZON_HOURS, HISTORY_CSV, DATASET_CACHE_DIR
+from file_hash import tree_fingerprint
+from history_store import read_history_store
+from parallel_prep import SPLITS, prepare_city_splits_parallel
+from scaling import CityScaler
+from windowing import build_window_index
+
+DATASET_CACHE_VERSION = 1
+
+# ============================
+# 1. Cache key 🔑
+# ============================
+
+def source_fingerprint(path):
+    """
+    Content hash of the history source: the CSV, or every file of the Parquet
+    store (partitions and append fragments; staged backfill chunks are not read
+    until compacted, so they are left out). File hashes are memoized on mtime and size.
+    """
+    return tree_fingerprint(path, skip_dirs=("_staging",))
+
+def dataset_key(source_path, feature_cols=FEATURE_COLS, lookback=LOOKBACK_HOURS, horizon=HORIZON_HOURS,
+                train_frac=0.7, val_frac=0.15, dtype="float32"):
+    """
+    Everything the prepared arrays depend on; any change gives a new entry.
+    """
+    params = {
+        "version": DATASET_CACHE_VERSION,
+        "source": source_fingerprint(source_path),
+        "feature_cols": list(feature_cols),
+        "lookback": lookback,
+        "horizon": horizon,
+        "train_frac": train_frac,
+        "val_frac": val_frac,
+        "dtype": np.dtype(dtype).name,
+    }
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:20]
+    return digest, params
+
+# ============================
+# 2. Build / map an entry 💾
+# ============================
+
+def _read_source(source_path):
+    """
+    The history sorted by city then time (train.py's uncached order), from the
+    CSV or from a Parquet store directory.
+    """
+    if os.path.isdir(source_path):
+        return read_history_store(source_path)
+    return pd.read_csv(source_path, parse_dates=["time"]).sort_values(["city", "time"]).reset_index(drop=True)
+
+def _build_entry(entry_dir, source_path, params, workers):
+    """
+    Prepare into a temporary sibling directory, then rename it into place, so a
+    crashed or concurrent build never leaves a half-written entry behind.
+    """
+    tmp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    df = _read_source(source_path)
+    splits, cities, scalers = prepare_city_splits_parallel(
+        df, params["feature_cols"], params["train_frac"], params["val_frac"],
+        np.dtype(params["dtype"]), max_workers=workers, workdir=tmp_dir,
+    )
+
+    for name in SPLITS:
+        index = build_window_index([len(a) for a in splits[name]], params["lookback"], params["horizon"])
+        np.save(os.path.join(tmp_dir, f"index_{name}.npy"), index)
+
+    lengths = [sum(len(splits[name][i]) for name in SPLITS) for i in range(len(cities))]
+    meta = dict(params)
+    meta["cities"] = cities
+    meta["lengths"] = [int(n) for n in lengths]
+    meta["split_lengths"] = {name: [len(a) for a in splits[name]] for name in SPLITS}
+    meta["scalers"] = {c: {"min": s.min_.tolist(), "scale": s.scale_.tolist()} for c, s in scalers.items()}
+    meta["created"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=1)
+
+    del splits   # drop the memmaps of the temporary path before renaming it
+    try:
+        os.replace(tmp_dir, entry_dir)
+    except OSError:
+        # Another process finished the same entry first; theirs is identical
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def _map_entry(entry_dir):
+    """
+    Memory-map an entry: (splits, cities, scalers, index_tables).
+    """
+    with open(os.path.join(entry_dir, "meta.json")) as f:
+        meta = json.load(f)
+    scaled = np.load(os.path.join(entry_dir, "scaled.npy"), mmap_mode="r")
+
+    splits = {name: [] for name in SPLITS}
+    offset = 0
+    for i, n in enumerate(meta["lengths"]):
+        start = offset
+        for name in SPLITS:
+            split_len = meta["split_lengths"][name][i]
+            splits[name].append(scaled[start:start + split_len])
+            start += split_len
+        offset += n
+
+    index_tables = {
+        name: np.load(os.path.join(entry_dir, f"index_{name}.npy"), mmap_mode="r") for name in SPLITS
+    }
+    scalers = {c: CityScaler(p["min"], p["scale"]) for c, p in meta["scalers"].items()}
+    return splits, meta["cities"], scalers, index_tables
+
+
+def cached_city_splits(source_path=HISTORY_CSV, feature_cols=FEATURE_COLS, lookback=LOOKBACK_HOURS,
+                       horizon=HORIZON_HOURS, train_frac=0.7, val_frac=0.15, dtype="float32",
+                       cache_dir=DATASET_CACHE_DIR, workers=1, keep=3):
+    """
+    prepare_city_splits for a history file, served from the on-disk cache when
+    the source content and every preparation setting match a previous run.
+
+    Returns (splits, cities, scalers, index_tables, hit): splits[name] are
+    read-only memmap views per city, index_tables[name] the (city_id, start)
+    window tables for make_window_dataset. Only the keep newest entries are kept.
+
+    A hit saves the read / split / scale / window-index work, not memory:
+    make_window_dataset still copies each split into one in-memory tensor.
+    """
+    key, params = dataset_key(source_path, feature_cols, lookback, horizon, train_frac, val_frac, dtype)
+    entry_dir = os.path.join(cache_dir, key)
+
+    hit = os.path.exists(os.path.join(entry_dir, "meta.json"))
+    if not hit:
+        os.makedirs(cache_dir, exist_ok=True)
+        _build_entry(entry_dir, source_path, params, workers)
+        prune(cache_dir, keep)
+    else:
+        os.utime(entry_dir)   # mark as recently used for prune()
+
+    return (*_map_entry(entry_dir), hit)
+
+# ============================
+# 3. Housekeeping 🧹
+# ============================
+
+def list_entries(cache_dir=DATASET_CACHE_DIR):
+    """
+    [(key, meta, size_bytes)], most recently used first.
+    """
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = []
+    for key in os.listdir(cache_dir):
+        meta_path = os.path.join(cache_dir, key, "meta.json")
+        if not os.path.exists(meta_path):
+            continue
+        with open(meta_path) as f:
+            meta = json.load(f)
+        entry_dir = os.path.join(cache_dir, key)
+        size = sum(os.path.getsize(os.path.join(entry_dir, n)) for n in os.listdir(entry_dir))
+        entries.append((key, meta, size, os.path.getmtime(entry_dir)))
+    entries.sort(key=lambda e: e[3], reverse=True)
+    return [e[:3] for e in entries]
+
+def prune(cache_dir=DATASET_CACHE_DIR, keep=3):
+    for key, _, _ in list_entries(cache_dir)[keep:]:
+        shutil.rmtree(os.path.join(cache_dir, key), ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build, inspect or clear the prepared-dataset cache.")
+    parser.add_argument("--csv", default=HISTORY_CSV, help="History CSV or Parquet store directory")
+    parser.add_argument("--cache-dir", default=DATASET_CACHE_DIR)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--list", action="store_true", help="Show cached entries and exit")
+    parser.add_argument("--clear", action="store_true", help="Remove every cached entry and exit")
+    args = parser.parse_args()
+
+    if args.clear:
+        shutil.rmtree(args.cache_dir, ignore_errors=True)
+        print(f"🧹 Cleared {args.cache_dir}")
+    elif args.list:
+        for key, meta, size in list_entries(args.cache_dir):
+            print(f"{key}  {meta['created']}  {len(meta['cities'])} cities  "
+                  f"lookback={meta['lookback']} horizon={meta['horizon']} {meta['dtype']}  {size / 1e6:.1f} MB")
+    else:
+        t0 = time.perf_counter()
+        *_, hit = cached_city_splits(args.csv, dtype=args.dtype, cache_dir=args.cache_dir, workers=args.workers)
+        print(f"{'✅ Hit' if hit else '🛠️ Built'} in {time.perf_counter() - t0:.3f} s")
@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    FEATURE_COLS, TARGET_COL, LOOKBACK_HOURS, HORIZON_HOURS,
+    HISTORY_CSV, WEIGHTS_PATH, TFLITE_PATHS,
+)
+from forecast import predict_batch
+from mem_usage import peak_rss_mb, rss_mb
+from parallel_prep import prepare_city_splits_parallel
+from scaling import inverse_scale_targets
+from windowing import window_views
+
+# ============================
+# 1. Model variants 🎚️
+# ============================
+
+def _keras_float32():
+    from forecast import load_lstm_model
+    return load_lstm_model(WEIGHTS_PATH)
+
+def _tflite(variant):
+    def load():
+        from lite_forecast import LiteForecaster
+        return LiteForecaster(TFLITE_PATHS[variant])
+    return load
+
+def _numpy(dtype):
+    def load():
+        from numpy_lstm import NumpyLSTMForecaster
+        return NumpyLSTMForecaster(WEIGHTS_PATH, dtype)
+    return load
+
+# name -> (loader, artifact on disk)
+VARIANTS = {
+    "keras_float32": (_keras_float32, WEIGHTS_PATH),
+    "tflite_float32": (_tflite("float32"), TFLITE_PATHS["float32"]),
+    "tflite_float16": (_tflite("float16"), TFLITE_PATHS["float16"]),
+    "tflite_dynamic_int8": (_tflite("dynamic_int8"), TFLITE_PATHS["dynamic_int8"]),
+    "numpy_float32": (_numpy(np.float32), WEIGHTS_PATH),
+    "numpy_float16": (_numpy(np.float16), WEIGHTS_PATH),
+}
+
+# ============================
+# 2. Held-out windows 📊
+# ============================
+
+def held_out_windows(df, split="test", stride=6, train_frac=0.7, val_frac=0.15):
+    """
+    Windows of the chronological held-out split of every city (scalers fit on
+    train only, as in training), every stride-th start. Prepared in-process
+    with parallel_prep / scaling, so this process never imports TensorFlow.
+    Returns (X float32 (N, lookback, F), y_true °C (N, horizon), row_cities).
+    """
+    splits, cities, scalers = prepare_city_splits_parallel(df, FEATURE_COLS, train_frac, val_frac, max_workers=1)
+    target_index = FEATURE_COLS.index(TARGET_COL)
+
+    Xs, ys, row_cities = [], [], []
+    for c, arr in zip(cities, splits[split]):
+        X, y = window_views(arr, arr[:, target_index], LOOKBACK_HOURS, HORIZON_HOURS)
+        Xs.append(X[::stride])
+        ys.append(y[::stride])
+        row_cities += [c] * len(X[::stride])
+
+    X = np.ascontiguousarray(np.concatenate(Xs), dtype=np.float32)
+    y_true_c = inverse_scale_targets(np.concatenate(ys), scalers, row_cities)
+    return X, y_true_c, row_cities, scalers
+
+# ============================
+# 3. Accuracy / latency / memory report 📋
+# ============================
+
+def _median_ms(fn, repeats):
+    fn()   # warm up
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return 1000.0 * float(np.median(times))
+
+def measure_variant(name, windows_path, pred_path, latency_batch=4, repeats=10):
+    """
+    Load one variant and run it over the saved windows (the child-process side
+    of evaluate_variants). Predictions (scaled) go to pred_path; returns the
+    load time, RSS around the load, latencies and peak RSS of this process.
+    """
+    X = np.load(windows_path)
+    rss_before = rss_mb()
+    t0 = time.perf_counter()
+    model = VARIANTS[name][0]()
+    load_s = time.perf_counter() - t0
+    rss_after = rss_mb()
+
+    np.save(pred_path, np.asarray(predict_batch(model, X, batch_size=64), dtype=np.float32))
+    return {
+        "latency_ms_batch1": _median_ms(lambda: model.predict_on_batch(X[:1]), repeats),
+        f"latency_ms_batch{latency_batch}": _median_ms(lambda: model.predict_on_batch(X[:latency_batch]), repeats),
+        "load_s": load_s,
+        "rss_delta_mb": rss_after - rss_before,
+        "rss_after_load_mb": rss_after,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def _run_variant_child(name, windows_path, pred_path, latency_batch, repeats):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", name, "--windows", windows_path,
+         "--pred-out", pred_path, "--latency-batch", str(latency_batch), "--repeats", str(repeats)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def evaluate_variants(df, variants=None, baseline="numpy_float32", split="test", stride=6,
+                      latency_batch=4, repeats=10):
+    """
+    For each variant: MAE (°C) per horizon hour on the held-out split, the same
+    against the float32 baseline's predictions, batch-1 / batch-N latency,
+    artifact size and RSS growth on load.
+    Returns (summary DataFrame, {variant: per-hour MAE array}).
+    Every variant is loaded and timed in a fresh child process, so its load
+    time and RSS include its own runtime (TensorFlow, the TFLite interpreter)
+    and nothing loaded for the windows or for an earlier variant.
+    """
+    variants = list(variants or VARIANTS)
+    if baseline not in variants:
+        variants.insert(0, baseline)
+    else:
+        variants.insert(0, variants.pop(variants.index(baseline)))
+
+    X, y_true_c, row_cities, scalers = held_out_windows(df, split, stride)
+
+    rows, mae_per_hour, base_pred = [], {}, None
+    with tempfile.TemporaryDirectory(prefix="weatherlens_eval_") as workdir:
+        windows_path = os.path.join(workdir, "windows.npy")
+        np.save(windows_path, X)
+        for name in variants:
+            pred_path = os.path.join(workdir, f"{name}.npy")
+            child = _run_variant_child(name, windows_path, pred_path, latency_batch, repeats)
+
+            y_pred_c = inverse_scale_targets(np.load(pred_path), scalers, row_cities)
+            if base_pred is None:
+                base_pred = y_pred_c
+            mae = np.abs(y_pred_c - y_true_c).mean(axis=0)
+            mae_per_hour[name] = mae
+
+            rows.append({
+                "variant": name,
+                "mae_c": float(mae.mean()),
+                "mae_h1_c": float(mae[0]),
+                "mae_h24_c": float(mae[23]),
+                "mae_h168_c": float(mae[-1]),
+                "max_mae_delta_c": float(np.max(mae - mae_per_hour[baseline])),
+                "max_abs_diff_vs_baseline_c": float(np.max(np.abs(y_pred_c - base_pred))),
+                "artifact_kb": os.path.getsize(VARIANTS[name][1]) / 1024,
+                **child,
+            })
+            print(f"✅ {name}: load {child['load_s']:.2f} s, +{child['rss_delta_mb']:.1f} MB", flush=True)
+
+    return pd.DataFrame(rows), mae_per_hour
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Accuracy, latency and memory of float32 / float16 / int8 variants.")
+    parser.add_argument("--csv", default=HISTORY_CSV)
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=None,
+                        help="Default: all (keras_float32 and, without a standalone interpreter, "
+                             "the tflite_* variants need TensorFlow)")
+    parser.add_argument("--baseline", choices=list(VARIANTS), default="numpy_float32")
+    parser.add_argument("--split", choices=["val", "test"], default="test")
+    parser.add_argument("--stride", type=int, default=6, help="Hours between evaluated window starts")
+    parser.add_argument("--latency-batch", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--out", default=None, help="Write summary + per-hour MAE as JSON here")
+    parser.add_argument("--per-hour-csv", default=None, help="Write the MAE-per-horizon-hour table here")
+    parser.add_argument("--child", choices=list(VARIANTS), default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--windows", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--pred-out", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_variant(args.child, args.windows, args.pred_out, args.latency_batch, args.repeats)))
+        sys.exit(0)
+
+    history_df = pd.read_csv(args.csv, parse_dates=["time"])
+    summary, mae_per_hour = evaluate_variants(
+        history_df, args.variants, args.baseline, args.split, args.stride,
+        args.latency_batch, args.repeats,
+    )
+
+    print(summary.to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+    per_hour = pd.DataFrame(mae_per_hour)
+    per_hour.index = pd.RangeIndex(1, HORIZON_HOURS + 1, name="hour_ahead")
+    if args.per_hour_csv:
+        per_hour.to_csv(args.per_hour_csv)
+        print(f"✅ Saved: {args.per_hour_csv}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                "split": args.split,
+                "stride": args.stride,
+                "baseline": args.baseline,
+                "summary": summary.to_dict(orient="records"),
+                "mae_per_hour_c": {k: v.tolist() for k, v in mae_per_hour.items()},
+            }, f, indent=1)
+        print(f"✅ Saved: {args.out}")
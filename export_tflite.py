@@ -0,0 +1,86 @@
+import argparse
+
+import numpy as np
+import tensorflow as tf
+
+from config import FEATURE_COLS, LOOKBACK_HOURS, WEIGHTS_PATH, TFLITE_PATHS
+
+# Parity tolerance (scaled units) of each variant against the Keras float32 model
+PARITY_ATOL = {"float32": 1e-4, "float16": 1e-3, "dynamic_int8": 2e-2}
+
+# ============================
+# 1. Keras -> TFLite export 📦
+# ============================
+
+def export_tflite(weights_path=WEIGHTS_PATH, out_path=None, quantize="float32"):
+    """
+    Convert the trained LSTM into a self-contained .tflite flatbuffer
+    (weights frozen in, no Keras needed to run it).
+    The input is fixed at batch 1: the converter can only lower the LSTM
+    loop with a static batch size; lite_forecast.py runs one row per invoke.
+
+    quantize="float32":      no post-training quantization
+    quantize="float16":      weights stored as float16 (about half the size)
+    quantize="dynamic_int8": dynamic-range quantization, int8 weights with
+                             float activations (full-integer calibration
+                             crashes the converter on this LSTM)
+    """
+    if quantize not in TFLITE_PATHS:
+        raise ValueError(f"Unknown quantize {quantize!r}; expected one of {list(TFLITE_PATHS)}")
+    out_path = out_path or TFLITE_PATHS[quantize]
+
+    from forecast import load_lstm_model
+
+    model = load_lstm_model(weights_path)
+    x = tf.keras.Input(batch_shape=(1, LOOKBACK_HOURS, len(FEATURE_COLS)))
+    fixed_batch_model = tf.keras.Model(x, model(x, training=False))
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(fixed_batch_model)
+    if quantize != "float32":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantize == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    flatbuffer = converter.convert()
+    with open(out_path, "wb") as f:
+        f.write(flatbuffer)
+    return out_path, model
+
+# ============================
+# 2. Parity check vs Keras ✅
+# ============================
+
+def check_parity(model, tflite_path=TFLITE_PATHS["float32"], n_samples=8, atol=1e-4, seed=0):
+    """
+    Compare the exported artifact with the Keras model on random scaled windows.
+    Returns the max absolute difference (scaled units); raises if above atol.
+    """
+    from lite_forecast import LiteForecaster
+
+    rng = np.random.default_rng(seed)
+    X = rng.random((n_samples, LOOKBACK_HOURS, len(FEATURE_COLS)), dtype=np.float32)
+
+    y_keras = np.asarray(model.predict_on_batch(X))
+    y_lite = LiteForecaster(tflite_path).predict_on_batch(X)
+
+    max_diff = float(np.max(np.abs(y_keras - y_lite)))
+    if max_diff > atol:
+        raise AssertionError(f"TFLite output differs from Keras by {max_diff:.2e} (atol {atol:.0e})")
+    return max_diff
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the LSTM to TFLite for the slim serving path.")
+    parser.add_argument("--weights", default=WEIGHTS_PATH)
+    parser.add_argument("--out", default=None, help="Default: the configured path of the variant")
+    parser.add_argument("--quantize", nargs="+", choices=list(TFLITE_PATHS), default=["float32"],
+                        help="Variant(s) to export (--out only applies to a single one)")
+    parser.add_argument("--no-check", action="store_true", help="Skip the Keras parity check")
+    args = parser.parse_args()
+
+    for variant in args.quantize:
+        out = args.out if len(args.quantize) == 1 else None
+        out_path, model = export_tflite(args.weights, out, variant)
+        print(f"✅ Saved: {out_path}")
+        if not args.no_check:
+            max_diff = check_parity(model, out_path, atol=PARITY_ATOL[variant])
+            print(f"✅ Parity vs Keras ({variant}): max |diff| = {max_diff:.2e}")
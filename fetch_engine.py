@@ -0,0 +1,128 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# ============================
+# 1. Rate limiting ⏳
+# ============================
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: at most `rate` requests per second on average,
+    with bursts of up to `burst` requests.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+# ============================
+# 2. Pooled session + retries 🔁
+# ============================
+
+def make_session(pool_size=16):
+    """
+    requests.Session whose connection pool is large enough for pool_size threads,
+    so keep-alive connections are reused instead of reopened per request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class FetchEngine:
+    """
+    Shared HTTP client for Open-Meteo calls.
+
+    max_workers: how many requests may be in flight at once (see map()).
+    requests_per_second: optional global rate limit across all threads.
+    timeout: per-request (connect, read) timeout in seconds.
+    max_retries / backoff / max_backoff: exponential backoff with jitter on
+    connection errors, timeouts and HTTP 429/5xx (Retry-After is honoured).
+    """
+
+    def __init__(self, max_workers=8, requests_per_second=None, timeout=(5, 60),
+                 max_retries=4, backoff=0.5, max_backoff=30.0, session=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = session or make_session(pool_size=max_workers)
+        self.limiter = RateLimiter(requests_per_second) if requests_per_second else None
+
+    def _retry_delay(self, attempt, response=None):
+        if response is not None and response.headers.get("Retry-After", "").isdigit():
+            return min(float(response.headers["Retry-After"]), self.max_backoff)
+        delay = min(self.backoff * (2 ** attempt), self.max_backoff)
+        return delay * random.uniform(0.5, 1.0)
+
+    def get_json(self, url, params=None):
+        for attempt in range(self.max_retries + 1):
+            if self.limiter is not None:
+                self.limiter.acquire()
+
+            try:
+                r = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._retry_delay(attempt))
+                continue
+
+            if r.status_code in RETRY_STATUS and attempt < self.max_retries:
+                time.sleep(self._retry_delay(attempt, r))
+                continue
+
+            r.raise_for_status()
+            return r.json()
+
+    def map(self, fn, items):
+        """
+        Run fn over items on up to max_workers threads; results keep input order.
+        """
+        items = list(items)
+        if self.max_workers <= 1 or len(items) <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            return list(pool.map(fn, items))
+
+    def close(self):
+        self.session.close()
+
+
+_default_engine = None
+_default_lock = threading.Lock()
+
+def default_engine():
+    """
+    Process-wide engine used when callers do not pass their own.
+    """
+    global _default_engine
+    with _default_lock:
+        if _default_engine is None:
+            _default_engine = FetchEngine()
+        return _default_engine
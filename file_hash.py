@@ -0,0 +1,42 @@
+import hashlib
+import os
+
+# ============================
+# Content fingerprints 🔑
+# ============================
+# Short sha256 digests used wherever a cache must notice that an input file
+# changed: model artifacts (forecast_cache.py keys) and training sources
+# (dataset_cache.py keys).
+
+_fingerprints = {}
+
+def file_fingerprint(path):
+    """
+    Short sha256 of a file's content.
+    Memoized on (path, mtime, size), so an unchanged file is hashed once per process.
+    """
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if memo_key not in _fingerprints:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        _fingerprints[memo_key] = h.hexdigest()[:16]
+    return _fingerprints[memo_key]
+
+def tree_fingerprint(path, skip_dirs=()):
+    """
+    file_fingerprint of a file, or a hash of every file (relative path and
+    content) under a directory, ignoring subdirectories named in skip_dirs.
+    """
+    if not os.path.isdir(path):
+        return file_fingerprint(path)
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in skip_dirs)
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            h.update(os.path.relpath(full, path).encode())
+            h.update(file_fingerprint(full).encode())
+    return h.hexdigest()[:16]
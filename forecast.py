@@ -0,0 +1,284 @@
+import argparse
+import os
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    FEATURE_COLS, TARGET_COL, LOOKBACK_HOURS, HORIZON_HOURS,
+    HISTORY_CSV, HISTORY_STORE_DIR, WEIGHTS_PATH, SCALERS_PATH, TFLITE_PATHS,
+    MULTI_TARGET_COLS,
+)
+from file_hash import file_fingerprint
+from forecast_cache import forecast_key
+from history_index import as_history_index
+from history_store import store_exists, read_history_store
+from scaling import load_city_scalers, inverse_scale_targets
+
+# =========================
+# 1. Model & data loading 🧠
+# =========================
+
+# Output column of each forecast variable in the tidy frames
+PRED_COLS = {
+    "temperature_2m": "pred_temp_c",
+    "relative_humidity_2m": "pred_humidity_pct",
+    "pressure_msl": "pred_pressure_hpa",
+    "wind_speed_10m": "pred_wind_kmh",
+}
+
+def load_lstm_model(weights_path=WEIGHTS_PATH, num_targets=None):
+    # Imported here so the TFLite serving path never pulls in tensorflow.keras
+    from lstm_model import build_lstm_model
+
+    model = build_lstm_model(LOOKBACK_HOURS, len(FEATURE_COLS), HORIZON_HOURS, num_targets)
+    model.load_weights(weights_path)
+    model.compile(optimizer="adam", loss="mse")
+    return model
+
+def load_forecast_model(runtime="keras", weights_path=WEIGHTS_PATH, tflite_path=None,
+                        num_targets=None):
+    """
+    runtime="keras": full TensorFlow model rebuilt from the weights.
+    runtime="tflite": exported artifact on a slim interpreter (see lite_forecast.py);
+                      tflite_path defaults to the WEATHERLENS_TFLITE variant.
+    runtime="numpy": pure-NumPy LSTM reading the same weights file (see numpy_lstm.py).
+    All expose predict / predict_on_batch, so the rest of this module is runtime-agnostic.
+    num_targets: set for the multi-output variant (MULTI_WEIGHTS_PATH); the numpy
+    runtime returns its head flat, forecast_cities_multi reshapes either way.
+    """
+    if runtime == "tflite":
+        from lite_forecast import LiteForecaster
+        return LiteForecaster(tflite_path)
+    if runtime == "numpy":
+        from numpy_lstm import NumpyLSTMForecaster
+        return NumpyLSTMForecaster(weights_path)
+    if runtime == "keras":
+        return load_lstm_model(weights_path, num_targets)
+    raise ValueError(f"Unknown runtime {runtime!r}; expected 'keras', 'tflite' or 'numpy'")
+
+def forecast_model_version(runtime="keras", weights_path=WEIGHTS_PATH, tflite_path=None):
+    """
+    Cache-key model version: the runtime plus the fingerprint of the file that
+    runtime actually loads (the .tflite artifact, or the weights for keras / numpy),
+    so switching runtime or replacing an artifact never serves stale forecasts.
+    TFLite versions also name the variant (float32 / float16 / dynamic_int8).
+    """
+    if runtime == "tflite":
+        from lite_forecast import tflite_path as configured_tflite_path
+        tflite_path = tflite_path or configured_tflite_path()
+        variants = {os.path.abspath(p): v for v, p in TFLITE_PATHS.items()}
+        variant = variants.get(os.path.abspath(tflite_path), os.path.basename(tflite_path))
+        return f"tflite-{variant}-{file_fingerprint(tflite_path)}"
+    return f"{runtime}-{file_fingerprint(weights_path)}"
+
+def load_history(csv_path=HISTORY_CSV, store_dir=HISTORY_STORE_DIR, cities=None, tail_hours=None):
+    """
+    Prefer the per-city Parquet store (only the requested cities / tail are read);
+    fall back to the CSV snapshot when no store has been written.
+    """
+    if store_dir and store_exists(store_dir):
+        return read_history_store(store_dir, cities=cities, tail_hours=tail_hours)
+
+    df = pd.read_csv(csv_path, parse_dates=["time"])
+    if cities is not None:
+        df = df[df["city"].isin(cities)]
+    df = df.sort_values(["city", "time"]).reset_index(drop=True)
+    if tail_hours is not None:
+        df = df.groupby("city", sort=False).tail(tail_hours).reset_index(drop=True)
+    return df
+
+def load_scalers(path=SCALERS_PATH):
+    """
+    Per-city scalers saved at training time (train split only), so serving
+    scales exactly like training did and startup never scans the history.
+    """
+    return load_city_scalers(path, FEATURE_COLS)
+
+def inverse_temp(scaled_temp_1d, scaler):
+    i = FEATURE_COLS.index(TARGET_COL)
+    return (np.asarray(scaled_temp_1d, dtype=np.float64) - scaler.min_[i]) / scaler.scale_[i]
+
+# =========================
+# 2. Single-city forecast 🔁
+# =========================
+
+def build_last_window_for_city(df, city, lookback_hours, scalers):
+    """
+    (X (1, lookback, num_features) float32 scaled, scaler, last_time).
+    df: a HistoryIndex or LiveState (constant-time slice) or a load_history() frame, which
+    is indexed first — pass the index when forecasting repeatedly.
+    """
+    if city not in scalers:
+        raise KeyError(city)
+    return as_history_index(df, scalers, cities=[city]).last_window(city, lookback_hours)
+
+def display_subset(df_full):
+    """
+    Day 1 hourly + Days 2-7 every 4 hours.
+    """
+    mask_display = (df_full["hour_ahead"] < 24) | (
+        (df_full["hour_ahead"] >= 24) &
+        (((df_full["hour_ahead"] - 24) % 4) == 0)
+    )
+    return df_full[mask_display].reset_index(drop=True)
+
+def forecast_7_days(model, X_sample, scaler, last_time):
+    y_pred = model.predict(X_sample, verbose=0)[0]
+    return postprocess_7_days(y_pred, scaler, last_time)
+
+def postprocess_7_days(y_pred, scaler, last_time):
+    """
+    Scaled (horizon,) prediction -> (df_full, df_display) in °C.
+    """
+    y_pred_c = inverse_temp(y_pred, scaler)
+
+    hours = np.arange(HORIZON_HOURS)
+    times_future = [last_time + timedelta(hours=int(h+1)) for h in hours]
+
+    df_full = pd.DataFrame({
+        "time": times_future,
+        "hour_ahead": hours,
+        "pred_temp_c": y_pred_c
+    })
+    return df_full, display_subset(df_full)
+
+def forecast_city_cached(model, df, scalers, city, cache, model_version,
+                         lookback_hours=LOOKBACK_HOURS):
+    """
+    forecast_7_days behind a ForecastCache keyed by (city, last_time, model_version).
+    Returns (df_full, df_display, last_time); df_full is a copy the caller may modify.
+    """
+    index = as_history_index(df, scalers, cities=[city])
+    # Window and time from one call (a locked snapshot on LiveState), so an
+    # ingest landing in between can never file a newer forecast under an older hour
+    X_sample, scaler, last_time = index.last_window(city, lookback_hours)
+    key = forecast_key(city, last_time, model_version)
+
+    def compute():
+        df_full, _ = forecast_7_days(model, X_sample, scaler, last_time)
+        return df_full
+
+    df_full = cache.get_or_compute(key, compute).copy()
+    return df_full, display_subset(df_full), last_time
+
+# =========================
+# 3. Batched multi-city forecast 🌍
+# =========================
+
+def build_last_windows(df, cities, lookback_hours, scalers):
+    """
+    Stack the last lookback_hours of every city into one (N, lookback, num_features) tensor.
+    Returns (X, last_times).
+    """
+    index = as_history_index(df, scalers, cities=cities)
+    X = np.empty((len(cities), lookback_hours, len(FEATURE_COLS)), dtype=np.float32)
+    last_times = []
+    for i, c in enumerate(cities):
+        X_city, _, last_time = index.last_window(c, lookback_hours)
+        X[i] = X_city[0]
+        last_times.append(last_time)
+    return X, last_times
+
+def predict_batch(model, X, batch_size=256):
+    """
+    Forward pass over X in chunks of batch_size, skipping model.predict's
+    per-call dataset setup (one chunk covers a typical city list).
+    """
+    chunks = [
+        np.asarray(model.predict_on_batch(X[i:i + batch_size]))
+        for i in range(0, len(X), batch_size)
+    ]
+    return np.concatenate(chunks, axis=0) if chunks else np.empty((0, HORIZON_HOURS))
+
+def forecast_frame(cities, last_times, y_pred_c, target_cols=None):
+    """
+    Tidy long frame: one row per (city, hour_ahead).
+    y_pred_c: (N, horizon) forecasts in °C, rows aligned with cities, or
+              (N, horizon, K) forecasts of target_cols, one PRED_COLS column each.
+    """
+    n, horizon = y_pred_c.shape[:2]
+    hours = np.arange(horizon)
+    base = np.repeat(pd.to_datetime(pd.Series(last_times)).to_numpy(), horizon)
+    offsets = np.tile((hours + 1).astype("timedelta64[h]"), n)
+
+    frame = pd.DataFrame({
+        "city": np.repeat(np.asarray(cities, dtype=object), horizon),
+        "time": base + offsets,
+        "hour_ahead": np.tile(hours, n),
+    })
+    if y_pred_c.ndim == 2:
+        frame["pred_temp_c"] = y_pred_c.reshape(-1)
+    else:
+        for k, col in enumerate(target_cols):
+            frame[PRED_COLS[col]] = y_pred_c[:, :, k].reshape(-1)
+    return frame
+
+def forecast_cities(model, df, scalers, cities=None, lookback_hours=LOOKBACK_HOURS, batch_size=256):
+    """
+    Forecast 168 hours for several cities (default: all) in one batched forward pass.
+    Returns a tidy frame with columns city, time, hour_ahead, pred_temp_c.
+    """
+    df = as_history_index(df, scalers)
+    if cities is None:
+        cities = df.cities
+    cities = list(cities)
+
+    X, last_times = build_last_windows(df, cities, lookback_hours, scalers)
+    y_pred = predict_batch(model, X, batch_size=batch_size)
+
+    y_pred_c = inverse_scale_targets(y_pred, scalers, cities, TARGET_COL, FEATURE_COLS)
+    return forecast_frame(cities, last_times, y_pred_c)
+
+def forecast_cities_multi(model, df, scalers, cities=None, target_cols=MULTI_TARGET_COLS,
+                          lookback_hours=LOOKBACK_HOURS, batch_size=256):
+    """
+    forecast_cities for the multi-output model: every target_cols variable over
+    168 hours from one forward pass. Returns city, time, hour_ahead plus one
+    PRED_COLS column per variable (pred_temp_c, pred_humidity_pct, ...).
+    """
+    df = as_history_index(df, scalers)
+    if cities is None:
+        cities = df.cities
+    cities = list(cities)
+
+    X, last_times = build_last_windows(df, cities, lookback_hours, scalers)
+    return forecast_windows_multi(model, X, cities, last_times, scalers, target_cols, batch_size)
+
+def forecast_windows_multi(model, X, cities, last_times, scalers, target_cols=MULTI_TARGET_COLS,
+                           batch_size=256):
+    """
+    forecast_cities_multi for windows already cut (X: (N, lookback, num_features),
+    one per city, each ending at its last_times entry).
+    """
+    target_cols = list(target_cols)
+    y_pred = predict_batch(model, X, batch_size=batch_size)
+    y_pred = y_pred.reshape(len(cities), HORIZON_HOURS, len(target_cols))
+
+    y_pred_c = inverse_scale_targets(y_pred, scalers, cities, target_cols, FEATURE_COLS)
+    return forecast_frame(cities, last_times, y_pred_c, target_cols)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched 7-day forecast for many cities.")
+    parser.add_argument("--cities", nargs="*", default=None, help="Subset of cities (default: all)")
+    parser.add_argument("--csv", default=HISTORY_CSV)
+    parser.add_argument("--store", default=HISTORY_STORE_DIR)
+    parser.add_argument("--weights", default=WEIGHTS_PATH)
+    parser.add_argument("--scalers", default=SCALERS_PATH)
+    parser.add_argument("--runtime", choices=["keras", "tflite", "numpy"], default="keras")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--out", default=None, help="Write the forecast frame to this CSV instead of printing")
+    args = parser.parse_args()
+
+    history_df = load_history(args.csv, args.store)
+    scalers = load_scalers(args.scalers)
+    model = load_forecast_model(args.runtime, weights_path=args.weights)
+
+    forecasts = forecast_cities(model, history_df, scalers, args.cities, batch_size=args.batch_size)
+    if args.out:
+        forecasts.to_csv(args.out, index=False)
+        print(f"✅ Saved: {args.out}")
+    else:
+        print(forecasts.to_string(index=False))
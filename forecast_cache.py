@@ -0,0 +1,147 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+# ============================
+# 1. Cache keys 🔑
+# ============================
+
+def forecast_key(city, last_time, model_version):
+    """
+    A forecast only changes when the city's last observation or the weights change.
+    """
+    return (city, last_time.isoformat(), model_version)
+
+# ============================
+# 2. LRU + TTL forecast cache 🗃️
+# ============================
+
+class ForecastCache:
+    """
+    Thread-safe LRU cache with optional TTL and an optional on-disk backend.
+
+    max_entries: in-memory capacity; least recently used entries are evicted first.
+    ttl_seconds: entries older than this are recomputed (None = never expire).
+    disk_dir: if set, entries are also pickled here and reloaded after a restart.
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=None, disk_dir=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()   # key -> (created_at, value)
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _expired(self, created_at):
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def _disk_path(self, key):
+        name = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"{name}.pkl")
+
+    def _load_from_disk(self, key):
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                stored_key, created_at, value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        if stored_key != key or self._expired(created_at):
+            return None
+        return created_at, value
+
+    def _write_to_disk(self, key, created_at, value):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, created_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def _store(self, key, created_at, value):
+        # Caller holds self._lock
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        """
+        Return the cached value for key, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        if self.disk_dir:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                with self._lock:
+                    self._store(key, *entry)
+                    self.hits += 1
+                return entry[1]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        created_at = time.time()
+        with self._lock:
+            self._store(key, created_at, value)
+        if self.disk_dir:
+            self._write_to_disk(key, created_at, value)
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, calling compute() at most once per key
+        even when several threads miss at the same time.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                # Another thread may have filled it while we waited
+                with self._lock:
+                    entry = self._entries.get(key)
+                if entry is not None and not self._expired(entry[0]):
+                    return entry[1]
+
+                value = compute()
+                self.put(key, value)
+            return value
+        finally:
+            # Also when compute() raises, or every failed key would leak its lock
+            with self._lock:
+                self._key_locks.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
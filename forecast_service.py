@@ -0,0 +1,446 @@
+import argparse
+import asyncio
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pandas as pd
+import requests
+
+from config import (
+    WEIGHTS_PATH, MODEL_RUNTIME, FORECAST_CACHE_DIR, FORECAST_CACHE_TTL_SECONDS,
+    MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_LATENCY_MS,
+)
+from forecast import (
+    PRED_COLS, forecast_city_cached, forecast_cities, display_subset, forecast_windows_multi,
+    forecast_model_version,
+)
+from forecast_cache import ForecastCache, forecast_key
+from lazy_resources import ForecastResources
+from live_state import LiveForecaster, LiveState
+from micro_batch import MicroBatcher
+
+log = logging.getLogger(__name__)
+
+# ============================
+# 1. JSON payloads 📦
+# ============================
+
+def forecast_payload(city, df_full, last_time, model_version):
+    """
+    Columnar JSON for one city's 168-hour forecast (every PRED_COLS column present).
+    """
+    payload = {
+        "city": city,
+        "last_time": pd.Timestamp(last_time).isoformat(),
+        "model_version": model_version,
+        "time": [t.isoformat() for t in pd.to_datetime(df_full["time"])],
+        "hour_ahead": df_full["hour_ahead"].astype(int).tolist(),
+    }
+    for col in PRED_COLS.values():
+        if col in df_full:
+            payload[col] = np.round(df_full[col].to_numpy(dtype=np.float64), 4).tolist()
+    return payload
+
+def forecast_from_payload(payload):
+    """
+    Inverse of forecast_payload: (df_full, last_time), df_full like forecast_7_days builds it.
+    """
+    df_full = pd.DataFrame({
+        "time": pd.to_datetime(payload["time"]),
+        "hour_ahead": payload["hour_ahead"],
+    })
+    for col in PRED_COLS.values():
+        if col in payload:
+            df_full[col] = payload[col]
+    return df_full, pd.Timestamp(payload["last_time"])
+
+# ============================
+# 2. Async HTTP service 🌐
+# ============================
+
+class ForecastService:
+    """
+    Loaded resources + forecast cache behind async handlers.
+    Blocking work (loading, windowing, the forward pass) runs in worker threads,
+    so the event loop keeps accepting requests while a forecast is computed.
+    The shared model sits behind a MicroBatcher: concurrent cache misses are
+    coalesced into one forward pass, which also keeps the model single-threaded.
+    On the tflite runtime requests are only serialized (max batch 1): its
+    interpreter runs one row per invoke, so a bigger batch is no faster.
+    """
+
+    def __init__(self, resources=None, cache=None, weights_path=WEIGHTS_PATH,
+                 max_batch_size=MICRO_BATCH_MAX_SIZE, max_latency_ms=MICRO_BATCH_MAX_LATENCY_MS):
+        self.resources = resources or ForecastResources(MODEL_RUNTIME)
+        # not `cache or ...`: an empty ForecastCache is falsy (it has __len__)
+        self.cache = cache if cache is not None else ForecastCache(
+            max_entries=256,
+            ttl_seconds=FORECAST_CACHE_TTL_SECONDS,
+            disk_dir=FORECAST_CACHE_DIR,
+        )
+        self.weights_path = weights_path
+        self.max_batch_size = max_batch_size
+        self.max_latency_ms = max_latency_ms
+        self._model = None
+        self._multi_model = None
+        self._model_guard = threading.Lock()
+        self.live = None
+
+    @property
+    def model(self):
+        with self._model_guard:
+            if self._model is None:
+                max_batch_size = 1 if self.resources.runtime == "tflite" else self.max_batch_size
+                self._model = MicroBatcher(self.resources.model, max_batch_size, self.max_latency_ms)
+        return self._model
+
+    @property
+    def multi_model(self):
+        """
+        Micro-batched multi-output model, or None when it has not been trained.
+        """
+        with self._model_guard:
+            if self._multi_model is None:
+                model = self.resources.multi_model
+                if model is not None:
+                    self._multi_model = MicroBatcher(model, self.max_batch_size, self.max_latency_ms)
+        return self._multi_model
+
+    @property
+    def history(self):
+        """
+        What forecasts are read from: the live ring buffers once streaming
+        ingestion has started, else the loaded history index.
+        """
+        if self.live is not None:
+            return self.live.state
+        return self.resources.history_index
+
+    def start_live(self, source, stop=None):
+        """
+        Stream (city, time, values) observations from source into per-city
+        ring buffers seeded from the history, re-forecasting each city into
+        this service's cache as its new hour lands. Runs on a daemon thread;
+        errors are logged (and counted in metrics()) rather than lost with it.
+        """
+        def run():
+            try:
+                live = LiveForecaster(
+                    LiveState.from_history_index(self.resources.history_index),
+                    self.model, self.cache, self.model_version(),
+                )
+            except Exception:
+                log.exception("Live ingestion could not start")
+                return
+            self.live = live
+            live.run(source, stop)
+
+        thread = threading.Thread(target=run, name="live-ingest", daemon=True)
+        thread.start()
+        return thread
+
+    def model_version(self):
+        """
+        Version of the served model in cache keys and payloads (runtime + artifact hash).
+        """
+        return forecast_model_version(self.resources.runtime, self.weights_path)
+
+    def has_outlook(self):
+        return os.path.exists(self.resources.multi_weights_path)
+
+    def cities(self):
+        return sorted(self.resources.scalers)
+
+    def forecast_city_frames(self, city):
+        """
+        (df_full, df_display, last_time, model_version) for one city, through the cache.
+        """
+        if city not in self.resources.scalers:
+            raise KeyError(city)
+        model_version = self.model_version()
+        df_full, df_display, last_time = forecast_city_cached(
+            self.model, self.history, self.resources.scalers, city,
+            self.cache, model_version,
+        )
+        return df_full, df_display, last_time, model_version
+
+    def forecast_city(self, city):
+        df_full, _, last_time, model_version = self.forecast_city_frames(city)
+        return forecast_payload(city, df_full, last_time, model_version)
+
+    def outlook_frame(self, city):
+        """
+        (df_full, last_time, model_version) with every PRED_COLS variable for one
+        city from the multi-output model, through the same cache.
+        Raises LookupError when the multi-output weights have not been trained.
+        """
+        if city not in self.resources.scalers:
+            raise KeyError(city)
+        model = self.multi_model
+        if model is None:
+            raise LookupError("The multi-output model has not been trained (train.py --multi-output)")
+
+        # One consistent (window, last_time) snapshot, as in forecast_city_cached
+        X, _, last_time = self.history.last_window(city)
+        model_version = "multi-" + forecast_model_version(
+            self.resources.multi_runtime, self.resources.multi_weights_path
+        )
+        key = forecast_key(city, last_time, model_version)
+
+        def compute():
+            return forecast_windows_multi(model, X, [city], [last_time], self.resources.scalers).drop(columns="city")
+
+        return self.cache.get_or_compute(key, compute).copy(), last_time, model_version
+
+    def outlook(self, city):
+        df_full, last_time, model_version = self.outlook_frame(city)
+        return forecast_payload(city, df_full, last_time, model_version)
+
+    def forecast_batch(self, cities=None):
+        cities = self.cities() if cities is None else list(cities)
+        unknown = [c for c in cities if c not in self.resources.scalers]
+        if unknown:
+            raise KeyError(", ".join(unknown))
+
+        model_version = self.model_version()
+        df_all = forecast_cities(self.model, self.history, self.resources.scalers, cities)
+        forecasts = []
+        for c, df_c in df_all.groupby("city", sort=False):
+            # hour_ahead 0 is one hour after the last observation
+            last_time = df_c["time"].iloc[0] - pd.Timedelta(hours=1)
+            forecasts.append(forecast_payload(c, df_c, last_time, model_version))
+        return {"model_version": model_version, "forecasts": forecasts}
+
+    def metrics(self):
+        """
+        Micro-batcher, cache and live-ingestion counters (empty sections until used).
+        """
+        live = {}
+        if self.live is not None:
+            live = {
+                "observations": self.live.state.observations,
+                "filled_hours": self.live.state.filled_hours,
+                "refreshes": self.live.refreshes,
+                "errors": self.live.errors,
+                "last_time": {c: self.live.state.last_time(c).isoformat() for c in self.live.state.cities},
+            }
+        return {
+            "batcher": self._model.metrics() if self._model is not None else {},
+            "multi_batcher": self._multi_model.metrics() if self._multi_model is not None else {},
+            "cache": {"entries": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses},
+            "live": live,
+        }
+
+
+def create_app(service=None, warm_up=True):
+    """
+    Starlette app exposing:
+        GET  /health                  readiness + startup report (and any warm-up errors)
+        GET  /metrics                 queue depth, batch fill, cache hits, live ingestion
+        GET  /cities                  cities with fitted scalers
+        GET  /forecast/{city}         one city's 168-hour forecast (cached)
+        GET  /outlook/{city}          all four variables from the multi-output model (cached)
+        POST /forecast/batch          {"cities": [...]} in one batched forward pass (all if omitted)
+    """
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    service = service or ForecastService()
+
+    async def health(request):
+        return JSONResponse({
+            "ready": service.resources.is_ready(),
+            "runtime": service.resources.runtime,
+            "outlook": service.has_outlook(),
+            "startup": service.resources.report.as_frame().to_dict(orient="records"),
+            "errors": service.resources.report.errors(),
+        })
+
+    async def metrics(request):
+        return JSONResponse(service.metrics())
+
+    async def cities(request):
+        return JSONResponse({"cities": await asyncio.to_thread(service.cities)})
+
+    async def forecast_city(request):
+        city = request.path_params["city"]
+        try:
+            payload = await asyncio.to_thread(service.forecast_city, city)
+        except KeyError:
+            return JSONResponse({"error": f"Unknown city: {city}"}, status_code=404)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=422)
+        return JSONResponse(payload)
+
+    async def outlook(request):
+        city = request.path_params["city"]
+        try:
+            payload = await asyncio.to_thread(service.outlook, city)
+        except KeyError:
+            return JSONResponse({"error": f"Unknown city: {city}"}, status_code=404)
+        except LookupError as e:
+            return JSONResponse({"error": str(e)}, status_code=503)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=422)
+        return JSONResponse(payload)
+
+    async def forecast_batch(request):
+        try:
+            body = await request.json() if await request.body() else {}
+        except ValueError:
+            return JSONResponse({"error": "Body must be JSON"}, status_code=400)
+        if not isinstance(body, dict):
+            return JSONResponse({"error": "Body must be a JSON object"}, status_code=400)
+        cities = body.get("cities")
+        if cities is not None and not (isinstance(cities, list) and all(isinstance(c, str) for c in cities)):
+            return JSONResponse({"error": '"cities" must be a list of city names'}, status_code=400)
+        try:
+            payload = await asyncio.to_thread(service.forecast_batch, cities)
+        except KeyError as e:
+            return JSONResponse({"error": f"Unknown city: {e.args[0]}"}, status_code=404)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=422)
+        return JSONResponse(payload)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        if warm_up:
+            service.resources.warm_up_async()
+        yield
+
+    return Starlette(
+        routes=[
+            Route("/health", health),
+            Route("/metrics", metrics),
+            Route("/cities", cities),
+            Route("/forecast/batch", forecast_batch, methods=["POST"]),
+            Route("/forecast/{city}", forecast_city),
+            Route("/outlook/{city}", outlook),
+        ],
+        lifespan=lifespan,
+    )
+
+# ============================
+# 3. Client (used by the Streamlit app) 🛰️
+# ============================
+
+class LocalForecastClient:
+    """
+    Same interface as ForecastClient, backed by an in-process ForecastService
+    (used when no service URL is configured).
+    """
+
+    def __init__(self, service):
+        self.service = service
+
+    def cities(self):
+        return self.service.cities()
+
+    def forecast_city(self, city):
+        return self.service.forecast_city_frames(city)[:3]
+
+    def has_outlook(self):
+        return self.service.has_outlook()
+
+    def outlook(self, city):
+        return self.service.outlook_frame(city)[0]
+
+    def forecast_cities(self, cities=None):
+        resources = self.service.resources
+        return forecast_cities(self.service.model, self.service.history, resources.scalers, cities)
+
+    def startup_report(self):
+        """
+        (ready, phases frame, warm-up errors).
+        """
+        resources = self.service.resources
+        return resources.is_ready(), resources.report.as_frame(), resources.report.errors()
+
+
+class ForecastClient:
+    """
+    Talks to a running forecast service; same return shapes as forecast.py.
+    """
+
+    def __init__(self, base_url, session=None, timeout=(5, 120)):
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+    def _check(self, resp):
+        if resp.status_code >= 400:
+            try:
+                message = resp.json().get("error", resp.text)
+            except ValueError:
+                message = resp.text
+            raise ValueError(f"Forecast service {resp.status_code}: {message}")
+        return resp.json()
+
+    def cities(self):
+        resp = self.session.get(f"{self.base_url}/cities", timeout=self.timeout)
+        return self._check(resp)["cities"]
+
+    def forecast_city(self, city):
+        """
+        Returns (df_full, df_display, last_time) like forecast_city_cached.
+        """
+        resp = self.session.get(f"{self.base_url}/forecast/{city}", timeout=self.timeout)
+        df_full, last_time = forecast_from_payload(self._check(resp))
+        return df_full, display_subset(df_full), last_time
+
+    def forecast_cities(self, cities=None):
+        """
+        Returns the tidy city, time, hour_ahead, pred_temp_c frame like forecast_cities.
+        """
+        body = {} if cities is None else {"cities": list(cities)}
+        resp = self.session.post(f"{self.base_url}/forecast/batch", json=body, timeout=self.timeout)
+        frames = []
+        for payload in self._check(resp)["forecasts"]:
+            df_full, _ = forecast_from_payload(payload)
+            df_full.insert(0, "city", payload["city"])
+            frames.append(df_full)
+        return pd.concat(frames, ignore_index=True)
+
+    def has_outlook(self):
+        health = self._check(self.session.get(f"{self.base_url}/health", timeout=self.timeout))
+        return health["outlook"]
+
+    def outlook(self, city):
+        """
+        Every forecast variable for one city: time, hour_ahead and PRED_COLS columns.
+        """
+        resp = self.session.get(f"{self.base_url}/outlook/{city}", timeout=self.timeout)
+        return forecast_from_payload(self._check(resp))[0]
+
+    def startup_report(self):
+        health = self._check(self.session.get(f"{self.base_url}/health", timeout=self.timeout))
+        return health["ready"], pd.DataFrame(health["startup"]), health.get("errors", [])
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve 7-day forecasts over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--runtime", choices=["keras", "tflite", "numpy"], default=MODEL_RUNTIME)
+    parser.add_argument("--max-batch", type=int, default=MICRO_BATCH_MAX_SIZE,
+                        help="Most windows coalesced into one forward pass "
+                             "(ignored by --runtime tflite, which runs one row per invoke)")
+    parser.add_argument("--max-latency-ms", type=float, default=MICRO_BATCH_MAX_LATENCY_MS,
+                        help="Longest a request waits for others to join its batch")
+    parser.add_argument("--live-tail", default=None,
+                        help="Follow this CSV (history columns) and keep forecasts current as hours arrive")
+    args = parser.parse_args()
+
+    service = ForecastService(ForecastResources(args.runtime),
+                              max_batch_size=args.max_batch, max_latency_ms=args.max_latency_ms)
+    if args.live_tail:
+        from live_state import tail_csv
+        service.start_live(tail_csv(args.live_tail))
+    app = create_app(service)
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,116 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import FEATURE_COLS, LOOKBACK_HOURS
+
+# ============================
+# 1. Per-city contiguous index 🗂️
+# ============================
+
+class HistoryIndex:
+    """
+    The history as one contiguous, pre-scaled float32 (rows, num_features)
+    array with every city's rows back to back in time order, plus each city's
+    (start, end) offsets. The last lookback hours of a city are a slice, so
+    a window costs the same however many cities and years are loaded.
+
+    Built once from a load_history() frame and the per-city scalers; cities
+    without a scaler cannot be scaled and are left out.
+    """
+
+    def __init__(self, values, times, spans, scalers, feature_cols=FEATURE_COLS):
+        self.values = values
+        self.times = times
+        self.spans = spans
+        self.scalers = scalers
+        self.feature_cols = list(feature_cols)
+
+    @classmethod
+    def from_frame(cls, df, scalers, feature_cols=FEATURE_COLS, dtype=np.float32, cities=None):
+        """
+        cities: index only these (default: every city with a scaler).
+        """
+        keep = [c for c in scalers if cities is None or c in cities]
+        df = df[df["city"].isin(keep)]
+        codes, names = pd.factorize(df["city"], sort=True)
+        times = pd.DatetimeIndex(df["time"])
+        order = np.lexsort((times.asi8, codes))
+        codes = codes[order]
+        times = times.take(order)
+        raw = df[feature_cols].to_numpy(dtype=np.float64)[order]
+
+        bounds = np.searchsorted(codes, np.arange(len(names) + 1))
+        values = np.empty(raw.shape, dtype=dtype)
+        spans = {}
+        for i, c in enumerate(names):
+            start, end = int(bounds[i]), int(bounds[i + 1])
+            values[start:end] = scalers[c].transform(raw[start:end])
+            spans[c] = (start, end)
+        return cls(values, times, spans, scalers, feature_cols)
+
+    @property
+    def cities(self):
+        return sorted(self.spans)
+
+    def __contains__(self, city):
+        return city in self.spans
+
+    def __len__(self):
+        return len(self.values)
+
+    def last_time(self, city):
+        return self.times[self.spans[city][1] - 1]
+
+    def last_window(self, city, lookback_hours=LOOKBACK_HOURS):
+        """
+        (X view (1, lookback, num_features), scaler, last_time) — the same
+        triple build_last_window_for_city returns, without touching other cities.
+        """
+        start, end = self.spans[city]
+        if end - start < lookback_hours:
+            raise ValueError(f"Not enough history for {city}. Need {lookback_hours} hours.")
+        X = self.values[end - lookback_hours:end][np.newaxis, :, :]
+        return X, self.scalers[city], self.times[end - 1]
+
+    def city_values(self, city):
+        """
+        All scaled rows of one city, a view.
+        """
+        start, end = self.spans[city]
+        return self.values[start:end]
+
+
+def as_history_index(history, scalers, feature_cols=FEATURE_COLS, cities=None):
+    """
+    history itself when it is already indexed (a HistoryIndex or anything with
+    its lookup interface, e.g. live_state.LiveState), else a HistoryIndex built
+    from the frame (of only the given cities, for one-off calls).
+    """
+    if hasattr(history, "last_window"):
+        return history
+    return HistoryIndex.from_frame(history, scalers, feature_cols, cities=cities)
+
+
+if __name__ == "__main__":
+    from forecast import build_last_window_for_city, load_history, load_scalers
+
+    parser = argparse.ArgumentParser(description="Time last-window lookups: frame filtering vs HistoryIndex.")
+    parser.add_argument("--city", default="delhi")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    history_df = load_history()
+    city_scalers = load_scalers()
+
+    t0 = time.perf_counter()
+    index = HistoryIndex.from_frame(history_df, city_scalers)
+    print(f"🗂️ Built index over {len(index):,} rows / {len(index.cities)} cities in {time.perf_counter() - t0:.3f} s")
+
+    for name, source in (("frame", history_df), ("index", index)):
+        t0 = time.perf_counter()
+        for _ in range(args.repeats):
+            build_last_window_for_city(source, args.city, LOOKBACK_HOURS, city_scalers)
+        print(f"⏱️ {name}: {1e6 * (time.perf_counter() - t0) / args.repeats:.1f} µs per window")
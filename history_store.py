@@ -0,0 +1,307 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import FEATURE_COLS, HISTORY_CSV, HISTORY_STORE_DIR
+
+ROW_GROUP_HOURS = 30 * 24   # one row group ≈ one lookback window, so a tail read touches 1-2 groups
+MAX_APPEND_FRAGMENTS = 32   # appends kept as separate files before they are compacted into the partition
+ONE_HOUR = pd.Timedelta(hours=1)
+
+# ============================
+# 1. Partition layout 🗂️
+# ============================
+
+def city_partition_path(store_dir, city):
+    return os.path.join(store_dir, f"{city}.parquet")
+
+def city_fragment_dir(store_dir, city):
+    return os.path.join(store_dir, "_appends", city)
+
+def list_city_fragments(store_dir, city):
+    """
+    A city's append fragments, oldest first (later fragments win on equal times).
+    """
+    frag_dir = city_fragment_dir(store_dir, city)
+    if not os.path.isdir(frag_dir):
+        return []
+    return sorted(os.path.join(frag_dir, name) for name in os.listdir(frag_dir) if name.endswith(".parquet"))
+
+def list_store_cities(store_dir=HISTORY_STORE_DIR):
+    if not os.path.isdir(store_dir):
+        return []
+    return sorted(name[:-len(".parquet")] for name in os.listdir(store_dir) if name.endswith(".parquet"))
+
+def store_exists(store_dir=HISTORY_STORE_DIR):
+    return len(list_store_cities(store_dir)) > 0
+
+def normalize_city_frame(df_city):
+    """
+    Canonical partition schema: time (datetime64), float32 features, sorted by time,
+    one row per hour.
+    """
+    out = pd.DataFrame({"time": pd.to_datetime(df_city["time"]).to_numpy()})
+    for col in FEATURE_COLS:
+        out[col] = df_city[col].to_numpy(dtype=np.float32)
+    out = out.drop_duplicates(subset="time", keep="last")
+    return out.sort_values("time").reset_index(drop=True)
+
+# ============================
+# 2. Writing 💾
+# ============================
+
+def write_city_partition(df_city, store_dir, city):
+    """
+    Replace one city's partition atomically (write to a temp file, then rename).
+    Pending append fragments are dropped: df_city is the whole city from now on.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    table = pa.Table.from_pandas(normalize_city_frame(df_city), preserve_index=False)
+
+    path = city_partition_path(store_dir, city)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_HOURS)
+    os.replace(tmp_path, path)
+    for fragment in list_city_fragments(store_dir, city):
+        os.remove(fragment)
+    return path
+
+def _iter_partition(path, columns=None):
+    """
+    A partition's rows one row group at a time, as normalized frames.
+    """
+    pf = pq.ParquetFile(path)
+    for i in range(pf.num_row_groups):
+        yield normalize_city_frame(pf.read_row_group(i, columns=columns).to_pandas())
+
+def merge_into_partition(store_dir, city, overlays):
+    """
+    Stream a city's partition and time-sorted, mutually disjoint overlay frames
+    into a new partition (overlay rows win on equal times), then swap it in.
+    Holds one overlay plus one row group in memory at a time, never the whole city.
+    overlays may be a lazy iterable (e.g. reading one staged file per step).
+    Returns the number of rows written.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    path = city_partition_path(store_dir, city)
+    tmp_path = f"{path}.tmp"
+
+    existing = _iter_partition(path, ["time"] + FEATURE_COLS) if os.path.exists(path) else iter(())
+    carry = None   # unwritten rows of the current existing row group
+
+    def take(until, side):
+        # Existing rows with time < until (side="left") / <= until ("right"); None = all
+        nonlocal carry
+        while True:
+            if carry is None or len(carry) == 0:
+                carry = next(existing, None)
+                if carry is None:
+                    return
+            last = carry["time"].iloc[-1]
+            if until is None or last < until or (side == "right" and last == until):
+                piece, carry = carry, None
+                yield piece
+                continue
+            n = int(np.searchsorted(carry["time"].to_numpy(), np.datetime64(until), side=side))
+            piece, carry = carry.iloc[:n], carry.iloc[n:]
+            if len(piece):
+                yield piece
+            return
+
+    rows, writer = 0, None
+
+    def write(df):
+        # The writer takes the first table's schema; later pieces are cast to it
+        nonlocal rows, writer
+        if len(df) == 0:
+            return
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(tmp_path, table.schema)
+        writer.write_table(table.cast(writer.schema), row_group_size=ROW_GROUP_HOURS)
+        rows += len(df)
+
+    try:
+        for overlay in overlays:
+            overlay = normalize_city_frame(overlay)
+            if len(overlay) == 0:
+                continue
+            first, last = overlay["time"].iloc[0], overlay["time"].iloc[-1]
+            for piece in take(first, "left"):
+                write(piece)
+            # Existing rows inside the overlay's span: merge, overlay rows last so they win
+            write(normalize_city_frame(pd.concat([*take(last, "right"), overlay], ignore_index=True)))
+        for piece in take(None, "right"):
+            write(piece)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        # Nothing at all to write: an empty partition, like write_city_partition would make
+        write_city_partition(pd.DataFrame(columns=["time"] + FEATURE_COLS), store_dir, city)
+        return 0
+    os.replace(tmp_path, path)
+    return rows
+
+def write_history_store(df, store_dir=HISTORY_STORE_DIR):
+    """
+    Split a combined history frame (with a "city" column) into per-city partitions.
+    """
+    for city, df_city in df.groupby("city", sort=True):
+        write_city_partition(df_city, store_dir, city)
+
+# ============================
+# 3. Reading 📖
+# ============================
+
+def _read_partition(path, tail_hours=None, columns=None):
+    if tail_hours is None:
+        return pq.read_table(path, columns=columns).to_pandas()
+
+    pf = pq.ParquetFile(path)
+    groups, rows = [], 0
+    for i in range(pf.num_row_groups - 1, -1, -1):
+        groups.append(i)
+        rows += pf.metadata.row_group(i).num_rows
+        if rows >= tail_hours:
+            break
+    if not groups:
+        return pf.schema_arrow.empty_table().select(columns).to_pandas()
+
+    table = pf.read_row_groups(sorted(groups), columns=columns)
+    return table.slice(max(table.num_rows - tail_hours, 0)).to_pandas()
+
+def read_city_history(store_dir, city, tail_hours=None, columns=None):
+    """
+    Load one city's partition plus its append fragments. With tail_hours, only
+    the trailing row groups needed to cover the last tail_hours rows are read
+    from the partition (fragments are small and always read whole).
+    """
+    cols = ["time"] + FEATURE_COLS if columns is None else columns
+    df = _read_partition(city_partition_path(store_dir, city), tail_hours, cols)
+
+    fragments = list_city_fragments(store_dir, city)
+    if not fragments:
+        return df
+    df = pd.concat([df, *(pq.read_table(p, columns=cols).to_pandas() for p in fragments)], ignore_index=True)
+    df = df.drop_duplicates(subset="time", keep="last").sort_values("time")
+    if tail_hours is not None:
+        df = df.tail(tail_hours)
+    return df.reset_index(drop=True)
+
+def read_history_store(store_dir=HISTORY_STORE_DIR, cities=None, tail_hours=None):
+    """
+    Combined frame (time, features, city) sorted by city then time,
+    in the same layout load_history() returns for the CSV.
+    """
+    if cities is None:
+        cities = list_store_cities(store_dir)
+
+    frames = []
+    for city in sorted(cities):
+        df_city = read_city_history(store_dir, city, tail_hours=tail_hours)
+        df_city["city"] = city
+        frames.append(df_city)
+
+    if not frames:
+        return pd.DataFrame(columns=["time"] + FEATURE_COLS + ["city"])
+    return pd.concat(frames, ignore_index=True)
+
+def _file_last_time(path):
+    pf = pq.ParquetFile(path)
+    if pf.num_row_groups == 0:
+        return None
+    times = pf.read_row_group(pf.num_row_groups - 1, columns=["time"]).column("time")
+    if len(times) == 0:
+        return None
+    return pd.Timestamp(times[len(times) - 1].as_py())
+
+def store_last_time(store_dir, city):
+    """
+    Last stored timestamp for a city (None if it has no partition yet).
+    Reads only the time column of the final row group of each file.
+    """
+    path = city_partition_path(store_dir, city)
+    if not os.path.exists(path):
+        return None
+    times = [t for t in map(_file_last_time, [path] + list_city_fragments(store_dir, city)) if t is not None]
+    return max(times) if times else None
+
+# ============================
+# 4. Incremental appends ➕
+# ============================
+
+def write_city_fragment(df_new, store_dir, city):
+    """
+    Write new rows as the city's next append fragment, leaving the partition untouched.
+    """
+    frag_dir = city_fragment_dir(store_dir, city)
+    os.makedirs(frag_dir, exist_ok=True)
+    fragments = list_city_fragments(store_dir, city)
+    seq = int(os.path.basename(fragments[-1])[:-len(".parquet")]) + 1 if fragments else 0
+
+    path = os.path.join(frag_dir, f"{seq:06d}.parquet")
+    table = pa.Table.from_pandas(normalize_city_frame(df_new), preserve_index=False)
+    pq.write_table(table, f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+    return path
+
+def compact_city_fragments(store_dir, city):
+    """
+    Fold a city's append fragments into its partition (streamed, see
+    merge_into_partition) and drop them. Returns the number of fragments folded.
+    """
+    fragments = list_city_fragments(store_dir, city)
+    if not fragments:
+        return 0
+    # Fragments are small; one overlay in write order so the newest rows win
+    overlay = pd.concat([pq.read_table(p).to_pandas() for p in fragments], ignore_index=True)
+    merge_into_partition(store_dir, city, [overlay])
+    for p in fragments:
+        os.remove(p)
+    return len(fragments)
+
+def append_city_history(df_new, store_dir, city):
+    """
+    Add new rows to a city as an append fragment (new rows win on equal times),
+    so a sync writes only what it fetched instead of rewriting the partition.
+    Past MAX_APPEND_FRAGMENTS fragments they are compacted into the partition.
+    Returns the number of timestamps that were not in the store before.
+    """
+    if len(df_new) == 0:
+        return 0
+
+    df_new = normalize_city_frame(df_new)
+    path = city_partition_path(store_dir, city)
+    if not os.path.exists(path):
+        write_city_partition(df_new, store_dir, city)
+        return len(df_new)
+
+    # Only stored hours at or after the first new one can collide: read just that tail
+    added = len(df_new)
+    last_time = store_last_time(store_dir, city)
+    first_new = df_new["time"].iloc[0]
+    if last_time is not None and first_new <= last_time:
+        overlap = int((last_time - first_new) // ONE_HOUR) + 1
+        stored = read_city_history(store_dir, city, tail_hours=overlap, columns=["time"])
+        added = int((~df_new["time"].isin(stored["time"])).sum())
+
+    write_city_fragment(df_new, store_dir, city)
+    if len(list_city_fragments(store_dir, city)) > MAX_APPEND_FRAGMENTS:
+        compact_city_fragments(store_dir, city)
+    return added
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the history CSV into per-city Parquet partitions.")
+    parser.add_argument("--csv", default=HISTORY_CSV)
+    parser.add_argument("--store", default=HISTORY_STORE_DIR)
+    args = parser.parse_args()
+
+    history_df = pd.read_csv(args.csv, parse_dates=["time"])
+    write_history_store(history_df, args.store)
+    print(f"✅ Wrote {len(list_store_cities(args.store))} city partitions to {args.store}/")
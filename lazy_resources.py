@@ -0,0 +1,189 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from config import LOOKBACK_HOURS, MODEL_RUNTIME, MULTI_WEIGHTS_PATH, MULTI_TARGET_COLS
+
+log = logging.getLogger(__name__)
+
+# ============================
+# 1. Startup-time report ⏱️
+# ============================
+
+class StartupReport:
+    """
+    Wall-clock time of each startup phase (imports, weight load, history load, ...),
+    with the thread that paid for it and when it started relative to process start,
+    plus any error that stopped a background warm-up.
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.phases = []
+        self._errors = []
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, started_at=None):
+        started_at = self.t0 if started_at is None else started_at
+        with self._lock:
+            self.phases.append({
+                "phase": name,
+                "seconds": round(seconds, 4),
+                "started_at_s": round(started_at - self.t0, 4),
+                "thread": threading.current_thread().name,
+            })
+
+    def record_error(self, name, exc):
+        with self._lock:
+            self._errors.append({
+                "phase": name,
+                "error": f"{type(exc).__name__}: {exc}",
+                "at_s": round(time.perf_counter() - self.t0, 4),
+                "thread": threading.current_thread().name,
+            })
+
+    def errors(self):
+        with self._lock:
+            return list(self._errors)
+
+    @contextmanager
+    def phase(self, name):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started_at, started_at)
+
+    def as_frame(self):
+        with self._lock:
+            return pd.DataFrame(self.phases, columns=["phase", "seconds", "started_at_s", "thread"])
+
+# ============================
+# 2. Lazily loaded forecasting resources 💤
+# ============================
+
+def _import_tensorflow():
+    import tensorflow
+    return tensorflow
+
+
+class ForecastResources:
+    """
+    Model, history and scalers, each loaded on first access (or by warm_up_async)
+    exactly once, even when several threads ask at the same time.
+    TensorFlow is only imported when the keras runtime is actually used.
+    """
+
+    def __init__(self, runtime=MODEL_RUNTIME, multi_weights_path=MULTI_WEIGHTS_PATH):
+        self.runtime = runtime
+        self.multi_weights_path = multi_weights_path
+        self.report = StartupReport()
+        self._values = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._warm_up_thread = None
+
+    def _get(self, name, loader):
+        if name in self._values:
+            return self._values[name]
+        with self._locks_guard:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._values:
+                with self.report.phase(name):
+                    self._values[name] = loader()
+        return self._values[name]
+
+    @property
+    def model(self):
+        from forecast import load_forecast_model
+        if self.runtime == "keras":
+            self._get("import_tensorflow", _import_tensorflow)
+        return self._get("model_load", lambda: load_forecast_model(self.runtime))
+
+    @property
+    def multi_runtime(self):
+        # There is no TFLite export of the multi-output model; that runtime uses NumPy
+        return "numpy" if self.runtime == "tflite" else self.runtime
+
+    @property
+    def multi_model(self):
+        """
+        Multi-output variant (all MULTI_TARGET_COLS), or None until its weights are trained.
+        Not part of warm_up; there is no TFLite export of it, so that runtime uses NumPy.
+        """
+        from forecast import load_forecast_model
+        if not os.path.exists(self.multi_weights_path):
+            return None
+        return self._get("multi_model_load", lambda: load_forecast_model(
+            self.multi_runtime, weights_path=self.multi_weights_path, num_targets=len(MULTI_TARGET_COLS)
+        ))
+
+    @property
+    def history(self):
+        """
+        The last LOOKBACK_HOURS of every city: all a forecast reads, so startup
+        never loads years of history (only the tail row groups of the store).
+        """
+        from forecast import load_history
+        return self._get("history_load", lambda: load_history(tail_hours=LOOKBACK_HOURS))
+
+    @property
+    def history_index(self):
+        """
+        The history as a pre-scaled per-city HistoryIndex (what forecasts read).
+        """
+        from history_index import HistoryIndex
+        return self._get("history_index", lambda: HistoryIndex.from_frame(self.history, self.scalers))
+
+    @property
+    def scalers(self):
+        from forecast import load_scalers
+        return self._get("scaler_load", load_scalers)
+
+    def is_ready(self):
+        return all(k in self._values for k in ("model_load", "history_index", "scaler_load"))
+
+    def warm_up(self):
+        """
+        Load everything now, cheapest first.
+        """
+        self.scalers
+        self.history
+        self.history_index
+        self.model
+
+    def warm_up_async(self):
+        """
+        Load everything on a daemon thread so the UI can render right away.
+        A failure here is not fatal: it is logged and kept in report.errors()
+        for the health / startup views, and the first real access retries and raises.
+        """
+        def run():
+            try:
+                self.warm_up()
+            except Exception as e:
+                log.exception("Background warm-up failed")
+                self.report.record_error("warm_up", e)
+
+        if self._warm_up_thread is None:
+            self._warm_up_thread = threading.Thread(target=run, name="warm-up", daemon=True)
+            self._warm_up_thread.start()
+        return self._warm_up_thread
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print the startup-time breakdown of the forecasting stack.")
+    parser.add_argument("--runtime", choices=["keras", "tflite", "numpy"], default=MODEL_RUNTIME)
+    args = parser.parse_args()
+
+    resources = ForecastResources(args.runtime)
+    with resources.report.phase("total"):
+        resources.warm_up()
+    print(resources.report.as_frame().to_string(index=False))
@@ -0,0 +1,71 @@
+import threading
+
+import numpy as np
+
+from config import TFLITE_PATHS, TFLITE_VARIANT
+
+# ============================
+# Slim TFLite inference runtime 🪶
+# ============================
+# Runs the artifact written by export_tflite.py without tensorflow.keras.
+# Prefers the standalone interpreters (ai-edge-litert, tflite-runtime) and
+# only falls back to tf.lite when neither is installed.
+
+def _load_interpreter_class():
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+def tflite_path(variant=None):
+    """
+    Artifact of a TFLite variant (default: WEATHERLENS_TFLITE). Checked here,
+    not on import of config, so an unset or bad variant never affects the
+    keras / numpy runtimes or the data scripts.
+    """
+    variant = variant or TFLITE_VARIANT
+    if variant not in TFLITE_PATHS:
+        raise ValueError(
+            f"WEATHERLENS_TFLITE={variant!r} is not a TFLite variant; "
+            f"expected one of {', '.join(TFLITE_PATHS)}"
+        )
+    return TFLITE_PATHS[variant]
+
+
+class LiteForecaster:
+    """
+    Drop-in for the Keras model in forecast.py (predict / predict_on_batch).
+    The artifact has a fixed batch of 1, so batches run one row per invoke.
+    The interpreter is not thread-safe; calls are serialized with a lock.
+    """
+
+    def __init__(self, model_path=None, num_threads=None):
+        model_path = model_path or tflite_path()
+        Interpreter = _load_interpreter_class()
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._lock = threading.Lock()
+
+    def predict_on_batch(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        out = np.empty((len(X),) + tuple(self._output["shape"][1:]), dtype=np.float32)
+        with self._lock:
+            for i in range(len(X)):
+                self.interpreter.set_tensor(self._input["index"], X[i:i + 1])
+                self.interpreter.invoke()
+                out[i] = self.interpreter.get_tensor(self._output["index"])[0]
+        return out
+
+    def predict(self, X, verbose=0, batch_size=None):
+        return self.predict_on_batch(X)
@@ -0,0 +1,321 @@
+import argparse
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from config import FEATURE_COLS, LOOKBACK_HOURS
+from forecast import forecast_city_cached
+from forecast_cache import ForecastCache
+
+ONE_HOUR = pd.Timedelta(hours=1)
+
+log = logging.getLogger(__name__)
+
+# ============================
+# 1. Per-city ring buffer 🔄
+# ============================
+
+class CityRingBuffer:
+    """
+    The last lookback hours of one city's scaled features.
+    Every row is written twice (at i and i + lookback) into a 2 * lookback
+    array, so the current window is always one contiguous slice and a new
+    hour costs two row writes, never a shift or a reallocation.
+    """
+
+    def __init__(self, window, last_time):
+        self.lookback = len(window)
+        self._buf = np.empty((2 * self.lookback, window.shape[1]), dtype=window.dtype)
+        self._buf[:self.lookback] = window
+        self._buf[self.lookback:] = window
+        self._head = 0   # oldest row
+        self.last_time = pd.Timestamp(last_time)
+
+    def push(self, row, obs_time):
+        h = self._head
+        self._buf[h] = row
+        self._buf[h + self.lookback] = row
+        self._head = (h + 1) % self.lookback
+        self.last_time = pd.Timestamp(obs_time)
+
+    def window(self):
+        """
+        (lookback, num_features) view, oldest hour first.
+        """
+        return self._buf[self._head:self._head + self.lookback]
+
+# ============================
+# 2. Live state for every city 🌍
+# ============================
+
+class LiveState:
+    """
+    Ring buffers of every city, fed one hourly observation at a time.
+
+    Has the lookup interface of HistoryIndex (cities, last_time, last_window),
+    so forecast_city_cached / forecast_cities and ForecastService read it
+    directly. Observations arrive unscaled and are scaled on the way in.
+    Hours missing before a new observation are filled with the previous hour;
+    observations at or before a city's last hour are ignored.
+    """
+
+    def __init__(self, buffers, scalers, feature_cols=FEATURE_COLS):
+        self.buffers = buffers
+        self.scalers = scalers
+        self.feature_cols = list(feature_cols)
+        self.observations = 0
+        self.filled_hours = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_history_index(cls, index, lookback_hours=LOOKBACK_HOURS):
+        """
+        Seed from a HistoryIndex: the last lookback hours of every city that has them.
+        """
+        buffers = {}
+        for c in index.cities:
+            start, end = index.spans[c]
+            if end - start >= lookback_hours:
+                X, _, last_time = index.last_window(c, lookback_hours)
+                buffers[c] = CityRingBuffer(X[0], last_time)
+        return cls(buffers, index.scalers, index.feature_cols)
+
+    @property
+    def cities(self):
+        return sorted(self.buffers)
+
+    def __contains__(self, city):
+        return city in self.buffers
+
+    def last_time(self, city):
+        return self.buffers[city].last_time
+
+    def last_window(self, city, lookback_hours=LOOKBACK_HOURS):
+        """
+        (X (1, lookback, num_features) float32, scaler, last_time), a copy
+        so a concurrent ingest cannot change it mid-forecast.
+        """
+        ring = self.buffers[city]
+        if lookback_hours > ring.lookback:
+            raise ValueError(f"Not enough history for {city}. Need {lookback_hours} hours.")
+        with self._lock:
+            X = ring.window()[ring.lookback - lookback_hours:].copy()
+            last_time = ring.last_time
+        return X[np.newaxis, :, :], self.scalers[city], last_time
+
+    def ingest(self, city, obs_time, values):
+        """
+        Add one hourly observation (values: {feature: value} or a sequence in
+        feature_cols order). Returns the number of hours the city advanced (0
+        for a stale or duplicate hour).
+        """
+        if isinstance(values, Mapping):
+            values = [values[col] for col in self.feature_cols]
+        raw = np.asarray(values, dtype=np.float64).reshape(1, -1)
+        row = self.scalers[city].transform(raw)[0]
+        obs_time = pd.Timestamp(obs_time)
+
+        ring = self.buffers[city]
+        with self._lock:
+            hours = int((obs_time - ring.last_time) // ONE_HOUR)
+            if hours < 1:
+                return 0
+            # Forward-fill any hours the feed skipped (at most a full window)
+            previous = ring.window()[-1].copy()
+            for h in range(max(1, hours - ring.lookback + 1), hours):
+                ring.push(previous, ring.last_time + ONE_HOUR)
+            ring.push(row, obs_time)
+            self.observations += 1
+            self.filled_hours += hours - 1
+        return hours
+
+# ============================
+# 3. Incremental forecast refresh ⚡
+# ============================
+
+class LiveForecaster:
+    """
+    Feeds observations into a LiveState and re-forecasts only the city whose
+    hour advanced. Forecasts go through a ForecastCache keyed by
+    (city, last_time, model_version), so a new hour is a new entry and every
+    other city keeps its cached forecast; share the service's cache to serve
+    them from there.
+    """
+
+    def __init__(self, state, model, cache=None, model_version="live", lookback_hours=LOOKBACK_HOURS):
+        self.state = state
+        self.model = model
+        if cache is None:
+            cache = ForecastCache(max_entries=4 * max(len(state.buffers), 1))
+        self.cache = cache
+        self.model_version = model_version
+        self.lookback_hours = lookback_hours
+        self.listeners = []   # fn(city, df_full, last_time) after every refresh
+        self.refreshes = 0
+        self.refresh_seconds = 0.0
+        self.errors = 0
+
+    def forecast_city(self, city):
+        """
+        (df_full, df_display, last_time) for the city's current hour.
+        """
+        return forecast_city_cached(
+            self.model, self.state, self.state.scalers, city, self.cache,
+            self.model_version, self.lookback_hours,
+        )
+
+    def ingest(self, city, obs_time, values):
+        if city not in self.state:
+            return 0
+        hours = self.state.ingest(city, obs_time, values)
+        if hours:
+            t0 = time.perf_counter()
+            df_full, _, last_time = self.forecast_city(city)
+            self.refreshes += 1
+            self.refresh_seconds += time.perf_counter() - t0
+            for listener in self.listeners:
+                listener(city, df_full, last_time)
+        return hours
+
+    def run(self, source, stop=None):
+        """
+        Ingest every (city, time, values) observation of source until it ends or stop is set.
+        An observation that fails is logged and skipped; a failing source is
+        logged and ends the run, instead of silently killing the ingest thread.
+        """
+        try:
+            for city, obs_time, values in source:
+                if stop is not None and stop.is_set():
+                    break
+                try:
+                    self.ingest(city, obs_time, values)
+                except Exception:
+                    self.errors += 1
+                    log.exception("Skipping observation %s @ %s", city, obs_time)
+        except Exception:
+            self.errors += 1
+            log.exception("Live observation source failed; ingestion stopped")
+
+    def run_async(self, source, stop=None):
+        thread = threading.Thread(target=self.run, args=(source, stop), name="live-ingest", daemon=True)
+        thread.start()
+        return thread
+
+# ============================
+# 4. Observation sources 📡
+# ============================
+# Each yields (city, time, {feature: value}) in arrival order.
+
+def tail_csv(path, feature_cols=FEATURE_COLS, poll_seconds=1.0, from_start=False, stop=None):
+    """
+    Follow a CSV with the history columns (time, features, city) as rows are
+    appended, like tail -f. Starts at the end unless from_start.
+    Blank, truncated or unparsable lines are logged and skipped.
+    """
+    with open(path) as f:
+        header = f.readline().strip().split(",")
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        partial = ""
+        while stop is None or not stop.is_set():
+            line = f.readline()
+            if not line:
+                time.sleep(poll_seconds)
+                continue
+            partial += line
+            if not partial.endswith("\n"):
+                continue   # writer is mid-line
+            line, partial = partial.strip(), ""
+            fields = line.split(",")
+            if len(fields) != len(header):
+                if line:
+                    log.warning("Skipping line with %d of %d fields: %r", len(fields), len(header), line)
+                continue
+            row = dict(zip(header, fields))
+            try:
+                obs = row["city"], pd.Timestamp(row["time"]), {c: float(row[c]) for c in feature_cols}
+            except ValueError:
+                log.warning("Skipping unparsable line: %r", line)
+                continue
+            yield obs
+
+def queue_source(q, stop=None, timeout=0.5):
+    """
+    Observations put on a queue.Queue by another thread; None ends the stream.
+    """
+    while stop is None or not stop.is_set():
+        try:
+            item = q.get(timeout=timeout)
+        except queue.Empty:
+            continue
+        if item is None:
+            return
+        yield item
+
+def stub_source(state, base_url, hours=24, cities=None, engine=None, feature_cols=FEATURE_COLS):
+    """
+    The next hours of every city after its last live hour, from the archive
+    endpoint of a running openmeteo_stub (or any Open-Meteo-compatible URL),
+    replayed hour by hour across cities.
+    """
+    from weather_api import CITIES, fetch_hourly_history
+
+    rows = []
+    for city in state.cities:
+        loc = (cities or CITIES).get(city)
+        if loc is None:
+            continue
+        start = state.last_time(city) + ONE_HOUR
+        end = start + (hours - 1) * ONE_HOUR
+        hourly = fetch_hourly_history(
+            loc["lat"], loc["lon"], start.date().isoformat(), end.date().isoformat(),
+            url=f"{base_url}/v1/archive", engine=engine,
+        )
+        hourly = hourly.loc[start:end]
+        for obs_time, values in zip(hourly.index, hourly[feature_cols].to_dict(orient="records")):
+            rows.append((obs_time, city, values))
+
+    for obs_time, city, values in sorted(rows, key=lambda r: (r[0], r[1])):
+        yield city, obs_time, values
+
+
+if __name__ == "__main__":
+    from lazy_resources import ForecastResources
+    from openmeteo_stub import start_stub_server
+
+    parser = argparse.ArgumentParser(description="Stream hourly observations into live ring buffers and re-forecast.")
+    parser.add_argument("--source", choices=["stub", "tail"], default="stub")
+    parser.add_argument("--path", default=None, help="CSV to follow with --source tail")
+    parser.add_argument("--hours", type=int, default=24, help="Hours to replay with --source stub")
+    parser.add_argument("--runtime", choices=["keras", "tflite", "numpy"], default="numpy")
+    args = parser.parse_args()
+
+    resources = ForecastResources(args.runtime)
+    live = LiveState.from_history_index(resources.history_index)
+    forecaster = LiveForecaster(live, resources.model)
+    forecaster.listeners.append(lambda city, df_full, last_time: print(
+        f"🔄 {city:12s} now {last_time:%Y-%m-%d %H:%M} → next hour {df_full['pred_temp_c'].iloc[0]:6.2f} °C"
+    ))
+
+    if args.source == "stub":
+        server, base_url = start_stub_server()
+        forecaster.run(stub_source(live, base_url, args.hours))
+        server.shutdown()
+    else:
+        if not args.path:
+            parser.error("--source tail needs --path")
+        print(f"📡 Following {args.path} (Ctrl+C to stop)")
+        try:
+            forecaster.run(tail_csv(args.path))
+        except KeyboardInterrupt:
+            pass
+
+    if forecaster.refreshes:
+        print(f"✅ {live.observations} observations, {forecaster.refreshes} refreshes, "
+              f"{1000 * forecaster.refresh_seconds / forecaster.refreshes:.1f} ms per refresh")
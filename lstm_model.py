@@ -0,0 +1,29 @@
+from tensorflow.keras import layers, models
+
+# ============================
+# LSTM architecture 🧠
+# ============================
+
+def build_lstm_model(timesteps, num_features, horizon, num_targets=None):
+    """
+    num_targets=None: the original model, (batch, horizon) temperature outputs.
+    num_targets=K:    same trunk, one Dense(horizon * K) head reshaped to
+                      (batch, horizon, K), i.e. K variables in one forward pass.
+    """
+    head = [layers.Dense(horizon)]  # 168 outputs
+    if num_targets is not None:
+        head = [
+            layers.Dense(horizon * num_targets),
+            layers.Reshape((horizon, num_targets)),
+        ]
+
+    model = models.Sequential([
+        layers.Input(shape=(timesteps, num_features)),
+        layers.LSTM(64, return_sequences=True),
+        layers.Dropout(0.2),
+        layers.LSTM(64),
+        layers.Dropout(0.2),
+        layers.Dense(128, activation="relu"),
+        *head,
+    ])
+    return model
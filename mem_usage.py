@@ -0,0 +1,29 @@
+import resource
+import sys
+
+# ============================
+# Process memory 📏
+# ============================
+# Shared by the profiling and benchmark scripts (train_profile.py,
+# eval_quantized.py, benchmarks/bench_inference.py).
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process so far, in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def rss_mb():
+    """
+    Current resident set size in MB (Linux); the peak where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
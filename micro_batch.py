@@ -0,0 +1,139 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from config import MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_LATENCY_MS
+
+# ============================
+# 1. Micro-batching scheduler 🧺
+# ============================
+
+class MicroBatcher:
+    """
+    Coalesces concurrent forward passes into one.
+
+    Callers submit (n, lookback, num_features) windows from any thread. A single
+    worker takes the first waiting request, keeps collecting until it has
+    max_batch_size rows or max_latency_ms have passed, runs one
+    model.predict_on_batch on the concatenation and hands every caller its own
+    rows back. The model is only ever called from the worker thread.
+
+    Exposes predict / predict_on_batch, so it drops in wherever a model does.
+    """
+
+    def __init__(self, model, max_batch_size=MICRO_BATCH_MAX_SIZE, max_latency_ms=MICRO_BATCH_MAX_LATENCY_MS):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._carry = None   # request that did not fit in the previous batch
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "requests": 0, "dispatched": 0, "batches": 0, "rows": 0,
+            "max_queue_depth": 0, "wait_seconds": 0.0,
+        }
+
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    # ---- caller side ----
+
+    def submit(self, X):
+        """
+        Queue X for the next batch; returns a Future resolving to its predictions.
+        """
+        fut = Future()
+        self._queue.put((np.asarray(X, dtype=np.float32), fut, time.perf_counter()))
+        with self._stats_lock:
+            self._stats["requests"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queue.qsize())
+        return fut
+
+    def predict_on_batch(self, X):
+        return self.submit(X).result()
+
+    def predict(self, X, verbose=0, batch_size=None):
+        return self.predict_on_batch(X)
+
+    def close(self):
+        self._queue.put(None)
+        self._worker.join()
+
+    # ---- worker side ----
+
+    def _collect(self):
+        first = self._carry if self._carry is not None else self._queue.get()
+        self._carry = None
+        if first is None:
+            return None
+
+        items = [first]
+        rows = len(first[0])
+        deadline = time.perf_counter() + self.max_latency
+        while rows < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None or rows + len(item[0]) > self.max_batch_size:
+                self._carry = item
+                break
+            items.append(item)
+            rows += len(item[0])
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            if items is None:
+                return
+
+            X = items[0][0] if len(items) == 1 else np.concatenate([x for x, _, _ in items], axis=0)
+            dispatched = time.perf_counter()
+            with self._stats_lock:
+                self._stats["batches"] += 1
+                self._stats["dispatched"] += len(items)
+                self._stats["rows"] += len(X)
+                self._stats["wait_seconds"] += sum(dispatched - t for _, _, t in items)
+
+            try:
+                y = np.asarray(self.model.predict_on_batch(X))
+            except Exception as e:
+                for _, fut, _ in items:
+                    fut.set_exception(e)
+                continue
+
+            start = 0
+            for x, fut, _ in items:
+                fut.set_result(y[start:start + len(x)])
+                start += len(x)
+
+    # ---- metrics ----
+
+    def metrics(self):
+        """
+        Queue depth now and at its worst, and how full batches ran on average
+        (mean_batch_fill = mean rows per batch / max_batch_size).
+        """
+        with self._stats_lock:
+            s = dict(self._stats)
+        batches = max(s["batches"], 1)
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": s["max_queue_depth"],
+            "requests": s["requests"],
+            "batches": s["batches"],
+            "rows": s["rows"],
+            "mean_batch_size": s["rows"] / batches,
+            "mean_batch_fill": s["rows"] / (batches * self.max_batch_size),
+            "mean_queue_wait_ms": 1000.0 * s["wait_seconds"] / max(s["dispatched"], 1),
+            "max_batch_size": self.max_batch_size,
+            "max_latency_ms": self.max_latency * 1000.0,
+        }
@@ -0,0 +1,186 @@
+import argparse
+import re
+import threading
+import time
+
+import h5py
+import numpy as np
+
+from config import FEATURE_COLS, LOOKBACK_HOURS, HORIZON_HOURS, WEIGHTS_PATH
+
+# ============================
+# 1. Weights from the Keras .weights.h5 📂
+# ============================
+
+def _layer_sort_key(name):
+    # Keras auto-names layers "lstm", "lstm_1", "lstm_2", ... in creation order
+    m = re.search(r"_(\d+)$", name)
+    return int(m.group(1)) if m else 0
+
+def load_lstm_weights(path=WEIGHTS_PATH, dtype=np.float32):
+    """
+    Read the stacked LSTM + dense weights straight from the Keras 3 weights file.
+    Returns {"lstm": [(W, U, b), ...], "dense": [(W, b), ...]} in layer order.
+    """
+    with h5py.File(path, "r") as f:
+        layers = f["layers"]
+        lstm_names = sorted((n for n in layers if n.startswith("lstm")), key=_layer_sort_key)
+        dense_names = sorted((n for n in layers if n.startswith("dense")), key=_layer_sort_key)
+
+        lstm = [
+            tuple(np.asarray(layers[n]["cell"]["vars"][str(i)], dtype=dtype) for i in range(3))
+            for n in lstm_names
+        ]
+        dense = [
+            tuple(np.asarray(layers[n]["vars"][str(i)], dtype=dtype) for i in range(2))
+            for n in dense_names
+        ]
+    return {"lstm": lstm, "dense": dense}
+
+# ============================
+# 2. NumPy forward pass 🧮
+# ============================
+
+def _sigmoid_(x):
+    # In-place logistic: x <- 1 / (1 + exp(-x))
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1.0
+    np.reciprocal(x, out=x)
+    return x
+
+
+class NumpyLSTMForecaster:
+    """
+    Dependency-free inference for build_lstm_model: LSTM(64, seq) -> LSTM(64)
+    -> Dense(128, relu) -> Dense(168). Dropout is a no-op at inference.
+
+    The input projection of each LSTM layer is one matmul over all timesteps;
+    the recurrence then reuses preallocated gate/state buffers, so the 720-step
+    loop does no per-step allocation. Batches of any size (e.g. all cities) run
+    through one recurrence. Exposes predict / predict_on_batch like the Keras model.
+    The buffers are per thread, so concurrent callers (service, app sessions,
+    a backtest) never share state and still run in parallel.
+    """
+
+    def __init__(self, weights_path=WEIGHTS_PATH, dtype=np.float32):
+        self.dtype = dtype
+        weights = load_lstm_weights(weights_path, dtype)
+        self.lstm = weights["lstm"]
+        self.dense = weights["dense"]
+        self.units = [U.shape[0] for _, U, _ in self.lstm]
+        self._local = threading.local()
+
+    def _get_buffers(self, n, timesteps):
+        key = (n, timesteps)
+        buffers = getattr(self._local, "buffers", {})
+        if key not in buffers:
+            # Only the latest shape is kept per thread
+            buffers = self._local.buffers = {key: {
+                "proj": [np.empty((n, timesteps, 4 * u), dtype=self.dtype) for u in self.units],
+                "seq": [np.empty((n, timesteps, u), dtype=self.dtype) for u in self.units[:-1]],
+                "gates": [np.empty((n, 4 * u), dtype=self.dtype) for u in self.units],
+                "h": [np.empty((n, u), dtype=self.dtype) for u in self.units],
+                "c": [np.empty((n, u), dtype=self.dtype) for u in self.units],
+                "tmp": [np.empty((n, u), dtype=self.dtype) for u in self.units],
+            }}
+        return buffers[key]
+
+    def _run_lstm(self, layer, x_seq, bufs, seq_out=None):
+        W, U, b = self.lstm[layer]
+        u = self.units[layer]
+        proj, z = bufs["proj"][layer], bufs["gates"][layer]
+        h, c, tmp = bufs["h"][layer], bufs["c"][layer], bufs["tmp"][layer]
+
+        # All timesteps' input contributions at once: (N, T, F) @ (F, 4u)
+        np.matmul(x_seq, W, out=proj)
+        proj += b
+        h.fill(0.0)
+        c.fill(0.0)
+
+        # Keras gate order: input, forget, cell candidate, output
+        i_g, f_g, g_g, o_g = z[:, :u], z[:, u:2 * u], z[:, 2 * u:3 * u], z[:, 3 * u:]
+        for t in range(x_seq.shape[1]):
+            np.matmul(h, U, out=z)
+            z += proj[:, t]
+            _sigmoid_(i_g)
+            _sigmoid_(f_g)
+            _sigmoid_(o_g)
+            np.tanh(g_g, out=g_g)
+
+            c *= f_g
+            np.multiply(i_g, g_g, out=tmp)
+            c += tmp
+            np.tanh(c, out=tmp)
+            np.multiply(o_g, tmp, out=h)
+            if seq_out is not None:
+                seq_out[:, t] = h
+        return h
+
+    def predict_on_batch(self, X):
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        n, timesteps, _ = X.shape
+        bufs = self._get_buffers(n, timesteps)
+
+        x_seq = X
+        for layer in range(len(self.lstm)):
+            last = layer == len(self.lstm) - 1
+            seq_out = None if last else bufs["seq"][layer]
+            h = self._run_lstm(layer, x_seq, bufs, seq_out)
+            x_seq = seq_out
+
+        out = h
+        for k, (W, b) in enumerate(self.dense):
+            out = out @ W + b
+            if k < len(self.dense) - 1:
+                np.maximum(out, 0.0, out=out)   # relu on the hidden dense layer
+        return out
+
+    def predict(self, X, verbose=0, batch_size=None):
+        return self.predict_on_batch(X)
+
+# ============================
+# 3. Parity check vs Keras ✅
+# ============================
+
+def check_parity(weights_path=WEIGHTS_PATH, n_samples=8, atol=1e-4, seed=0):
+    """
+    Compare against the Keras model on random scaled windows (needs TensorFlow).
+    Returns the max absolute difference; raises if above atol.
+    """
+    from forecast import load_lstm_model
+
+    rng = np.random.default_rng(seed)
+    X = rng.random((n_samples, LOOKBACK_HOURS, len(FEATURE_COLS)), dtype=np.float32)
+
+    y_keras = np.asarray(load_lstm_model(weights_path).predict_on_batch(X))
+    y_numpy = NumpyLSTMForecaster(weights_path).predict_on_batch(X)
+
+    max_diff = float(np.max(np.abs(y_keras - y_numpy)))
+    if max_diff > atol:
+        raise AssertionError(f"NumPy LSTM differs from Keras by {max_diff:.2e} (atol {atol:.0e})")
+    return max_diff
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NumPy-only LSTM inference: parity check and latency.")
+    parser.add_argument("--weights", default=WEIGHTS_PATH)
+    parser.add_argument("--batch", type=int, default=4, help="Windows per forward pass for the timing run")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--check", action="store_true", help="Compare with Keras output (requires TensorFlow)")
+    args = parser.parse_args()
+
+    if args.check:
+        print(f"✅ Parity vs Keras: max |diff| = {check_parity(args.weights):.2e}")
+
+    engine = NumpyLSTMForecaster(args.weights)
+    X = np.random.default_rng(0).random((args.batch, LOOKBACK_HOURS, len(FEATURE_COLS)), dtype=np.float32)
+    engine.predict_on_batch(X)   # warm the buffers
+
+    times = []
+    for _ in range(args.repeats):
+        t0 = time.perf_counter()
+        y = engine.predict_on_batch(X)
+        times.append(time.perf_counter() - t0)
+    assert y.shape == (args.batch, HORIZON_HOURS)
+    print(f"⏱️ batch={args.batch}: median {np.median(times) * 1e3:.1f} ms, best {min(times) * 1e3:.1f} ms")
@@ -0,0 +1,120 @@
+import argparse
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+# ============================
+# Local stand-in for the Open-Meteo API 🧪
+# ============================
+# Serves /v1/archive and /v1/forecast with deterministic synthetic hourly data,
+# so fetching, sync and backfill code can run offline:
+#
+#   server, base_url = start_stub_server()
+#   fetch_hourly_history(..., url=f"{base_url}/v1/archive")
+
+def synthetic_hourly(lat, lon, times, variables):
+    """
+    Smooth daily/seasonal cycles that depend on the location, one value per timestamp.
+    """
+    hours = np.array([(t - datetime(2000, 1, 1)).total_seconds() / 3600.0 for t in times])
+    day = 2 * np.pi * hours / 24.0
+    year = 2 * np.pi * hours / (24.0 * 365.25)
+    phase = (lat + lon) / 10.0
+
+    columns = {
+        "temperature_2m": 20 + 8 * np.sin(year + phase) + 5 * np.sin(day - 2.0),
+        "relative_humidity_2m": 60 + 20 * np.sin(day + phase),
+        "pressure_msl": 1012 + 6 * np.sin(year / 3 + phase),
+        "wind_speed_10m": 8 + 4 * np.abs(np.sin(day / 2 + phase)),
+    }
+    return {v: np.round(columns.get(v, np.zeros(len(times))), 1).tolist() for v in variables}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server_version = "OpenMeteoStub/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        srv = self.server
+        with srv.lock:
+            srv.request_count += 1
+            n = srv.request_count
+        if srv.latency:
+            time.sleep(srv.latency)
+        if srv.fail_every and n % srv.fail_every == 0:
+            self._send_json(503, {"error": True, "reason": "stub: simulated outage"})
+            return
+
+        parsed = urlparse(self.path)
+        q = parse_qs(parsed.query)
+        lat = float(q.get("latitude", ["0"])[0])
+        lon = float(q.get("longitude", ["0"])[0])
+        variables = [v for item in q.get("hourly", []) for v in item.split(",")]
+
+        if parsed.path.endswith("/archive"):
+            start = date.fromisoformat(q["start_date"][0])
+            end = date.fromisoformat(q["end_date"][0])
+        elif parsed.path.endswith("/forecast"):
+            start = date.today()
+            end = start + timedelta(days=int(q.get("forecast_days", ["7"])[0]) - 1)
+        else:
+            self._send_json(404, {"error": True, "reason": f"stub: unknown path {parsed.path}"})
+            return
+
+        n_hours = ((end - start).days + 1) * 24
+        t0 = datetime.combine(start, datetime.min.time())
+        times = [t0 + timedelta(hours=h) for h in range(max(n_hours, 0))]
+
+        hourly = {"time": [t.strftime("%Y-%m-%dT%H:%M") for t in times]}
+        hourly.update(synthetic_hourly(lat, lon, times, variables))
+        self._send_json(200, {"latitude": lat, "longitude": lon, "hourly": hourly})
+
+
+def start_stub_server(host="127.0.0.1", port=0, latency=0.0, fail_every=0):
+    """
+    Start the stub in a daemon thread.
+    latency: seconds to sleep before each response.
+    fail_every: answer every n-th request with HTTP 503 (0 = never).
+    Returns (server, base_url); call server.shutdown() when done.
+    """
+    server = ThreadingHTTPServer((host, port), _StubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.fail_every = fail_every
+    server.request_count = 0
+    server.lock = threading.Lock()
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    return server, base_url
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local Open-Meteo stub.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--fail-every", type=int, default=0)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(port=args.port, latency=args.latency, fail_every=args.fail_every)
+    print(f"🧪 Open-Meteo stub at {base_url}/v1/archive and {base_url}/v1/forecast (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,147 @@
+import argparse
+import atexit
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from config import FEATURE_COLS, HISTORY_CSV
+from scaling import CityScaler, train_split_end
+
+SPLITS = ("train", "val", "test")
+# Never fork: callers (train.py, data_pipeline) have TensorFlow / oneDNN
+# threads running by then, and a forked copy of them can deadlock. Spawned
+# workers start clean and only need numpy and the memmap paths; they do
+# re-import the launching script (train.py: TensorFlow), a few seconds each.
+START_METHOD = "spawn"
+
+# ============================
+# 1. Shared on-disk layout 🗺️
+# ============================
+# raw.npy:    every city's feature rows, city blocks back to back, time-sorted
+# scaled.npy: the same rows min-max scaled (train-split parameters per city)
+# Workers open both as memmaps and only exchange offsets and scaler parameters
+# with the parent, so no array is ever pickled.
+
+def _city_layout(df, feature_cols):
+    """
+    (cities in order of first appearance, row offsets, lengths, time-sorted values).
+    """
+    cities = list(df["city"].unique())
+    codes = pd.Categorical(df["city"], categories=cities).codes
+    order = np.lexsort((df["time"].to_numpy(), codes))
+    lengths = np.bincount(codes, minlength=len(cities)).astype(np.int64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    values = df[feature_cols].to_numpy(dtype=np.float64)[order]
+    return cities, offsets, lengths, values
+
+def _split_bounds(n, train_frac, val_frac):
+    return train_split_end(n, train_frac), int(n * (train_frac + val_frac))
+
+# ============================
+# 2. Per-city worker 👷
+# ============================
+
+def _scale_city_block(raw_path, scaled_path, offset, length, train_frac, val_frac):
+    """
+    Fit the city's scaler on its train rows and write the scaled block in place.
+    Returns only (min_, scale_).
+    """
+    raw = np.load(raw_path, mmap_mode="r")
+    scaled = np.load(scaled_path, mmap_mode="r+")
+
+    values = raw[offset:offset + length]
+    train_end, _ = _split_bounds(length, train_frac, val_frac)
+    scaler = CityScaler.fit(values[:train_end])
+    scaled[offset:offset + length] = scaler.transform(values)
+    scaled.flush()
+    return scaler.min_, scaler.scale_
+
+# ============================
+# 3. Parallel prepare_city_splits ⚡
+# ============================
+
+def prepare_city_splits_parallel(df, feature_cols=FEATURE_COLS, train_frac=0.7, val_frac=0.15,
+                                 dtype=np.float32, max_workers=None, workdir=None):
+    """
+    Same result as data_pipeline.prepare_city_splits — (splits, cities, scalers),
+    splits[name] a list of per-city (T_split, num_features) arrays — with cities
+    fanned out over a process pool.
+
+    The arrays are read-only views of one memory-mapped scaled.npy in workdir
+    (a temporary directory removed at exit when not given), so windows cut from
+    them stay zero-copy. max_workers=1 runs in-process without a pool; a pool
+    spawns fresh worker processes (START_METHOD), which pays off for many cities.
+    """
+    if workdir is None:
+        workdir = tempfile.mkdtemp(prefix="weatherlens_prep_")
+        atexit.register(shutil.rmtree, workdir, ignore_errors=True)
+    os.makedirs(workdir, exist_ok=True)
+
+    cities, offsets, lengths, values = _city_layout(df, feature_cols)
+    raw_path = os.path.join(workdir, "raw.npy")
+    scaled_path = os.path.join(workdir, "scaled.npy")
+    np.save(raw_path, values)
+    del values
+    np.lib.format.open_memmap(scaled_path, mode="w+", dtype=dtype, shape=(int(lengths.sum()), len(feature_cols))).flush()
+
+    tasks = [(raw_path, scaled_path, int(o), int(n), train_frac, val_frac) for o, n in zip(offsets, lengths)]
+    if max_workers == 1 or len(tasks) <= 1:
+        params = [_scale_city_block(*t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(START_METHOD)) as pool:
+            params = list(pool.map(_scale_city_block, *zip(*tasks), chunksize=max(1, len(tasks) // 64)))
+    os.remove(raw_path)
+
+    scaled = np.load(scaled_path, mmap_mode="r")
+    splits = {name: [] for name in SPLITS}
+    scalers = {}
+    for c, o, n, (min_, scale) in zip(cities, offsets, lengths, params):
+        block = scaled[o:o + n]
+        train_end, val_end = _split_bounds(int(n), train_frac, val_frac)
+        splits["train"].append(block[:train_end])
+        splits["val"].append(block[train_end:val_end])
+        splits["test"].append(block[val_end:])
+        scalers[c] = CityScaler(min_, scale)
+    return splits, cities, scalers
+
+
+def synthetic_history(n_cities, hours=365 * 24, seed=0):
+    """
+    Random-walk hourly history for n_cities (benchmarks and scaling runs).
+    """
+    rng = np.random.default_rng(seed)
+    time_index = pd.date_range("2024-01-01", periods=hours, freq="h")
+    frames = []
+    for i in range(n_cities):
+        walk = np.cumsum(rng.normal(size=(hours, len(FEATURE_COLS))), axis=0)
+        frame = pd.DataFrame(walk, columns=FEATURE_COLS)
+        frame.insert(0, "time", time_index)
+        frame.insert(0, "city", f"city_{i:04d}")
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time serial vs process-pool dataset preparation.")
+    parser.add_argument("--csv", default=HISTORY_CSV)
+    parser.add_argument("--synthetic-cities", type=int, default=None,
+                        help="Use this many random-walk cities instead of the CSV")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    if args.synthetic_cities:
+        history_df = synthetic_history(args.synthetic_cities)
+    else:
+        history_df = pd.read_csv(args.csv, parse_dates=["time"])
+    print(f"{history_df['city'].nunique()} cities, {len(history_df):,} rows")
+
+    for workers in args.workers:
+        t0 = time.perf_counter()
+        prepare_city_splits_parallel(history_df, max_workers=workers)
+        print(f"⏱️ workers={workers}: {time.perf_counter() - t0:.2f} s")
@@ -0,0 +1,119 @@
+import argparse
+import math
+
+import numpy as np
+
+from config import (
+    FEATURE_COLS, TARGET_COL, LOOKBACK_HOURS, HORIZON_HOURS,
+    HISTORY_CSV, HISTORY_STORE_DIR, WEIGHTS_PATH, SCALERS_PATH, MODEL_RUNTIME,
+)
+from forecast import (
+    load_forecast_model, load_history, load_scalers,
+    build_last_windows, predict_batch, forecast_frame,
+)
+from history_index import as_history_index
+from scaling import inverse_scale_targets
+
+FILL_POLICIES = ("last_day", "persistence", "window_mean")
+
+# ============================
+# 1. Filling the non-target features 🧩
+# ============================
+
+def fill_exogenous(buf, start, steps, target_index, policy="last_day", lookback=LOOKBACK_HOURS):
+    """
+    Write the non-target features of buf[:, start:start + steps] (scaled space).
+
+    policy="last_day":    repeat the last 24 observed/filled hours (keeps the daily cycle)
+    policy="persistence": hold the last value
+    policy="window_mean": mean of the preceding lookback hours
+    """
+    others = [i for i in range(buf.shape[2]) if i != target_index]
+    if policy == "last_day":
+        day = buf[:, start - 24:start, others]
+        reps = math.ceil(steps / 24)
+        buf[:, start:start + steps, others] = np.tile(day, (1, reps, 1))[:, :steps]
+    elif policy == "persistence":
+        buf[:, start:start + steps, others] = buf[:, start - 1:start, others]
+    elif policy == "window_mean":
+        buf[:, start:start + steps, others] = buf[:, start - lookback:start, others].mean(axis=1, keepdims=True)
+    else:
+        raise ValueError(f"Unknown fill policy {policy!r}; expected one of {FILL_POLICIES}")
+
+# ============================
+# 2. Autoregressive rollout 🔁
+# ============================
+
+def rollout(model, X, horizon_hours, target_index=None, fill="last_day", batch_size=256):
+    """
+    Chain HORIZON_HOURS-long forecasts out to horizon_hours.
+
+    X: (N, lookback, num_features) scaled windows, one row per city.
+    All cities live in one (N, lookback + steps * HORIZON_HOURS, F) buffer. Each step
+    writes the predicted temperature (and the filled exogenous features) after the
+    current end and takes the next input as a view HORIZON_HOURS further along,
+    so nothing is rebuilt or rescaled between steps and every step is one batched pass.
+    Returns (N, horizon_hours) scaled temperature forecasts.
+    """
+    if target_index is None:
+        target_index = FEATURE_COLS.index(TARGET_COL)
+    n, lookback, num_features = X.shape
+    steps = math.ceil(horizon_hours / HORIZON_HOURS)
+
+    buf = np.empty((n, lookback + steps * HORIZON_HOURS, num_features), dtype=np.float32)
+    buf[:, :lookback] = X
+
+    for k in range(steps):
+        start = k * HORIZON_HOURS
+        end = lookback + start
+        y = predict_batch(model, buf[:, start:end], batch_size=batch_size)
+        if k < steps - 1:
+            fill_exogenous(buf, end, HORIZON_HOURS, target_index, fill, lookback)
+        buf[:, end:end + HORIZON_HOURS, target_index] = y
+
+    return buf[:, lookback:lookback + horizon_hours, target_index].copy()
+
+
+def rolling_forecast_cities(model, df, scalers, cities=None, days=14, fill="last_day",
+                            lookback_hours=LOOKBACK_HOURS, batch_size=256):
+    """
+    forecast_cities beyond 7 days: tidy city, time, hour_ahead, pred_temp_c frame
+    covering days * 24 hours, every city advanced together.
+    The first 168 hours are identical to forecast_cities.
+    """
+    df = as_history_index(df, scalers)
+    if cities is None:
+        cities = df.cities
+    cities = list(cities)
+
+    X, last_times = build_last_windows(df, cities, lookback_hours, scalers)
+    y_scaled = rollout(model, X, days * 24, FEATURE_COLS.index(TARGET_COL), fill, batch_size)
+
+    y_pred_c = inverse_scale_targets(y_scaled, scalers, cities, TARGET_COL, FEATURE_COLS)
+    return forecast_frame(cities, last_times, y_pred_c)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extended-horizon (autoregressive) forecast for many cities.")
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--fill", choices=FILL_POLICIES, default="last_day",
+                        help="How humidity, pressure and wind are filled past the observed window")
+    parser.add_argument("--cities", nargs="*", default=None, help="Subset of cities (default: all)")
+    parser.add_argument("--csv", default=HISTORY_CSV)
+    parser.add_argument("--store", default=HISTORY_STORE_DIR)
+    parser.add_argument("--weights", default=WEIGHTS_PATH)
+    parser.add_argument("--scalers", default=SCALERS_PATH)
+    parser.add_argument("--runtime", choices=["keras", "tflite", "numpy"], default=MODEL_RUNTIME)
+    parser.add_argument("--out", default=None, help="Write the forecast frame to this CSV instead of printing")
+    args = parser.parse_args()
+
+    history_df = load_history(args.csv, args.store)
+    scalers = load_scalers(args.scalers)
+    model = load_forecast_model(args.runtime, weights_path=args.weights)
+
+    forecasts = rolling_forecast_cities(model, history_df, scalers, args.cities, args.days, args.fill)
+    if args.out:
+        forecasts.to_csv(args.out, index=False)
+        print(f"✅ Saved: {args.out}")
+    else:
+        print(forecasts.to_string(index=False))
@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from config import FEATURE_COLS, TARGET_COL, HISTORY_CSV, SCALERS_PATH
+
+SCALERS_FORMAT_VERSION = 1
+
+# ============================
+# 1. NumPy min-max scaler 📏
+# ============================
+
+class CityScaler:
+    """
+    Per-feature min-max parameters of one city, in MinMaxScaler's convention:
+        scaled = X * scale + min        X = (scaled - min) / scale
+    transform / inverse_transform are plain broadcasted NumPy, so this is a
+    drop-in for a fitted sklearn MinMaxScaler at serving time.
+    """
+
+    def __init__(self, min_, scale):
+        self.min_ = np.asarray(min_, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+
+    @classmethod
+    def fit(cls, values):
+        """
+        Fit on a (T, num_features) array, with sklearn's handling of constant columns.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        data_min = np.nanmin(values, axis=0)
+        data_range = np.nanmax(values, axis=0) - data_min
+        data_range[data_range == 0.0] = 1.0
+        scale = 1.0 / data_range
+        return cls(-data_min * scale, scale)
+
+    @classmethod
+    def from_sklearn(cls, scaler):
+        return cls(scaler.min_, scaler.scale_)
+
+    def transform(self, X):
+        return np.asarray(X, dtype=np.float64) * self.scale_ + self.min_
+
+    def inverse_transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.min_) / self.scale_
+
+# ============================
+# 2. Batched inverse scaling of predictions 🔄
+# ============================
+
+def target_params(scalers, cities, target_cols=TARGET_COL, feature_cols=FEATURE_COLS):
+    """
+    Per-row min and scale of the target column(s): two (N, K) arrays,
+    row i taken from scalers[cities[i]].
+    """
+    if isinstance(target_cols, str):
+        target_cols = [target_cols]
+    idx = [feature_cols.index(c) for c in target_cols]
+    mins = np.empty((len(cities), len(idx)))
+    scales = np.empty((len(cities), len(idx)))
+    for i, c in enumerate(cities):
+        mins[i] = np.asarray(scalers[c].min_)[idx]
+        scales[i] = np.asarray(scalers[c].scale_)[idx]
+    return mins, scales
+
+def inverse_scale_targets(y_scaled, scalers, cities, target_cols=TARGET_COL, feature_cols=FEATURE_COLS):
+    """
+    Undo min-max scaling on a whole batch of predictions in one broadcasted op.
+
+    y_scaled: (N, horizon) for a single target column, or
+              (N, horizon, K) for K target columns (in target_cols order).
+    Row i belongs to cities[i]. Returns float64 in original units, same shape.
+    """
+    y_scaled = np.asarray(y_scaled, dtype=np.float64)
+    mins, scales = target_params(scalers, cities, target_cols, feature_cols)
+
+    if y_scaled.ndim == 2:
+        return (y_scaled - mins[:, :1]) / scales[:, :1]
+    return (y_scaled - mins[:, None, :]) / scales[:, None, :]
+
+# ============================
+# 3. Fitting (train split only) 🏋️
+# ============================
+
+def train_split_end(n, train_frac=0.7):
+    return int(n * train_frac)
+
+def fit_city_scalers(df, feature_cols=FEATURE_COLS, train_frac=0.7):
+    """
+    One CityScaler per city, fit on the chronological train split only,
+    exactly like split_scale_city in main.ipynb.
+    """
+    scalers = {}
+    for c, city_df in df.groupby("city", sort=True):
+        values = city_df.sort_values("time")[feature_cols].to_numpy()
+        scalers[c] = CityScaler.fit(values[:train_split_end(len(values), train_frac)])
+    return scalers
+
+# ============================
+# 4. Versioned JSON artifact 💾
+# ============================
+
+def save_city_scalers(scalers, path=SCALERS_PATH, feature_cols=FEATURE_COLS, train_frac=0.7):
+    """
+    Write {city: scaler} (CityScaler or fitted sklearn MinMaxScaler) next to the weights.
+    """
+    payload = {
+        "version": SCALERS_FORMAT_VERSION,
+        "feature_cols": list(feature_cols),
+        "train_frac": train_frac,
+        "cities": {
+            c: {"min": np.asarray(s.min_).tolist(), "scale": np.asarray(s.scale_).tolist()}
+            for c, s in sorted(scalers.items())
+        },
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, indent=1)
+    os.replace(tmp_path, path)
+    return path
+
+def load_city_scalers(path=SCALERS_PATH, feature_cols=FEATURE_COLS):
+    """
+    Read the artifact back into {city: CityScaler}.
+    Fails loudly if it was written for a different format or feature order.
+    """
+    with open(path) as f:
+        payload = json.load(f)
+
+    if payload.get("version") != SCALERS_FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported scaler format version {payload.get('version')}")
+    if payload["feature_cols"] != list(feature_cols):
+        raise ValueError(f"{path}: scalers were fit on {payload['feature_cols']}, expected {list(feature_cols)}")
+
+    return {
+        c: CityScaler(p["min"], p["scale"])
+        for c, p in payload["cities"].items()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit per-city train-split scalers and save the artifact.")
+    parser.add_argument("--csv", default=HISTORY_CSV)
+    parser.add_argument("--out", default=SCALERS_PATH)
+    parser.add_argument("--train-frac", type=float, default=0.7)
+    args = parser.parse_args()
+
+    history_df = pd.read_csv(args.csv, parse_dates=["time"])
+    scalers = fit_city_scalers(history_df, FEATURE_COLS, args.train_frac)
+    save_city_scalers(scalers, args.out, FEATURE_COLS, args.train_frac)
+    print(f"✅ Saved: {args.out} ({len(scalers)} cities)")
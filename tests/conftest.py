@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root, next to this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def random_weights_path(tmp_path_factory):
+    """
+    A freshly initialized LSTM saved like train.py saves it, so parity tests
+    never depend on the trained weights being present.
+    """
+    tf = pytest.importorskip("tensorflow")
+    from config import FEATURE_COLS, HORIZON_HOURS, LOOKBACK_HOURS
+    from lstm_model import build_lstm_model
+
+    tf.keras.utils.set_random_seed(0)
+    model = build_lstm_model(LOOKBACK_HOURS, len(FEATURE_COLS), HORIZON_HOURS)
+    path = tmp_path_factory.mktemp("weights") / "lstm.weights.h5"
+    model.save_weights(str(path))
+    return str(path)
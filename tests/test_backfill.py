@@ -0,0 +1,75 @@
+import os
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from backfill import BackfillCheckpoint, backfill_history, chunk_id, chunk_is_final, date_chunks
+from history_store import read_city_history, write_city_partition
+from openmeteo_stub import start_stub_server
+from weather_api import CITIES
+
+CITY = {"delhi": CITIES["delhi"]}
+START, END = date(2024, 1, 1), date(2024, 3, 31)
+HOURS = (END - START).days * 24 + 24
+
+
+@pytest.fixture(scope="module")
+def archive_url():
+    server, base_url = start_stub_server()
+    yield f"{base_url}/v1/archive"
+    server.shutdown()
+
+
+def checkpoint_path(store_dir):
+    return os.path.join(store_dir, "_backfill_checkpoint.json")
+
+
+def test_date_chunks_cover_the_range():
+    chunks = date_chunks(date(2024, 1, 15), date(2024, 7, 2), "quarter")
+    assert chunks == [(date(2024, 1, 15), date(2024, 3, 31)), (date(2024, 4, 1), date(2024, 6, 30)),
+                      (date(2024, 7, 1), date(2024, 7, 2))]
+
+
+def test_only_complete_chunks_before_the_horizon_are_final():
+    jan = (date(2024, 1, 1), date(2024, 1, 31))
+    assert chunk_is_final(*jan, 31 * 24, available_until=date(2024, 2, 5))
+    assert not chunk_is_final(*jan, 31 * 24 - 7, available_until=date(2024, 2, 5))   # trailing nulls dropped
+    assert not chunk_is_final(*jan, 31 * 24, available_until=date(2024, 1, 20))
+
+
+def test_backfill_compacts_and_clears_the_checkpoint(tmp_path, archive_url):
+    store = str(tmp_path)
+    rows = backfill_history(CITY, START, END, store, url=archive_url, available_until=date(2024, 12, 31))
+
+    df = read_city_history(store, "delhi")
+    assert rows == {"delhi": HOURS} and len(df) == HOURS
+    assert df["time"].is_unique and df["time"].is_monotonic_increasing
+    assert not os.path.exists(checkpoint_path(store))
+    assert not os.listdir(os.path.join(store, "_staging", "delhi"))
+
+
+def test_rerun_refills_a_rewritten_partition(tmp_path, archive_url):
+    store = str(tmp_path)
+    backfill_history(CITY, START, END, store, url=archive_url, available_until=date(2024, 12, 31))
+    df = read_city_history(store, "delhi")
+    write_city_partition(df[df["time"] < pd.Timestamp("2024-02-01")], store, "delhi")
+
+    backfill_history(CITY, START, END, store, url=archive_url, available_until=date(2024, 12, 31))
+
+    pd.testing.assert_frame_equal(read_city_history(store, "delhi"), df)
+
+
+def test_resume_skips_only_final_chunks(tmp_path, archive_url, monkeypatch):
+    store = str(tmp_path)
+    marked = []
+    monkeypatch.setattr(BackfillCheckpoint, "clear", lambda self: None)   # keep it, as after a crash
+    monkeypatch.setattr(BackfillCheckpoint, "mark_done",
+                        lambda self, cid, _orig=BackfillCheckpoint.mark_done: (marked.append(cid), _orig(self, cid)))
+
+    # March is past the archive horizon: fetched and staged, but not checkpointed
+    backfill_history(CITY, START, END, store, url=archive_url, available_until=date(2024, 3, 15))
+
+    assert sorted(marked) == [chunk_id("delhi", date(2024, 1, 1), date(2024, 1, 31)),
+                              chunk_id("delhi", date(2024, 2, 1), date(2024, 2, 29))]
+    assert BackfillCheckpoint(checkpoint_path(store)).done == set(marked)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from backtest import SEASONS, backtest
+from config import FEATURE_COLS, TARGET_COL
+from parallel_prep import synthetic_history
+from scaling import fit_city_scalers
+
+LOOKBACK, HORIZON, STRIDE = 48, 24, 7
+TARGET = FEATURE_COLS.index(TARGET_COL)
+
+
+class LinearModel:
+    def __init__(self, seed=0):
+        self.W = np.random.default_rng(seed).normal(scale=0.05, size=(LOOKBACK * len(FEATURE_COLS), HORIZON))
+
+    def predict_on_batch(self, X):
+        return np.asarray(X, dtype=np.float64).reshape(len(X), -1) @ self.W
+
+
+@pytest.fixture(scope="module")
+def history():
+    df = synthetic_history(3, hours=24 * 200, seed=5).sample(frac=1, random_state=1)
+    return df, fit_city_scalers(df)
+
+
+def per_origin_errors(model, df, scalers, split):
+    """
+    Reference: one forward pass per origin, errors in °C keyed by (city, season).
+    """
+    errors = {}
+    for c, city_df in df.groupby("city", sort=True):
+        city_df = city_df.sort_values("time")
+        raw = city_df[FEATURE_COLS].to_numpy(dtype=np.float64)
+        scaled = scalers[c].transform(raw).astype(np.float32)
+        n = len(raw)
+        seg_start, seg_end = {"test": (int(n * 0.85), n), "val": (int(n * 0.7), int(n * 0.85))}[split]
+        for start in range(max(seg_start - LOOKBACK, 0), seg_end - LOOKBACK - HORIZON + 1, STRIDE):
+            origin = start + LOOKBACK
+            y_scaled = model.predict_on_batch(scaled[None, start:origin])[0]
+            pred_c = (y_scaled - scalers[c].min_[TARGET]) / scalers[c].scale_[TARGET]
+            true_c = raw[origin:origin + HORIZON, TARGET]
+            season = SEASONS[(city_df["time"].iloc[origin - 1].month % 12) // 3]
+            errors.setdefault((c, season), []).append(pred_c - true_c)
+    return {k: np.array(v) for k, v in errors.items()}
+
+
+@pytest.mark.parametrize("split", ["test", "val"])
+def test_backtest_matches_a_per_origin_loop(history, split):
+    df, scalers = history
+    model = LinearModel()
+    per_hour, summary = backtest(model, df, scalers, split=split, stride=STRIDE, batch_size=50,
+                                 workers=3, lookback=LOOKBACK, horizon=HORIZON)
+    errors = per_origin_errors(model, df, scalers, split)
+
+    for c in sorted(scalers):
+        err = np.concatenate([e for (city, _), e in errors.items() if city == c])
+        rows = per_hour[per_hour["city"] == c]
+        np.testing.assert_allclose(rows["mae_c"], np.abs(err).mean(axis=0), rtol=1e-5)
+        np.testing.assert_allclose(rows["rmse_c"], np.sqrt((err ** 2).mean(axis=0)), rtol=1e-5)
+        assert (rows["origins"] == len(err)).all()
+        for season in SEASONS:
+            got = summary["per_city_season_mae_c"][c][season]
+            if (c, season) in errors:
+                assert got == pytest.approx(np.abs(errors[c, season]).mean(), rel=1e-5)
+            else:
+                assert got is None
+
+    everything = np.concatenate(list(errors.values()))
+    assert summary["origins"] == len(everything)
+    assert summary["overall"]["mae_c"] == pytest.approx(np.abs(everything).mean(), rel=1e-5)
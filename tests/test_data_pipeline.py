@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("tensorflow")
+
+from data_pipeline import make_window_dataset, prepare_city_splits, split_scale_city_arrays
+from windowing import window_views
+
+FEATURES = ["temperature_2m", "relative_humidity_2m", "wind_speed_10m", "surface_pressure"]
+
+
+def city_frame(city, n, seed):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n, len(FEATURES))) * 10 + 50, columns=FEATURES)
+    df.insert(0, "time", pd.date_range("2024-01-01", periods=n, freq="h"))
+    df.insert(0, "city", city)
+    return df
+
+
+@pytest.fixture
+def history():
+    return pd.concat([city_frame("delhi", 300, 0), city_frame("mumbai", 260, 1)], ignore_index=True)
+
+
+def test_split_scale_matches_the_notebook(history):
+    from sklearn.preprocessing import MinMaxScaler
+
+    city_df = history[history["city"] == "delhi"]
+    parts, scaler = split_scale_city_arrays(city_df, FEATURES, dtype=np.float64)
+
+    train_end, val_end = int(300 * 0.7), int(300 * 0.85)
+    ref = MinMaxScaler().fit(city_df[FEATURES].iloc[:train_end])
+    scaled = ref.transform(city_df[FEATURES])
+    np.testing.assert_allclose(parts["train"], scaled[:train_end])
+    np.testing.assert_allclose(parts["val"], scaled[train_end:val_end])
+    np.testing.assert_allclose(parts["test"], scaled[val_end:])
+    np.testing.assert_allclose(scaler.inverse_transform(parts["test"]), city_df[FEATURES].to_numpy()[val_end:])
+
+
+def test_streamed_windows_match_materialized_windows(history):
+    splits, cities, _ = prepare_city_splits(history, FEATURES)
+    lookback, horizon = 24, 12
+
+    ds = make_window_dataset(splits["train"], lookback, horizon, target_index=0, batch_size=32)
+    X = np.concatenate([x.numpy() for x, _ in ds])
+    y = np.concatenate([t.numpy() for _, t in ds])
+
+    views = [window_views(a, a[:, 0], lookback, horizon) for a in splits["train"]]
+    np.testing.assert_array_equal(X, np.concatenate([v[0] for v in views]))
+    np.testing.assert_array_equal(y, np.concatenate([v[1] for v in views]))
+    assert cities == ["delhi", "mumbai"]
+
+
+def test_shuffled_multi_target_windows_are_a_permutation(history):
+    splits, _, _ = prepare_city_splits(history, FEATURES)
+    ds = make_window_dataset(splits["val"], 8, 4, target_index=[0, 2], batch_size=16, shuffle=True, seed=0)
+    batches = list(ds)  # one pass: the order changes on every iteration
+    X = np.concatenate([x.numpy() for x, _ in batches])
+    y = np.concatenate([t.numpy() for _, t in batches])
+
+    views = [window_views(a, a[:, [0, 2]], 8, 4) for a in splits["val"]]
+    X_ref = np.concatenate([v[0] for v in views])
+    y_ref = np.concatenate([v[1] for v in views])
+    assert y.shape == (len(X_ref), 4, 2)
+    order = np.lexsort(X.reshape(len(X), -1).T)
+    order_ref = np.lexsort(X_ref.reshape(len(X_ref), -1).T)
+    np.testing.assert_array_equal(X[order], X_ref[order_ref])
+    np.testing.assert_array_equal(y[order], y_ref[order_ref])
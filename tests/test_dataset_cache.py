@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset_cache import cached_city_splits, list_entries
+from history_store import write_history_store
+from parallel_prep import SPLITS, prepare_city_splits_parallel, synthetic_history
+from windowing import build_window_index
+
+LOOKBACK, HORIZON = 48, 24
+
+
+@pytest.fixture
+def history():
+    return synthetic_history(3, hours=300, seed=4)
+
+
+@pytest.fixture
+def csv_path(history, tmp_path):
+    path = tmp_path / "history.csv"
+    history.to_csv(path, index=False)
+    return str(path)
+
+
+def cached(source, cache_dir, **kwargs):
+    return cached_city_splits(source, lookback=LOOKBACK, horizon=HORIZON, cache_dir=str(cache_dir), **kwargs)
+
+
+def test_miss_then_hit_serves_the_prepared_splits(csv_path, tmp_path):
+    *_, hit = cached(csv_path, tmp_path / "cache")
+    assert not hit
+    splits, cities, scalers, index_tables, hit = cached(csv_path, tmp_path / "cache")
+    assert hit
+
+    df = pd.read_csv(csv_path, parse_dates=["time"])
+    want, want_cities, want_scalers = prepare_city_splits_parallel(df, max_workers=1, workdir=str(tmp_path / "ref"))
+    assert cities == want_cities
+    for name in SPLITS:
+        for a, b in zip(splits[name], want[name], strict=True):
+            np.testing.assert_array_equal(a, b)
+        lengths = [len(a) for a in want[name]]
+        np.testing.assert_array_equal(index_tables[name], build_window_index(lengths, LOOKBACK, HORIZON))
+    for c in cities:
+        np.testing.assert_array_equal(scalers[c].min_, want_scalers[c].min_)
+        np.testing.assert_array_equal(scalers[c].scale_, want_scalers[c].scale_)
+
+
+def test_source_or_settings_changes_are_misses(csv_path, tmp_path):
+    cache_dir = tmp_path / "cache"
+    assert not cached(csv_path, cache_dir)[-1]
+    assert not cached(csv_path, cache_dir, dtype="float16")[-1]
+
+    with open(csv_path, "a") as f:
+        f.write("city_0000,2030-01-01 00:00:00,1,2,3,4\n")
+    assert not cached(csv_path, cache_dir)[-1]
+    assert cached(csv_path, cache_dir)[-1]
+    assert len(list_entries(str(cache_dir))) == 3
+
+    assert not cached(csv_path, cache_dir, train_frac=0.6, keep=1)[-1]
+    [(_, meta, _)] = list_entries(str(cache_dir))
+    assert meta["train_frac"] == 0.6
+
+
+def test_store_source_ignores_staged_backfill_chunks(history, tmp_path):
+    store = tmp_path / "store"
+    write_history_store(history, str(store))
+    *_, hit = cached(str(store), tmp_path / "cache")
+    assert not hit
+
+    staging = store / "_staging" / "city_0000"
+    os.makedirs(staging)
+    history.head(24).to_parquet(staging / "chunk.parquet")
+    splits, cities, *_, hit = cached(str(store), tmp_path / "cache")
+    assert hit
+    assert cities == sorted(history["city"].unique())
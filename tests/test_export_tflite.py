@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+
+from config import FEATURE_COLS, HORIZON_HOURS, LOOKBACK_HOURS, TFLITE_PATHS
+from export_tflite import PARITY_ATOL, check_parity, export_tflite
+from forecast import forecast_model_version
+from lite_forecast import LiteForecaster
+
+
+@pytest.fixture(scope="module")
+def exported(random_weights_path, tmp_path_factory):
+    """
+    {variant: (tflite_path, keras_model)} exported from the random weights.
+    """
+    out_dir = tmp_path_factory.mktemp("tflite")
+    return {
+        variant: export_tflite(random_weights_path, str(out_dir / f"{variant}.tflite"), variant)
+        for variant in TFLITE_PATHS
+    }
+
+
+@pytest.mark.parametrize("variant", list(TFLITE_PATHS))
+def test_check_parity_within_variant_atol(exported, variant):
+    tflite_path, model = exported[variant]
+    assert check_parity(model, tflite_path, atol=PARITY_ATOL[variant]) <= PARITY_ATOL[variant]
+
+
+def test_check_parity_raises_above_atol(exported):
+    tflite_path, model = exported["dynamic_int8"]
+    with pytest.raises(AssertionError):
+        check_parity(model, tflite_path, atol=0.0)
+
+
+def test_lite_forecaster_batches_row_by_row(exported):
+    tflite_path, model = exported["float32"]
+    X = np.random.default_rng(1).random((3, LOOKBACK_HOURS, len(FEATURE_COLS)), dtype=np.float32)
+
+    y_lite = LiteForecaster(tflite_path).predict_on_batch(X)
+
+    assert y_lite.shape == (3, HORIZON_HOURS)
+    np.testing.assert_allclose(y_lite, model.predict_on_batch(X), rtol=0, atol=PARITY_ATOL["float32"])
+
+
+def test_model_version_follows_the_artifact(exported, random_weights_path):
+    float32_path, _ = exported["float32"]
+    int8_path, _ = exported["dynamic_int8"]
+
+    keras = forecast_model_version("keras", random_weights_path, float32_path)
+    lite = forecast_model_version("tflite", random_weights_path, float32_path)
+    lite_int8 = forecast_model_version("tflite", random_weights_path, int8_path)
+
+    assert len({keras, lite, lite_int8}) == 3
+    assert lite.startswith("tflite-")
+    assert forecast_model_version("numpy", random_weights_path).split("-", 1)[1] == keras.split("-", 1)[1]
@@ -0,0 +1,42 @@
+import threading
+
+import pytest
+
+from forecast_cache import ForecastCache
+
+
+def test_compute_runs_once_for_concurrent_misses():
+    cache = ForecastCache()
+    calls = []
+    started = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.wait(1)
+        return "value"
+
+    threads = [threading.Thread(target=cache.get_or_compute, args=("k", compute)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    started.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert cache.get("k") == "value"
+    assert cache._key_locks == {}
+
+
+def test_failed_compute_releases_its_key_lock():
+    cache = ForecastCache()
+
+    def compute():
+        raise RuntimeError("model not loaded")
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            cache.get_or_compute("k", compute)
+
+    assert cache._key_locks == {}
+    assert cache.get("k") is None
+    assert cache.get_or_compute("k", lambda: "value") == "value"
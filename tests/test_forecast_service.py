@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import pytest
+
+from forecast_cache import ForecastCache
+from forecast_service import ForecastService, create_app
+from lazy_resources import ForecastResources
+
+
+def call(app, method, path, body=b""):
+    """
+    One HTTP request straight through the ASGI app (no server, no HTTP client).
+    Returns (status, decoded JSON body).
+    """
+    messages = []
+    delivered = False
+
+    async def receive():
+        nonlocal delivered
+        if delivered:
+            return {"type": "http.disconnect"}
+        delivered = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "scheme": "http",
+        "method": method, "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/json")], "server": ("test", 80), "client": ("test", 1),
+    }
+    asyncio.run(app(scope, receive, send))
+    status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+    payload = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    return status, json.loads(payload)
+
+
+@pytest.fixture(scope="module")
+def app():
+    service = ForecastService(ForecastResources("numpy"), cache=ForecastCache())   # no .forecast_cache on disk
+    return create_app(service, warm_up=False)
+
+
+@pytest.mark.parametrize("body, error", [
+    (b"not json", "Body must be JSON"),
+    (b"[\"delhi\"]", "Body must be a JSON object"),
+    (b"\"delhi\"", "Body must be a JSON object"),
+    (b"{\"cities\": \"delhi\"}", "\"cities\" must be a list of city names"),
+    (b"{\"cities\": [1, 2]}", "\"cities\" must be a list of city names"),
+])
+def test_batch_rejects_malformed_bodies(app, body, error):
+    assert call(app, "POST", "/forecast/batch", body) == (400, {"error": error})
+
+
+def test_batch_unknown_city_is_404(app):
+    assert call(app, "POST", "/forecast/batch", b"{\"cities\": [\"atlantis\"]}")[0] == 404
+
+
+def test_batch_forecasts_the_requested_cities(app):
+    status, payload = call(app, "POST", "/forecast/batch", b"{\"cities\": [\"delhi\", \"mumbai\"]}")
+
+    assert status == 200
+    assert [f["city"] for f in payload["forecasts"]] == ["delhi", "mumbai"]
+    assert all(len(f["pred_temp_c"]) == 168 for f in payload["forecasts"])
+
+
+def test_health_reports_readiness(app):
+    status, payload = call(app, "GET", "/health")
+    assert status == 200
+    assert payload["runtime"] == "numpy" and payload["errors"] == []
+
+
+class _FixedBatchResources(ForecastResources):
+    model = object()
+
+
+@pytest.mark.parametrize("runtime,max_batch", [("tflite", 1), ("numpy", 16)])
+def test_tflite_requests_are_not_micro_batched(runtime, max_batch):
+    service = ForecastService(_FixedBatchResources(runtime), cache=ForecastCache(), max_batch_size=16)
+    try:
+        assert service.model.max_batch_size == max_batch
+    finally:
+        service.model.close()
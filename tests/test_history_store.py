@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+import history_store
+from config import FEATURE_COLS
+from history_store import (
+    ROW_GROUP_HOURS, append_city_history, compact_city_fragments, list_city_fragments,
+    merge_into_partition, read_city_history, read_history_store, store_last_time, write_history_store,
+)
+
+
+def hourly(start, hours, seed=0, city=None):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(hours, len(FEATURE_COLS))).astype(np.float32), columns=FEATURE_COLS)
+    df.insert(0, "time", pd.date_range(start, periods=hours, freq="h"))
+    if city is not None:
+        df["city"] = city
+    return df
+
+
+def expected(*frames):
+    """
+    The rows a store should hold after writing frames in order (later rows win).
+    """
+    df = pd.concat(frames, ignore_index=True).drop_duplicates(subset="time", keep="last")
+    return df.sort_values("time").reset_index(drop=True)[["time"] + FEATURE_COLS]
+
+
+@pytest.fixture
+def store(tmp_path):
+    base = hourly("2024-01-01", 3 * ROW_GROUP_HOURS + 5)
+    write_history_store(pd.concat([base.assign(city="delhi"), hourly("2024-01-01", 48, 1, "pune")]), str(tmp_path))
+    return str(tmp_path), base
+
+
+def test_store_round_trips_and_reads_tails(store):
+    store_dir, base = store
+    df = read_history_store(store_dir)
+
+    assert sorted(df["city"].unique()) == ["delhi", "pune"]
+    pdt.assert_frame_equal(read_city_history(store_dir, "delhi"), expected(base), check_dtype=False)
+    pdt.assert_frame_equal(read_city_history(store_dir, "delhi", tail_hours=100),
+                           expected(base).tail(100).reset_index(drop=True), check_dtype=False)
+    assert store_last_time(store_dir, "delhi") == base["time"].iloc[-1]
+
+
+def test_append_overlap_counts_new_hours_and_newest_wins(store):
+    store_dir, base = store
+    new = hourly(base["time"].iloc[-10], 30, seed=2)
+
+    assert append_city_history(new, store_dir, "delhi") == 20
+    assert len(list_city_fragments(store_dir, "delhi")) == 1
+    pdt.assert_frame_equal(read_city_history(store_dir, "delhi"), expected(base, new), check_dtype=False)
+    assert store_last_time(store_dir, "delhi") == new["time"].iloc[-1]
+
+
+def test_compaction_keeps_rows_and_drops_fragments(store):
+    store_dir, base = store
+    first = hourly(base["time"].iloc[-1] + pd.Timedelta(hours=1), 24, seed=3)
+    second = hourly(first["time"].iloc[12], 24, seed=4)
+    append_city_history(first, store_dir, "delhi")
+    append_city_history(second, store_dir, "delhi")
+    before = read_city_history(store_dir, "delhi")
+
+    assert compact_city_fragments(store_dir, "delhi") == 2
+    assert list_city_fragments(store_dir, "delhi") == []
+    pdt.assert_frame_equal(read_city_history(store_dir, "delhi"), before)
+    pdt.assert_frame_equal(before, expected(base, first, second), check_dtype=False)
+
+
+def test_appends_past_the_limit_are_compacted(store, monkeypatch):
+    store_dir, base = store
+    monkeypatch.setattr(history_store, "MAX_APPEND_FRAGMENTS", 2)
+    frames = [hourly(base["time"].iloc[-1] + pd.Timedelta(hours=1 + 6 * i), 6, seed=10 + i) for i in range(3)]
+    for df in frames:
+        append_city_history(df, store_dir, "delhi")
+
+    assert list_city_fragments(store_dir, "delhi") == []
+    pdt.assert_frame_equal(read_city_history(store_dir, "delhi"), expected(base, *frames), check_dtype=False)
+
+
+def test_merge_streams_disjoint_overlays_into_the_partition(store):
+    store_dir, base = store
+    overlays = [hourly(base["time"].iloc[5], 10, seed=5),
+                hourly(base["time"].iloc[ROW_GROUP_HOURS - 3], 8, seed=6),
+                hourly(base["time"].iloc[-1] + pd.Timedelta(hours=4), 5, seed=7)]
+
+    rows = merge_into_partition(store_dir, "delhi", iter(overlays))
+    want = expected(base, *overlays)
+    assert rows == len(want)
+    pdt.assert_frame_equal(read_city_history(store_dir, "delhi"), want, check_dtype=False)
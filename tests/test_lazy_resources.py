@@ -0,0 +1,33 @@
+import logging
+
+from forecast_service import ForecastService, LocalForecastClient
+from lazy_resources import ForecastResources
+
+
+class BrokenResources(ForecastResources):
+    def warm_up(self):
+        raise FileNotFoundError("weather_lstm_7day.weights.h5")
+
+
+def test_warm_up_failure_is_logged_and_reported(caplog):
+    resources = BrokenResources("numpy")
+    with caplog.at_level(logging.ERROR, logger="lazy_resources"):
+        resources.warm_up_async().join(timeout=10)
+
+    [err] = resources.report.errors()
+    assert err["phase"] == "warm_up"
+    assert err["error"] == "FileNotFoundError: weather_lstm_7day.weights.h5"
+    assert "Background warm-up failed" in caplog.text
+
+    ready, _, errors = LocalForecastClient(ForecastService(resources)).startup_report()
+    assert not ready
+    assert errors == [err]
+
+
+def test_successful_warm_up_has_no_errors():
+    resources = ForecastResources("numpy")
+    resources.warm_up_async().join(timeout=60)
+
+    assert resources.is_ready()
+    assert resources.report.errors() == []
+    assert {"scaler_load", "history_load", "history_index", "model_load"} <= set(resources.report.as_frame()["phase"])
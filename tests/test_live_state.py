@@ -0,0 +1,111 @@
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import FEATURE_COLS, HORIZON_HOURS
+from live_state import CityRingBuffer, LiveForecaster, LiveState, tail_csv
+from scaling import CityScaler
+
+HEADER = ",".join(["time", *FEATURE_COLS, "city"])
+
+
+def row(time, city="delhi", value=1.0):
+    return ",".join([time, *[str(value)] * len(FEATURE_COLS), city])
+
+
+def test_tail_csv_skips_blank_truncated_and_unparsable_lines(tmp_path, caplog):
+    path = tmp_path / "obs.csv"
+    path.write_text("\n".join([
+        HEADER,
+        row("2024-01-01T00:00"),
+        "",
+        "2024-01-01T01:00,1.0,2.0",
+        row("2024-01-01T02:00", value="n/a"),
+        row("2024-01-01T03:00"),
+    ]) + "\n")
+
+    stop = threading.Event()
+    rows = []
+    with caplog.at_level(logging.WARNING, logger="live_state"):
+        for obs in tail_csv(str(path), poll_seconds=0.01, from_start=True, stop=stop):
+            rows.append(obs)
+            if len(rows) == 2:
+                stop.set()
+
+    assert [(c, t) for c, t, _ in rows] == [
+        ("delhi", pd.Timestamp("2024-01-01T00:00")),
+        ("delhi", pd.Timestamp("2024-01-01T03:00")),
+    ]
+    assert rows[0][2] == {c: 1.0 for c in FEATURE_COLS}
+    assert f"3 of {len(FEATURE_COLS) + 2} fields" in caplog.text and "unparsable" in caplog.text
+
+
+class _Model:
+    def predict(self, X, verbose=0):
+        return np.zeros((len(X), HORIZON_HOURS), dtype=np.float32)
+
+
+@pytest.fixture
+def forecaster():
+    n = len(FEATURE_COLS)
+    ring = CityRingBuffer(np.zeros((24, n), dtype=np.float32), "2024-01-01T00:00")
+    state = LiveState({"delhi": ring}, {"delhi": CityScaler(np.zeros(n), np.ones(n))})
+    return LiveForecaster(state, _Model(), lookback_hours=24)
+
+
+def test_run_logs_and_skips_failing_observations(forecaster, caplog):
+    values = {c: 1.0 for c in FEATURE_COLS}
+    source = [
+        ("delhi", "2024-01-01T01:00", values),
+        ("delhi", "2024-01-01T02:00", {"temperature_2m": 1.0}),   # missing features
+        ("delhi", "2024-01-01T03:00", values),
+    ]
+    with caplog.at_level(logging.ERROR, logger="live_state"):
+        forecaster.run(iter(source))
+
+    assert forecaster.errors == 1
+    assert forecaster.state.last_time("delhi") == pd.Timestamp("2024-01-01T03:00")
+    assert "Skipping observation delhi" in caplog.text
+
+
+def test_run_logs_a_failing_source(forecaster, caplog):
+    def source():
+        yield "delhi", "2024-01-01T01:00", {c: 1.0 for c in FEATURE_COLS}
+        raise OSError("feed went away")
+
+    with caplog.at_level(logging.ERROR, logger="live_state"):
+        forecaster.run(source())
+
+    assert forecaster.errors == 1
+    assert forecaster.state.observations == 1
+    assert "ingestion stopped" in caplog.text
+
+
+class _RacyState(LiveState):
+    """
+    Lands a queued observation right before the next window is read, as a
+    concurrent ingest thread could.
+    """
+
+    pending = ()
+
+    def last_window(self, city, lookback_hours=24):
+        for obs in self.pending:
+            self.ingest(*obs)
+        self.pending = ()
+        return super().last_window(city, lookback_hours)
+
+
+def test_cached_forecast_is_keyed_by_the_window_it_used(forecaster):
+    state = forecaster.state
+    state.__class__ = _RacyState
+    state.pending = [("delhi", "2024-01-01T01:00", {c: 1.0 for c in FEATURE_COLS})]
+
+    df_full, _, last_time = forecaster.forecast_city("delhi")
+
+    assert last_time == pd.Timestamp("2024-01-01T01:00")
+    assert df_full["time"].iloc[0] == last_time + pd.Timedelta(hours=1)
+    assert [key[1] for key in forecaster.cache._entries] == [last_time.isoformat()]
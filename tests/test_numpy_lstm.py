@@ -0,0 +1,59 @@
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+
+from config import FEATURE_COLS, HORIZON_HOURS, LOOKBACK_HOURS
+from forecast import load_lstm_model
+from numpy_lstm import NumpyLSTMForecaster, check_parity
+
+ATOL = 1e-4
+
+
+def test_matches_keras_on_random_windows(random_weights_path):
+    X = np.random.default_rng(1).random((5, LOOKBACK_HOURS, len(FEATURE_COLS)), dtype=np.float32)
+
+    y_keras = np.asarray(load_lstm_model(random_weights_path).predict_on_batch(X))
+    y_numpy = NumpyLSTMForecaster(random_weights_path).predict_on_batch(X)
+
+    assert y_numpy.shape == (5, HORIZON_HOURS)
+    np.testing.assert_allclose(y_numpy, y_keras, rtol=0, atol=ATOL)
+
+
+def test_single_window_matches_batch(random_weights_path):
+    engine = NumpyLSTMForecaster(random_weights_path)
+    X = np.random.default_rng(2).random((3, LOOKBACK_HOURS, len(FEATURE_COLS)), dtype=np.float32)
+
+    batch = engine.predict_on_batch(X)
+    for i in range(len(X)):
+        np.testing.assert_allclose(engine.predict_on_batch(X[i:i + 1])[0], batch[i], rtol=0, atol=1e-6)
+
+
+def test_check_parity(random_weights_path):
+    assert check_parity(random_weights_path, atol=ATOL) <= ATOL
+
+
+def test_concurrent_callers_do_not_share_state(random_weights_path):
+    engine = NumpyLSTMForecaster(random_weights_path)
+    rng = np.random.default_rng(3)
+    inputs = [rng.random((2, LOOKBACK_HOURS, len(FEATURE_COLS)), dtype=np.float32) for _ in range(6)]
+    expected = [NumpyLSTMForecaster(random_weights_path).predict_on_batch(X) for X in inputs]
+
+    start = threading.Barrier(len(inputs))
+    results = [None] * len(inputs)
+
+    def run(i):
+        start.wait()
+        for _ in range(3):
+            results[i] = engine.predict_on_batch(inputs[i])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(inputs))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for got, want in zip(results, expected):
+        np.testing.assert_array_equal(got, want)
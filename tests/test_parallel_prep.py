@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from config import FEATURE_COLS
+from parallel_prep import SPLITS, prepare_city_splits_parallel, synthetic_history
+
+
+@pytest.fixture(scope="module")
+def history():
+    # Interleaved rows: the preparation must group and time-sort cities itself
+    return synthetic_history(5, hours=400, seed=3).sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def assert_same_prep(got, want):
+    splits, cities, scalers = got
+    want_splits, want_cities, want_scalers = want
+    assert cities == want_cities
+    for name in SPLITS:
+        for a, b in zip(splits[name], want_splits[name], strict=True):
+            np.testing.assert_array_equal(a, b)
+    for c in cities:
+        np.testing.assert_array_equal(scalers[c].min_, want_scalers[c].min_)
+        np.testing.assert_array_equal(scalers[c].scale_, want_scalers[c].scale_)
+
+
+def test_pool_matches_serial_prepare_city_splits(history, tmp_path):
+    pytest.importorskip("tensorflow")
+    from data_pipeline import prepare_city_splits
+
+    serial = prepare_city_splits(history, FEATURE_COLS)
+    assert_same_prep(prepare_city_splits_parallel(history, max_workers=2, workdir=str(tmp_path)), serial)
+
+
+def test_in_process_path_matches_the_pool(history, tmp_path):
+    pooled = prepare_city_splits_parallel(history, max_workers=2, workdir=str(tmp_path / "pool"))
+    in_process = prepare_city_splits_parallel(history, max_workers=1, workdir=str(tmp_path / "serial"))
+
+    assert_same_prep(in_process, pooled)
+    train = in_process[0]["train"][0]
+    assert isinstance(train.base, np.memmap) and not train.flags.writeable
+    assert not (tmp_path / "serial" / "raw.npy").exists()
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from config import FEATURE_COLS, HORIZON_HOURS, LOOKBACK_HOURS, TARGET_COL
+from forecast import build_last_windows, forecast_cities
+from rolling_forecast import fill_exogenous, rollout, rolling_forecast_cities
+from scaling import fit_city_scalers
+
+TARGET = FEATURE_COLS.index(TARGET_COL)
+
+
+class LinearModel:
+    """
+    A fixed random linear map of the whole window, so every input value matters.
+    """
+
+    def __init__(self, seed=0):
+        rng = np.random.default_rng(seed)
+        self.W = rng.normal(scale=0.01, size=(LOOKBACK_HOURS * len(FEATURE_COLS), HORIZON_HOURS))
+
+    def predict_on_batch(self, X):
+        return np.tanh(np.asarray(X, dtype=np.float64).reshape(len(X), -1) @ self.W).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def history():
+    rng = np.random.default_rng(1)
+    frames = []
+    for city in ["delhi", "mumbai", "pune"]:
+        df = pd.DataFrame(rng.normal(size=(LOOKBACK_HOURS + 200, len(FEATURE_COLS))), columns=FEATURE_COLS)
+        df.insert(0, "time", pd.date_range("2024-01-01", periods=len(df), freq="h"))
+        df["city"] = city
+        frames.append(df)
+    df = pd.concat(frames, ignore_index=True)
+    return df, fit_city_scalers(df)
+
+
+def test_first_week_matches_forecast_cities(history):
+    df, scalers = history
+    model = LinearModel()
+    direct = forecast_cities(model, df, scalers)
+
+    pdt.assert_frame_equal(rolling_forecast_cities(model, df, scalers, days=7), direct)
+    rolled = rolling_forecast_cities(model, df, scalers, days=14)
+    assert len(rolled) == 3 * 14 * 24
+    first_week = rolled[rolled["hour_ahead"] < HORIZON_HOURS].reset_index(drop=True)
+    pdt.assert_frame_equal(first_week, direct)
+
+
+@pytest.mark.parametrize("fill", ["last_day", "persistence", "window_mean"])
+def test_rollout_matches_a_step_by_step_loop(history, fill):
+    df, scalers = history
+    model = LinearModel(seed=2)
+    X, _ = build_last_windows(df, ["delhi", "pune"], LOOKBACK_HOURS, scalers)
+
+    # Reference: rebuild each step's window from the previous one
+    window, expected = X.copy(), []
+    for _ in range(3):
+        y = model.predict_on_batch(window)
+        expected.append(y)
+        nxt = np.empty((len(X), LOOKBACK_HOURS + HORIZON_HOURS, len(FEATURE_COLS)), dtype=np.float32)
+        nxt[:, :LOOKBACK_HOURS] = window
+        fill_exogenous(nxt, LOOKBACK_HOURS, HORIZON_HOURS, TARGET, fill)
+        nxt[:, LOOKBACK_HOURS:, TARGET] = y
+        window = nxt[:, HORIZON_HOURS:]
+
+    out = rollout(model, X, 3 * HORIZON_HOURS - 10, TARGET, fill)
+    np.testing.assert_allclose(out, np.concatenate(expected, axis=1)[:, :3 * HORIZON_HOURS - 10], rtol=1e-6)
+
+
+def test_fill_policies():
+    buf = np.arange(2 * 60 * 2, dtype=np.float32).reshape(2, 60, 2)
+    filled = buf.copy()
+    fill_exogenous(filled, 48, 12, target_index=0, policy="last_day", lookback=48)
+    np.testing.assert_array_equal(filled[:, 48:60, 1], buf[:, 24:36, 1])
+
+    fill_exogenous(filled, 48, 12, target_index=0, policy="persistence", lookback=48)
+    np.testing.assert_array_equal(filled[:, 48:60, 1], np.repeat(buf[:, 47:48, 1], 12, axis=1))
+    np.testing.assert_array_equal(filled[:, :, 0], buf[:, :, 0])
+
+    with pytest.raises(ValueError, match="Unknown fill policy"):
+        fill_exogenous(filled, 48, 12, target_index=0, policy="zeros")
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+sklearn_preprocessing = pytest.importorskip("sklearn.preprocessing")
+
+from config import FEATURE_COLS, TARGET_COL
+from scaling import (
+    CityScaler, fit_city_scalers, inverse_scale_targets, load_city_scalers, save_city_scalers,
+)
+
+
+def history(seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, city in enumerate(["delhi", "mumbai", "pune"]):
+        df = pd.DataFrame(rng.normal(size=(100, len(FEATURE_COLS))) * (i + 1) + 10 * i, columns=FEATURE_COLS)
+        df["time"] = pd.date_range("2024-01-01", periods=100, freq="h")
+        df["city"] = city
+        frames.append(df.sample(frac=1, random_state=i))  # fitting must sort by time itself
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_city_scaler_matches_minmaxscaler():
+    values = np.random.default_rng(1).normal(size=(50, 4))
+    values[:, 2] = 3.0  # constant column: sklearn scales it by 1
+    ref = sklearn_preprocessing.MinMaxScaler().fit(values)
+    scaler = CityScaler.fit(values)
+
+    np.testing.assert_allclose(scaler.transform(values), ref.transform(values))
+    np.testing.assert_allclose(scaler.inverse_transform(ref.transform(values)), values)
+
+
+def test_scalers_are_fit_on_the_train_split_and_round_trip(tmp_path):
+    df = history()
+    scalers = fit_city_scalers(df)
+    delhi = df[df["city"] == "delhi"].sort_values("time")[FEATURE_COLS].to_numpy()
+    ref = sklearn_preprocessing.MinMaxScaler().fit(delhi[:70])
+    np.testing.assert_allclose(scalers["delhi"].min_, ref.min_)
+    np.testing.assert_allclose(scalers["delhi"].scale_, ref.scale_)
+
+    path = str(tmp_path / "scalers.json")
+    save_city_scalers(scalers, path)
+    loaded = load_city_scalers(path)
+    assert sorted(loaded) == ["delhi", "mumbai", "pune"]
+    for c in scalers:
+        np.testing.assert_array_equal(loaded[c].min_, scalers[c].min_)
+        np.testing.assert_array_equal(loaded[c].scale_, scalers[c].scale_)
+
+    with pytest.raises(ValueError, match="scalers were fit on"):
+        load_city_scalers(path, feature_cols=FEATURE_COLS[::-1])
+
+
+def test_batched_inverse_scaling_matches_per_row_inverse():
+    scalers = fit_city_scalers(history())
+    cities = ["pune", "delhi", "pune", "mumbai"]
+    rng = np.random.default_rng(2)
+    target = FEATURE_COLS.index(TARGET_COL)
+
+    y = rng.random((len(cities), 24))
+    for row, c, out in zip(y, cities, inverse_scale_targets(y, scalers, cities)):
+        dummy = np.zeros((24, len(FEATURE_COLS)))
+        dummy[:, target] = row
+        np.testing.assert_allclose(out, scalers[c].inverse_transform(dummy)[:, target])
+
+    y_multi = rng.random((len(cities), 24, len(FEATURE_COLS)))
+    out = inverse_scale_targets(y_multi, scalers, cities, target_cols=FEATURE_COLS)
+    for i, c in enumerate(cities):
+        np.testing.assert_allclose(out[i], scalers[c].inverse_transform(y_multi[i]))
@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from config import FEATURE_COLS
+from history_store import read_city_history, write_city_partition
+from openmeteo_stub import start_stub_server
+from weather_api import CITIES, fetch_hourly_history, sync_city_history
+
+CITY = "delhi"
+END = date(2024, 6, 30)
+DAYS = 10
+
+
+@pytest.fixture(scope="module")
+def archive_url():
+    server, base_url = start_stub_server()
+    yield f"{base_url}/v1/archive"
+    server.shutdown()
+
+
+def sync(store_dir, url, end=END):
+    return sync_city_history(CITY, CITIES[CITY], str(store_dir), days=DAYS, end=end, url=url)
+
+
+def stored(store_dir):
+    return read_city_history(str(store_dir), CITY)
+
+
+def test_first_sync_fetches_full_history(tmp_path, archive_url):
+    added = sync(tmp_path, archive_url)
+
+    df = stored(tmp_path)
+    assert added == len(df) == (DAYS + 1) * 24
+    assert df["time"].iloc[0] == pd.Timestamp(END - timedelta(days=DAYS))
+    assert df["time"].iloc[-1] == pd.Timestamp(END) + pd.Timedelta(hours=23)
+    assert df["time"].is_monotonic_increasing and df["time"].is_unique
+
+
+def test_resync_without_new_days_adds_nothing(tmp_path, archive_url):
+    sync(tmp_path, archive_url)
+    before = stored(tmp_path)
+
+    assert sync(tmp_path, archive_url) == 0
+    assert sync(tmp_path, archive_url) == 0
+
+    after = stored(tmp_path)
+    assert after["time"].is_unique
+    pd.testing.assert_frame_equal(after, before)
+
+
+def test_resync_appends_only_new_days(tmp_path, archive_url):
+    sync(tmp_path, archive_url)
+
+    assert sync(tmp_path, archive_url, end=END + timedelta(days=2)) == 2 * 24
+
+    df = stored(tmp_path)
+    assert len(df) == (DAYS + 3) * 24
+    assert df["time"].is_unique
+
+
+def test_partial_last_day_is_refetched(tmp_path, archive_url):
+    sync(tmp_path, archive_url)
+    full = stored(tmp_path)
+    # The archive had only the first half of the last day at the previous sync
+    cutoff = pd.Timestamp(END) + pd.Timedelta(hours=12)
+    write_city_partition(full[full["time"] < cutoff], str(tmp_path), CITY)
+
+    assert sync(tmp_path, archive_url) == 12
+
+    df = stored(tmp_path)
+    pd.testing.assert_frame_equal(df, full)
+    expected = fetch_hourly_history(**CITIES[CITY], start_date=END.isoformat(), end_date=END.isoformat(),
+                                    url=archive_url)
+    last_day = df[df["time"] >= pd.Timestamp(END)].set_index("time")[FEATURE_COLS]
+    pd.testing.assert_frame_equal(last_day, expected[FEATURE_COLS].astype("float32"), check_names=False,
+                                  check_freq=False)
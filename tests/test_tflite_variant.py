@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import config
+from forecast import forecast_model_version, load_forecast_model
+assert config.TFLITE_VARIANT == "int4"
+print(forecast_model_version("numpy"))
+load_forecast_model("tflite")
+"""
+
+
+def test_bad_variant_only_breaks_the_tflite_runtime():
+    env = dict(os.environ, WEATHERLENS_TFLITE="int4")
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+
+    assert result.returncode != 0
+    assert result.stdout.startswith("numpy-")
+    assert "ValueError: WEATHERLENS_TFLITE='int4' is not a TFLite variant" in result.stderr
+
+
+def test_tflite_path_names_the_choices():
+    from lite_forecast import tflite_path
+
+    assert tflite_path("float16").endswith(".tflite")
+    with pytest.raises(ValueError, match="float32, float16, dynamic_int8"):
+        tflite_path("int4")
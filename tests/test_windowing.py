@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from windowing import build_window_index, create_city_windows, iter_window_batches, window_views
+
+FEATURES = ["a", "b", "c"]
+
+
+def loop_windows(city_df, lookback, horizon, feature_cols, target_col):
+    """
+    The Python-loop create_city_windows from main.ipynb, kept as the reference.
+    """
+    values = city_df[feature_cols].values
+    target = city_df[target_col].values
+    X_list, y_list = [], []
+    for start in range(len(city_df) - lookback - horizon + 1):
+        X_list.append(values[start:start + lookback])
+        y_list.append(target[start + lookback:start + lookback + horizon])
+    return np.array(X_list), np.array(y_list)
+
+
+@pytest.fixture
+def city_df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.normal(size=(200, len(FEATURES))), columns=FEATURES)
+
+
+@pytest.mark.parametrize("lookback,horizon", [(24, 12), (1, 1), (150, 50)])
+def test_strided_windows_match_the_loop(city_df, lookback, horizon):
+    X, y = create_city_windows(city_df, lookback, horizon, FEATURES, "a")
+    X_ref, y_ref = loop_windows(city_df, lookback, horizon, FEATURES, "a")
+
+    np.testing.assert_array_equal(X, X_ref)
+    np.testing.assert_array_equal(y, y_ref)
+
+
+def test_multi_target_windows_match_the_loop(city_df):
+    X, y = create_city_windows(city_df, 24, 12, FEATURES, FEATURES)
+    _, y_ref = loop_windows(city_df, 24, 12, FEATURES, FEATURES)
+
+    assert y.shape == (len(X), 12, len(FEATURES))
+    np.testing.assert_array_equal(y, y_ref)
+
+
+def test_windows_are_views_and_short_series_are_empty(city_df):
+    values = city_df[FEATURES].to_numpy()
+    X, y = window_views(values, values[:, 0], 24, 12)
+    assert np.shares_memory(X, values)
+
+    X, y = window_views(values[:30], values[:30, 0], 24, 12)
+    assert X.shape == (0, 24, len(FEATURES)) and y.shape == (0, 12)
+
+
+def test_batches_and_index_cover_every_window(city_df):
+    values = city_df[FEATURES].to_numpy()
+    X, y = window_views(values, values[:, 0], 24, 12)
+
+    batches = list(iter_window_batches(values, values[:, 0], 24, 12, batch_size=50))
+    np.testing.assert_array_equal(np.concatenate([b[0] for b in batches]), X)
+    np.testing.assert_array_equal(np.concatenate([b[1] for b in batches]), y)
+
+    index = build_window_index([200, 30, 50], 24, 12)
+    assert index.tolist() == [[0, s] for s in range(165)] + [[2, s] for s in range(15)]
@@ -0,0 +1,155 @@
+import argparse
+import os
+
+import pandas as pd
+import tensorflow as tf
+
+from config import (
+    FEATURE_COLS, TARGET_COL, LOOKBACK_HOURS, HORIZON_HOURS,
+    HISTORY_CSV, WEIGHTS_PATH, SCALERS_PATH, CHECKPOINT_PATH,
+    MULTI_TARGET_COLS, MULTI_WEIGHTS_PATH, MULTI_CHECKPOINT_PATH, DATASET_CACHE_DIR,
+)
+from backtest import backtest, print_summary, write_report
+from data_pipeline import make_split_datasets, make_datasets_from_splits
+from dataset_cache import cached_city_splits
+from lstm_model import build_lstm_model
+from scaling import save_city_scalers
+
+# ============================
+# 1. Streaming training run 🏋️
+# ============================
+
+def train(csv_path=HISTORY_CSV, epochs=50, batch_size=64, dtype="float32",
+          weights_out=WEIGHTS_PATH, scalers_out=SCALERS_PATH, checkpoint_path=CHECKPOINT_PATH,
+          seed=None, train_frac=0.7, val_frac=0.15, multi_output=False, prep_workers=None,
+          dataset_cache_dir=DATASET_CACHE_DIR, backtest_out=None):
+    """
+    Train build_lstm_model on windows streamed from the per-city scaled arrays.
+    Same optimizer, loss, callbacks and batch size as the notebook, but the
+    windowed X_train/y_train tensors are never materialized.
+    multi_output=True trains the variant forecasting every MULTI_TARGET_COLS
+    variable at once (y: (B, horizon, num_targets), loss averaged over all of them).
+    prep_workers: split/scale cities in that many processes (see parallel_prep.py).
+    dataset_cache_dir: memory-map the prepared splits from this cache when the
+    CSV and settings are unchanged (see dataset_cache.py), skipping preparation;
+    the splits are still loaded into memory for training. None re-prepares every run.
+    backtest_out: also replay the test split with backtest.py and write its
+    summary JSON here (and the city x horizon-hour table next to it as CSV).
+    """
+    target_col = list(MULTI_TARGET_COLS) if multi_output else TARGET_COL
+    num_targets = len(MULTI_TARGET_COLS) if multi_output else None
+
+    if dataset_cache_dir:
+        splits, _, scalers, index_tables, hit = cached_city_splits(
+            csv_path, FEATURE_COLS, LOOKBACK_HOURS, HORIZON_HOURS, train_frac, val_frac,
+            dtype, dataset_cache_dir, workers=prep_workers or 1,
+        )
+        print(f"{'✅ Mapped cached' if hit else '🛠️ Prepared and cached'} dataset ({dataset_cache_dir})")
+        datasets = make_datasets_from_splits(
+            splits, LOOKBACK_HOURS, HORIZON_HOURS, FEATURE_COLS, target_col,
+            batch_size, dtype, seed, index_tables,
+        )
+    else:
+        df = pd.read_csv(csv_path, parse_dates=["time"])
+        df = df.sort_values(["city", "time"]).reset_index(drop=True)
+
+        datasets, scalers = make_split_datasets(
+            df, LOOKBACK_HOURS, HORIZON_HOURS,
+            feature_cols=FEATURE_COLS,
+            target_col=target_col,
+            batch_size=batch_size,
+            dtype=dtype,
+            train_frac=train_frac,
+            val_frac=val_frac,
+            seed=seed,
+            workers=prep_workers,
+        )
+
+    model = build_lstm_model(LOOKBACK_HOURS, len(FEATURE_COLS), HORIZON_HOURS, num_targets)
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3),
+        loss="mse",
+        metrics=["mae"]
+    )
+
+    callbacks = [
+        tf.keras.callbacks.EarlyStopping(
+            monitor="val_loss",
+            patience=5,
+            restore_best_weights=True
+        )
+    ]
+    if checkpoint_path:
+        callbacks.append(tf.keras.callbacks.ModelCheckpoint(
+            checkpoint_path,
+            save_best_only=True,
+            monitor="val_loss",
+            mode="min"
+        ))
+
+    history = model.fit(
+        datasets["train"],
+        validation_data=datasets["val"],
+        epochs=epochs,
+        callbacks=callbacks,
+        verbose=1
+    )
+
+    test_loss, test_mae = model.evaluate(datasets["test"], verbose=1)
+    print("Test MSE:", test_loss)
+    print("Test MAE:", test_mae)
+
+    if weights_out:
+        model.save_weights(weights_out)
+        print(f"✅ Weights saved as {weights_out}")
+    if scalers_out:
+        # Same train-split scalers the windows were built with, for the app to load
+        save_city_scalers(scalers, scalers_out, FEATURE_COLS, train_frac)
+        print(f"✅ Scalers saved as {scalers_out}")
+    if backtest_out and not multi_output:
+        per_hour, summary = backtest(
+            model, pd.read_csv(csv_path, parse_dates=["time"]), scalers, "test",
+            train_frac=train_frac, val_frac=val_frac,
+        )
+        print_summary(summary)
+        write_report(per_hour, summary, backtest_out, os.path.splitext(backtest_out)[0] + ".csv")
+    return model, history, scalers
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the 7-day LSTM with a streaming tf.data pipeline.")
+    parser.add_argument("--csv", default=HISTORY_CSV)
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32",
+                        help="In-memory dtype of the scaled feature series")
+    parser.add_argument("--multi-output", action="store_true",
+                        help="Forecast all FEATURE_COLS in one pass (saves to the multi-output weights path)")
+    parser.add_argument("--weights-out", default=None)
+    parser.add_argument("--scalers-out", default=SCALERS_PATH)
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--prep-workers", type=int, default=None,
+                        help="Processes for per-city split/scaling (default: serial)")
+    parser.add_argument("--no-dataset-cache", action="store_true",
+                        help="Re-prepare the dataset instead of mapping it from the cache")
+    parser.add_argument("--backtest-out", default=None,
+                        help="Backtest the trained model on the test split; summary JSON here (single-output only)")
+    args = parser.parse_args()
+    weights_out = args.weights_out or (MULTI_WEIGHTS_PATH if args.multi_output else WEIGHTS_PATH)
+    checkpoint = args.checkpoint or (MULTI_CHECKPOINT_PATH if args.multi_output else CHECKPOINT_PATH)
+
+    train(
+        csv_path=args.csv,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        dtype=args.dtype,
+        weights_out=weights_out,
+        scalers_out=args.scalers_out,
+        checkpoint_path=checkpoint,
+        seed=args.seed,
+        multi_output=args.multi_output,
+        prep_workers=args.prep_workers,
+        dataset_cache_dir=None if args.no_dataset_cache else DATASET_CACHE_DIR,
+        backtest_out=args.backtest_out,
+    )
@@ -0,0 +1,177 @@
+"""
+Where does training time go? Profiles the train.py pipeline and sweeps CPU settings.
+
+    python train_profile.py --batch-sizes 32 64 128 --intra-threads 0 4 --steps 20 --out prof.json
+
+Every (batch size, intra-op threads, inter-op threads) point runs in a fresh
+process (TensorFlow fixes its thread pools at start-up) and reports:
+  prep        CSV load, split + scaling, window index / dataset build
+  pipeline    ms per batch produced by the tf.data pipeline alone
+  compute     ms per train step on one fixed in-memory batch (no input pipeline)
+  fit         ms per step of the real model.fit loop, and the gap between steps
+  stall       fit step - compute step (+ gap): input wait plus fit-loop overhead;
+              when pipeline is far below it, the input side is not the bottleneck
+  throughput  samples/s and the implied time per epoch
+  memory      RSS after the run and the process high-water mark
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from mem_usage import peak_rss_mb, rss_mb
+
+# ============================
+# 1. One profiled configuration 🔬
+# ============================
+
+def profile_config(csv_path, batch_size=64, steps=20, warmup=3, dtype="float32",
+                   intra_threads=0, inter_threads=0, seed=0):
+    """
+    Profile one configuration in this process. Thread settings only take
+    effect if TensorFlow has not run anything yet.
+    """
+    import pandas as pd
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(intra_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_threads)
+
+    from config import FEATURE_COLS, TARGET_COL, LOOKBACK_HOURS, HORIZON_HOURS
+    from data_pipeline import prepare_city_splits, make_window_dataset
+    from lstm_model import build_lstm_model
+    from windowing import build_window_index
+
+    result = {
+        "batch_size": batch_size,
+        "intra_threads": intra_threads,
+        "inter_threads": inter_threads,
+        "dtype": dtype,
+    }
+
+    # ---- prep ----
+    t0 = time.perf_counter()
+    df = pd.read_csv(csv_path, parse_dates=["time"]).sort_values(["city", "time"]).reset_index(drop=True)
+    t1 = time.perf_counter()
+    splits, _, _ = prepare_city_splits(df, FEATURE_COLS, dtype=np.dtype(dtype))
+    t2 = time.perf_counter()
+    train_ds = make_window_dataset(
+        splits["train"], LOOKBACK_HOURS, HORIZON_HOURS,
+        target_index=FEATURE_COLS.index(TARGET_COL),
+        batch_size=batch_size, shuffle=True, seed=seed, dtype=dtype,
+    )
+    t3 = time.perf_counter()
+    n_windows = len(build_window_index([len(a) for a in splits["train"]], LOOKBACK_HOURS, HORIZON_HOURS))
+    result["prep_s"] = {"load_csv": t1 - t0, "split_scale": t2 - t1, "windowing": t3 - t2}
+    result["train_windows"] = n_windows
+    result["steps_per_epoch"] = int(np.ceil(n_windows / batch_size))
+
+    # ---- input pipeline alone ----
+    it = iter(train_ds.repeat())
+    for _ in range(warmup):
+        X_fixed, y_fixed = next(it)
+    times = []
+    for _ in range(steps):
+        t0 = time.perf_counter()
+        next(it)
+        times.append(time.perf_counter() - t0)
+    result["pipeline_ms_per_batch"] = 1000.0 * float(np.median(times))
+
+    # ---- compute alone (fixed batch) ----
+    model = build_lstm_model(LOOKBACK_HOURS, len(FEATURE_COLS), HORIZON_HOURS)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3), loss="mse", metrics=["mae"])
+    for _ in range(warmup):
+        model.train_on_batch(X_fixed, y_fixed)
+    times = []
+    for _ in range(steps):
+        t0 = time.perf_counter()
+        model.train_on_batch(X_fixed, y_fixed)
+        times.append(time.perf_counter() - t0)
+    result["compute_ms_per_step"] = 1000.0 * float(np.median(times))
+
+    # ---- real fit loop ----
+    class StepTimer(tf.keras.callbacks.Callback):
+        def __init__(self):
+            super().__init__()
+            self.steps, self.gaps, self._begin, self._end = [], [], None, None
+
+        def on_train_batch_begin(self, batch, logs=None):
+            self._begin = time.perf_counter()
+            if self._end is not None:
+                self.gaps.append(self._begin - self._end)
+
+        def on_train_batch_end(self, batch, logs=None):
+            self._end = time.perf_counter()
+            self.steps.append(self._end - self._begin)
+
+    timer = StepTimer()
+    model.fit(train_ds.take(warmup + steps), epochs=1, callbacks=[timer], verbose=0)
+    fit_step = 1000.0 * float(np.median(timer.steps[warmup:]))
+    gap = 1000.0 * float(np.median(timer.gaps[warmup:])) if len(timer.gaps) > warmup else 0.0
+
+    result["fit_ms_per_step"] = fit_step
+    result["fit_gap_ms"] = gap
+    result["stall_ms_per_step"] = max(fit_step - result["compute_ms_per_step"], 0.0) + gap
+    result["samples_per_s"] = batch_size / ((fit_step + gap) / 1000.0)
+    result["epoch_estimate_s"] = result["steps_per_epoch"] * (fit_step + gap) / 1000.0
+    result["rss_mb"] = rss_mb()
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+# ============================
+# 2. Sweep (one process per point) 🧹
+# ============================
+
+def sweep(csv_path, batch_sizes, intra_threads, inter_threads, steps=20, dtype="float32"):
+    results = []
+    for bs in batch_sizes:
+        for intra in intra_threads:
+            for inter in inter_threads:
+                out = subprocess.run(
+                    [sys.executable, __file__, "--child", "--csv", csv_path,
+                     "--batch-sizes", str(bs), "--intra-threads", str(intra),
+                     "--inter-threads", str(inter), "--steps", str(steps), "--dtype", dtype],
+                    capture_output=True, text=True, check=True,
+                )
+                result = json.loads(out.stdout.strip().splitlines()[-1])
+                results.append(result)
+                print(
+                    f"batch={bs:4d} intra={intra:2d} inter={inter:2d} | "
+                    f"step {result['fit_ms_per_step']:7.1f} ms (compute {result['compute_ms_per_step']:7.1f}, "
+                    f"stall {result['stall_ms_per_step']:6.1f}) | pipeline {result['pipeline_ms_per_batch']:6.1f} ms | "
+                    f"{result['samples_per_s']:7.1f} samples/s | epoch ~{result['epoch_estimate_s']:6.1f} s | "
+                    f"peak {result['peak_rss_mb']:.0f} MB",
+                    flush=True,
+                )
+    return results
+
+
+if __name__ == "__main__":
+    from config import HISTORY_CSV
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=HISTORY_CSV)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--intra-threads", type=int, nargs="+", default=[0], help="0 = TensorFlow default")
+    parser.add_argument("--inter-threads", type=int, nargs="+", default=[0], help="0 = TensorFlow default")
+    parser.add_argument("--steps", type=int, default=20, help="Timed steps per measurement")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    parser.add_argument("--out", default=None, help="Write results as JSON here")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(profile_config(
+            args.csv, args.batch_sizes[0], args.steps, dtype=args.dtype,
+            intra_threads=args.intra_threads[0], inter_threads=args.inter_threads[0],
+        )))
+        sys.exit(0)
+
+    results = sweep(args.csv, args.batch_sizes, args.intra_threads, args.inter_threads, args.steps, args.dtype)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Saved: {args.out}")
@@ -1,7 +1,16 @@
-import requests
+import argparse
 import pandas as pd
 from datetime import date, timedelta
 
+from config import FEATURE_COLS, HISTORY_CSV, HISTORY_STORE_DIR
+from fetch_engine import FetchEngine, default_engine
+from history_store import (
+    write_history_store, read_history_store, store_last_time, append_city_history,
+)
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"  # Historical API
+
 # ============================
 # 1. City configuration 🌍
 # ============================
@@ -17,12 +26,12 @@ CITIES = {
 # 2. Fetch hourly forecast (for testing only) ⏱️
 # ============================
 
-def fetch_hourly_forecast(lat, lon, forecast_days=7, timezone="auto"):
+def fetch_hourly_forecast(lat, lon, forecast_days=7, timezone="auto", url=FORECAST_URL, engine=None):
     """
     Fetch hourly forecast data (up to several days ahead) from Open-Meteo.
     Useful to quickly inspect structure; not used for training history.
+    engine: FetchEngine to use (pooled session, retries, timeouts); defaults to a shared one.
     """
-    url = "https://api.open-meteo.com/v1/forecast"
     params = {
         "latitude": lat,
         "longitude": lon,
@@ -37,9 +46,7 @@ def fetch_hourly_forecast(lat, lon, forecast_days=7, timezone="auto"):
         "models": "best_match",  # Let Open-Meteo auto-select model
     }
 
-    r = requests.get(url, params=params)
-    r.raise_for_status()
-    data = r.json()
+    data = (engine or default_engine()).get_json(url, params)
 
     hourly = pd.DataFrame(data["hourly"])
     hourly["time"] = pd.to_datetime(hourly["time"])
@@ -50,12 +57,12 @@ def fetch_hourly_forecast(lat, lon, forecast_days=7, timezone="auto"):
 # 3. Fetch historical hourly data (for training) 📜
 # ============================
 
-def fetch_hourly_history(lat, lon, start_date, end_date, timezone="auto"):
+def fetch_hourly_history(lat, lon, start_date, end_date, timezone="auto", url=ARCHIVE_URL, engine=None):
     """
     Fetch historical hourly weather data from Open-Meteo Historical Weather API.
     Dates are strings in 'YYYY-MM-DD' format.
+    engine: FetchEngine to use (pooled session, retries, timeouts); defaults to a shared one.
     """
-    url = "https://archive-api.open-meteo.com/v1/archive"  # Historical API
     params = {
         "latitude": lat,
         "longitude": lon,
@@ -70,9 +77,7 @@ def fetch_hourly_history(lat, lon, start_date, end_date, timezone="auto"):
         "timezone": timezone,
     }
 
-    r = requests.get(url, params=params)
-    r.raise_for_status()
-    data = r.json()
+    data = (engine or default_engine()).get_json(url, params)
 
     hourly = pd.DataFrame(data["hourly"])
     hourly["time"] = pd.to_datetime(hourly["time"])
@@ -83,37 +88,107 @@ def fetch_hourly_history(lat, lon, start_date, end_date, timezone="auto"):
 # 4. Fetch for all cities and save CSV 💾
 # ============================
 
-def fetch_all_cities_history(cities, days=365):
+def fetch_all_cities_history(cities, days=365, url=ARCHIVE_URL, engine=None):
     """
     Fetch historical hourly weather for multiple cities and combine into one DataFrame.
+    Cities are fetched concurrently, up to engine.max_workers at a time.
     """
+    engine = engine or default_engine()
     end = date.today()
     start = end - timedelta(days=days)
 
-    all_frames = []
-    for name, loc in cities.items():
+    def fetch_city(item):
+        name, loc = item
         print(f"Fetching {days} days of history for {name}...")
         df_city = fetch_hourly_history(
             lat=loc["lat"],
             lon=loc["lon"],
             start_date=start.isoformat(),
             end_date=end.isoformat(),
+            url=url,
+            engine=engine,
         )
         df_city["city"] = name
-        all_frames.append(df_city)
+        return df_city
+
+    all_frames = engine.map(fetch_city, cities.items())
 
     full_df = pd.concat(all_frames)
     full_df.reset_index(inplace=True)
     full_df.rename(columns={"index": "time"}, inplace=True)
     return full_df
 
+# ============================
+# 5. Incremental sync into the history store 🔄
+# ============================
+
+def sync_city_history(name, loc, store_dir=HISTORY_STORE_DIR, days=365, end=None, url=ARCHIVE_URL,
+                      engine=None):
+    """
+    Fetch only the hours missing from a city's partition and append them.
+    A city with no partition yet gets the full `days` of history.
+    The last stored day is refetched so a partially filled day gets completed;
+    rows are deduplicated on (city, time) by the store.
+    Returns the number of new hourly rows.
+    """
+    end = end or date.today()
+    last_time = store_last_time(store_dir, name)
+    start = end - timedelta(days=days) if last_time is None else last_time.date()
+    if start > end:
+        return 0
+
+    df_city = fetch_hourly_history(
+        lat=loc["lat"],
+        lon=loc["lon"],
+        start_date=start.isoformat(),
+        end_date=end.isoformat(),
+        url=url,
+        engine=engine,
+    )
+    # The archive lags a few days behind; trailing hours come back as nulls
+    df_city = df_city.dropna(subset=FEATURE_COLS).reset_index()
+    return append_city_history(df_city, store_dir, name)
+
+def sync_all_cities_history(cities, store_dir=HISTORY_STORE_DIR, days=365, end=None, url=ARCHIVE_URL,
+                            engine=None):
+    """
+    Incremental refresh of every city (concurrently); returns {city: new_rows}.
+    """
+    engine = engine or default_engine()
+
+    def sync_city(item):
+        name, loc = item
+        n_new = sync_city_history(name, loc, store_dir, days=days, end=end, url=url, engine=engine)
+        print(f"Synced {name}: +{n_new} hours")
+        return name, n_new
+
+    return dict(engine.map(sync_city, cities.items()))
+
 
 if __name__ == "__main__":
-    # 1) Quick test: see one city forecast
+    # Quick test: see one city forecast
     # delhi_forecast = fetch_hourly_forecast(**CITIES["delhi"])
     # print(delhi_forecast.head())
 
-    # 2) Main: fetch history and save
-    history_df = fetch_all_cities_history(CITIES, days=365)
-    history_df.to_csv("weather_hourly_history_openmeteo.csv", index=False)
-    print("✅ Saved: weather_hourly_history_openmeteo.csv")
+    parser = argparse.ArgumentParser(description="Fetch Open-Meteo history into the local store.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only fetch hours missing from the store instead of refetching everything")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--archive-url", default=ARCHIVE_URL)
+    parser.add_argument("--workers", type=int, default=8, help="Cities fetched concurrently")
+    parser.add_argument("--rps", type=float, default=None, help="Max requests per second")
+    args = parser.parse_args()
+
+    engine = FetchEngine(max_workers=args.workers, requests_per_second=args.rps)
+
+    if args.incremental:
+        sync_all_cities_history(CITIES, HISTORY_STORE_DIR, days=args.days, url=args.archive_url,
+                                engine=engine)
+        history_df = read_history_store(HISTORY_STORE_DIR)
+    else:
+        history_df = fetch_all_cities_history(CITIES, days=args.days, url=args.archive_url, engine=engine)
+        write_history_store(history_df, HISTORY_STORE_DIR)
+    print(f"✅ Saved: {HISTORY_STORE_DIR}/ (per-city Parquet)")
+
+    history_df.to_csv(HISTORY_CSV, index=False)  # flat snapshot for main.ipynb
+    print(f"✅ Saved: {HISTORY_CSV}")
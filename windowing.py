@@ -0,0 +1,95 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# ============================
+# 1. Strided window views 🪟
+# ============================
+
+def num_windows(total_len, lookback, horizon):
+    """
+    Number of (lookback, horizon) windows that fit in a series of total_len steps.
+    """
+    return max(total_len - lookback - horizon + 1, 0)
+
+
+def window_views(values, target, lookback, horizon):
+    """
+    Zero-copy sliding windows over one city's arrays.
+
+    values: (T, num_features) time-sorted features
+    target: (T,) or (T, num_targets) time-sorted target(s)
+    Returns read-only views that share memory with the inputs:
+      X: (N, lookback, num_features)
+      y: (N, horizon) or (N, horizon, num_targets)
+    """
+    values = np.asarray(values)
+    target = np.asarray(target)
+    n = num_windows(len(values), lookback, horizon)
+
+    if n == 0:
+        X = np.empty((0, lookback) + values.shape[1:], dtype=values.dtype)
+        y = np.empty((0, horizon) + target.shape[1:], dtype=target.dtype)
+        return X, y
+
+    # sliding_window_view puts the window axis last: (N, F, lookback) -> (N, lookback, F)
+    X = sliding_window_view(values, lookback, axis=0)[:n]
+    X = np.moveaxis(X, -1, 1)
+
+    y = sliding_window_view(target[lookback:], horizon, axis=0)[:n]
+    y = np.moveaxis(y, -1, 1)
+    return X, y
+
+
+def create_city_windows(city_df, lookback, horizon, feature_cols, target_col):
+    """
+    city_df: one city's time-sorted DataFrame
+    target_col: a column name, or a list of names for multi-target windows
+    Returns X, y strided views for that city (see window_views).
+    """
+    values = city_df[feature_cols].to_numpy()
+    target = city_df[target_col].to_numpy()
+    return window_views(values, target, lookback, horizon)
+
+# ============================
+# 2. Multi-city window index 🗂️
+# ============================
+
+def build_window_index(city_lengths, lookback, horizon):
+    """
+    Flat (city_id, start) table over several cities' series.
+    city_lengths: sequence of per-city series lengths, in city_id order.
+    Returns an int64 array of shape (total_windows, 2).
+    """
+    parts = []
+    for city_id, total_len in enumerate(city_lengths):
+        n = num_windows(total_len, lookback, horizon)
+        part = np.empty((n, 2), dtype=np.int64)
+        part[:, 0] = city_id
+        part[:, 1] = np.arange(n)
+        parts.append(part)
+    if not parts:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.concatenate(parts, axis=0)
+
+# ============================
+# 3. Lazy batch generator 🔁
+# ============================
+
+def iter_window_batches(values, target, lookback, horizon,
+                        batch_size=64, shuffle=False, seed=None, dtype=None):
+    """
+    Yield (X_batch, y_batch) copies of batch_size windows at a time.
+    Only one batch is materialized; the series itself is never duplicated.
+    """
+    X, y = window_views(values, target, lookback, horizon)
+    n = len(X)
+
+    order = np.arange(n)
+    if shuffle:
+        np.random.default_rng(seed).shuffle(order)
+
+    for i in range(0, n, batch_size):
+        idx = order[i:i + batch_size]
+        X_batch = np.ascontiguousarray(X[idx], dtype=dtype)
+        y_batch = np.ascontiguousarray(y[idx], dtype=dtype)
+        yield X_batch, y_batch